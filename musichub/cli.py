@@ -1,23 +1,20 @@
 import argparse
+import functools
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 from . import db
 from .config import AppPaths, ensure_dirs, get_paths
-from .daemon import run_loop as daemon_run_loop, start as daemon_start, status as daemon_status, stop as daemon_stop
-from .events_ingest import ingest_mpv_events
-from .importers import import_json_file, import_ncm_json, import_ytm_live
-from .models import train_implicit_cache
 from .mpv_control import launch_mpv, resolve_mpv_exe
 from .mpv_ipc import MpvIpcClient, MpvIpcError
 from .nl import maybe_extract_direct_command, parse_freeform
@@ -28,7 +25,6 @@ from .playback_prefs import (
     loudnorm_enabled_from_af,
     save_playback_prefs,
 )
-from .recommender import RecItem, recommend
 from .slots import (
     SLOT_PRIMARY,
     active_slot_info,
@@ -40,6 +36,10 @@ from .slots import (
     unregister_slot,
 )
 
+# Compact JSON for the one-line status replies that scripts and hotkeys consume;
+# human-facing reports (doctor, stats, sync) keep indent=2.
+_dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
 
 def _pick_artist(meta: dict[str, Any]) -> str | None:
     if isinstance(meta.get("artist"), str):
@@ -49,49 +49,65 @@ def _pick_artist(meta: dict[str, Any]) -> str | None:
     return None
 
 
+# One scan per URL; the group name is the source kind. Leftmost match wins, so
+# "music.youtube.com" is found before its "youtube.com" suffix.
+_SOURCE_KIND_RE = re.compile(
+    r"(?P<ytmusic>music\.youtube\.com)|(?P<youtube>youtube\.com|youtu\.be)|(?P<bilibili>bilibili\.com|b23\.tv)"
+)
+
+
 def _guess_source_kind(url: str | None) -> str:
     if not url:
         return "local"
-    if "music.youtube.com" in url:
-        return "ytmusic"
-    if "youtube.com" in url or "youtu.be" in url:
-        return "youtube"
-    if "bilibili.com" in url or "b23.tv" in url:
-        return "bilibili"
+    m = _SOURCE_KIND_RE.search(url)
+    if m:
+        return m.lastgroup
     return "url"
 
 
+_SNAPSHOT_PROPERTIES = (
+    "path",
+    "media-title",
+    "duration",
+    "time-pos",
+    "chapter",
+    "chapter-metadata",
+    "playlist-pos",
+    "playlist-count",
+    "metadata",
+)
+
+
 def _snapshot_mpv_slot(paths, slot_id: str) -> dict[str, Any]:
     info = active_slot_info(paths, slot_id)
     if not info:
         return {}
 
-    def _optional_property(client: MpvIpcClient, name: str, default: Any = None) -> Any:
-        try:
-            return client.get_property(name)
-        except MpvIpcError:
-            return default
-
-    for attempt in range(3):
-        client = MpvIpcClient(info.pipe)
-        try:
-            path = client.get_property("path")
-            if path:
-                metadata = _optional_property(client, "metadata", {})
-                return {
-                    "path": path,
-                    "media_title": _optional_property(client, "media-title"),
-                    "duration": _optional_property(client, "duration"),
-                    "time_pos": _optional_property(client, "time-pos"),
-                    "chapter": _optional_property(client, "chapter"),
-                    "chapter_metadata": _optional_property(client, "chapter-metadata"),
-                    "playlist_pos": _optional_property(client, "playlist-pos"),
-                    "playlist_count": _optional_property(client, "playlist-count"),
-                    "metadata": metadata if isinstance(metadata, dict) else {},
-                }
-        except Exception:
-            time.sleep(0.3)
-            continue
+    with MpvIpcClient(info.pipe) as client:
+        for attempt in range(3):
+            try:
+                props = client.get_properties(list(_SNAPSHOT_PROPERTIES))
+                path = props.get("path")
+                if path:
+                    metadata = props.get("metadata")
+                    return {
+                        "path": path,
+                        "media_title": props.get("media-title"),
+                        "duration": props.get("duration"),
+                        "time_pos": props.get("time-pos"),
+                        "chapter": props.get("chapter"),
+                        "chapter_metadata": props.get("chapter-metadata"),
+                        "playlist_pos": props.get("playlist-pos"),
+                        "playlist_count": props.get("playlist-count"),
+                        "metadata": metadata if isinstance(metadata, dict) else {},
+                        "time": db.utc_now_iso(),
+                    }
+            except Exception:
+                pass
+            # No path yet (e.g. between tracks) or the pipe failed: back off
+            # before retrying.
+            if attempt < 2:
+                time.sleep(0.3)
 
     return {}
 
@@ -124,7 +140,8 @@ def _kill_pid(pid: int) -> bool:
 def _stop_slot_instance(paths, slot_id: str, info, *, unregister: bool = True) -> bool:
     stopped = False
     try:
-        MpvIpcClient(info.pipe).command(["quit"])
+        with MpvIpcClient(info.pipe) as client:
+            client.command(["quit"])
         stopped = _wait_for_pid_exit(info.pid, timeout_sec=1.5)
     except MpvIpcError:
         stopped = False
@@ -140,15 +157,16 @@ def _stop_slot_instance(paths, slot_id: str, info, *, unregister: bool = True) -
 def _wait_for_slot_ipc(pipe: str, timeout_sec: float = 4.0) -> None:
     deadline = time.time() + max(timeout_sec, 0.5)
     last_err: Exception | None = None
-    while time.time() < deadline:
-        try:
-            resp = MpvIpcClient(pipe, connect_timeout_sec=0.25).command(["get_property", "playlist-count"], timeout_sec=0.5)
-            if resp.get("error") in {None, "success"}:
-                return
-            last_err = MpvIpcError(f"mpv IPC returned error for {pipe}: {resp}")
-        except Exception as exc:
-            last_err = exc
-        time.sleep(0.1)
+    with MpvIpcClient(pipe, connect_timeout_sec=0.25) as client:
+        while time.time() < deadline:
+            try:
+                resp = client.command(["get_property", "playlist-count"], timeout_sec=0.5)
+                if resp.get("error") in {None, "success"}:
+                    return
+                last_err = MpvIpcError(f"mpv IPC returned error for {pipe}: {resp}")
+            except Exception as exc:
+                last_err = exc
+            time.sleep(0.1)
     raise MpvIpcError(f"Timed out waiting for slot IPC at {pipe}: {last_err}")
 
 
@@ -256,9 +274,76 @@ def _maybe_apply_playback_prefs_to_client(paths, client: MpvIpcClient) -> None:
         pass
 
 
+_YDL_LOCAL = threading.local()
+# Overall bound per provider search, matching the old subprocess timeout.
+_SEARCH_TIMEOUT_SEC = 15.0
+
+
+class _SilentYdlLogger:
+    """Swallow yt-dlp output; the subprocess path captured it the same way."""
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    info = warning = error = debug
+
+
+def _in_process_ydl():
+    """Per-thread YoutubeDL for flat searches, or None when yt_dlp is not importable."""
+    ydl = getattr(_YDL_LOCAL, "ydl", None)
+    if ydl is None:
+        try:
+            from yt_dlp import YoutubeDL  # type: ignore
+        except Exception:
+            return None
+        ydl = YoutubeDL(
+            {
+                "quiet": True,
+                "no_warnings": True,
+                "skip_download": True,
+                "extract_flat": True,
+                "ignoreerrors": True,
+                "socket_timeout": 15,
+                "logger": _SilentYdlLogger(),
+            }
+        )
+        _YDL_LOCAL.ydl = ydl
+    return ydl
+
+
 def _run_single_provider_search(query: str, prefix: str, suffix: str, limit: int) -> list[str]:
     """Helper to run a single yt-dlp search provider."""
     search_term = f"{query}{suffix}"
+    ydl = _in_process_ydl()
+    if ydl is not None:
+        # Same flat search as the subprocess path, minus an interpreter start per provider.
+        # It runs on a daemon thread so a stalled search can be abandoned after
+        # _SEARCH_TIMEOUT_SEC without blocking interpreter exit.
+        box: dict[str, Any] = {}
+
+        def extract() -> None:
+            try:
+                box["info"] = ydl.extract_info(f"{prefix}{limit}:{search_term}", download=False) or {}
+            except Exception:
+                box["info"] = {}
+
+        worker = threading.Thread(target=extract, name="ytdlp-search", daemon=True)
+        worker.start()
+        worker.join(_SEARCH_TIMEOUT_SEC)
+        if worker.is_alive():
+            # The stalled search still owns this instance; don't reuse it.
+            _YDL_LOCAL.ydl = None
+            return []
+        info = box.get("info") or {}
+        out: list[str] = []
+        for entry in info.get("entries") or []:
+            if not isinstance(entry, dict):
+                continue
+            url = entry.get("webpage_url") or entry.get("url")
+            if isinstance(url, str) and url.startswith("http"):
+                out.append(url)
+        return out
+
     cmd = [
         sys.executable, "-m", "yt_dlp",
         "--ignore-errors",
@@ -460,25 +545,34 @@ def _radio_search_fallback(query: str | None, *, limit: int, exclude_url: str |
 def _upsert_from_snapshot(conn, snap: dict[str, Any]) -> tuple[int | None, str | None, str | None]:
     source_url = snap.get("path") if isinstance(snap.get("path"), str) else None
     meta = snap.get("metadata") if isinstance(snap.get("metadata"), dict) else {}
+    source_kind = _guess_source_kind(source_url)
     track_id = db.upsert_track_and_source(
         conn,
         title=snap.get("media_title") if isinstance(snap.get("media_title"), str) else None,
         artist=_pick_artist(meta),
         duration_sec=float(snap["duration"]) if isinstance(snap.get("duration"), (int, float)) else None,
-        source_kind=_guess_source_kind(source_url),
+        source_kind=source_kind,
         source_url=source_url,
     )
-    return track_id, source_url, _guess_source_kind(source_url)
+    return track_id, source_url, source_kind
+
+
+_READY: set[Path] = set()
 
 
 def _ensure_ready():
     paths = get_paths()
+    if paths.db_path in _READY:
+        return paths
     ensure_dirs(paths)
     db.init_db(paths)
+    _READY.add(paths.db_path)
     return paths
 
 
 def _safe_sync_events(paths=None) -> dict[str, int]:
+    from .events_ingest import ingest_mpv_events
+
     return ingest_mpv_events(paths or get_paths())
 
 
@@ -510,6 +604,13 @@ def _load_targets_into_client(client: MpvIpcClient, targets: list[str]) -> int:
     return loaded
 
 
+def _skip_to_next(client: MpvIpcClient) -> None:
+    # Waits for the reply so a failed skip rolls back the event recorded for it.
+    resp = client.command(["playlist-next", "force"])
+    if resp.get("error") not in {None, "success"}:
+        raise MpvIpcError(f"mpv playlist-next failed: {resp}")
+
+
 def _append_recommendations_to_slot(
     paths,
     slot_id: str,
@@ -517,10 +618,12 @@ def _append_recommendations_to_slot(
     client: MpvIpcClient | None = None,
     limit: int = 3,
 ) -> int:
-    slot_client = client
-    if slot_client is None:
+    if client is None:
         _, pipe = _resolve_slot_pipe(paths, slot_id)
-        slot_client = MpvIpcClient(pipe)
+        with MpvIpcClient(pipe) as slot_client:
+            return _append_recommendations_to_slot(paths, slot_id, client=slot_client, limit=limit)
+
+    from .recommender import recommend
 
     with db.connect(paths.db_path) as conn:
         items = recommend(paths, conn, limit=max(int(limit), 1), explain=False)
@@ -529,13 +632,15 @@ def _append_recommendations_to_slot(
         return 0
 
     for url in target_urls:
-        resp = slot_client.command(["loadfile", url, "append"])
+        resp = client.command(["loadfile", url, "append"])
         if resp.get("error") not in {None, "success"}:
             raise MpvIpcError(f"mpv append failed: {resp}")
     return len(target_urls)
 
 
 def _recover_next_playback(paths, slot_id: str) -> tuple[bool, str | None]:
+    from .recommender import recommend
+
     with db.connect(paths.db_path) as conn:
         items = recommend(paths, conn, limit=1, explain=False)
     target_url = next((item.source_url for item in items if item.source_url), None)
@@ -575,6 +680,17 @@ def _apply_rec_filters(
     return out
 
 
+def _write_json_array(rows) -> None:
+    """Stream a JSON array to stdout one element at a time (same bytes as json.dumps)."""
+    out = sys.stdout
+    out.write("[")
+    for n, row in enumerate(rows):
+        if n:
+            out.write(", ")
+        out.write(json.dumps(row, ensure_ascii=False))
+    out.write("]\n")
+
+
 def cmd_radio(args: argparse.Namespace) -> int:
     """Infinite playback mode based on related tracks of current or favorite song."""
     paths = _ensure_ready()
@@ -615,6 +731,8 @@ def cmd_radio(args: argparse.Namespace) -> int:
                     break
 
             if not current_url or not seed_query:
+                from .recommender import recommend
+
                 recs = recommend(paths, conn, limit=10)
                 for r in recs:
                     if not current_url and r.source_url and _canonical_youtube_watch_url(r.source_url):
@@ -678,8 +796,7 @@ def cmd_note(args: argparse.Namespace) -> int:
         print("Usage: m note \"your thought...\"")
         return 1
 
-    from datetime import datetime, UTC
-    now = datetime.now(UTC).isoformat()
+    now = snap["time"]
     
     # Capture position
     time_pos = snap.get("time_pos")
@@ -761,6 +878,8 @@ def cmd_rec(args: argparse.Namespace) -> int:
     if not args.no_sync:
         _safe_sync_events(paths)
 
+    from .recommender import recommend
+
     with db.connect(paths.db_path) as conn:
         items = recommend(paths, conn, engine=args.engine, limit=args.limit, explain=args.why)
         filtered = _apply_rec_filters(
@@ -771,11 +890,13 @@ def cmd_rec(args: argparse.Namespace) -> int:
         )
 
         if args.json_out:
-            print(json.dumps([asdict(i) for i in filtered], ensure_ascii=False))
-        else:
-            for i, item in enumerate(filtered):
-                reason = f" [{item.reason}]" if item.reason else ""
-                print(f"{i:2d}. {item.title} - {item.artist or 'Unknown'}{reason}")
+            _write_json_array(i.as_dict() for i in filtered)
+        elif filtered:
+            lines = [
+                f"{i:2d}. {item.title} - {item.artist or 'Unknown'}" + (f" [{item.reason}]" if item.reason else "")
+                for i, item in enumerate(filtered)
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
     return 0
 
 
@@ -800,6 +921,8 @@ def cmd_play(args: argparse.Namespace) -> int:
             print(f"Resolved search -> {targets[0]}")
             target_urls = targets
     else:
+        from .recommender import recommend
+
         with db.connect(paths.db_path) as conn:
             items = recommend(paths, conn, engine=args.engine, limit=args.queue, explain=args.why)
             filtered = _apply_rec_filters(
@@ -812,9 +935,8 @@ def cmd_play(args: argparse.Namespace) -> int:
                 print("No recommendations found.")
                 return 1
             if args.why:
-                print("Queue reasons:")
-                for i in filtered:
-                    print(f"  - {i.title}: {i.reason}")
+                lines = ["Queue reasons:", *(f"  - {i.title}: {i.reason}" for i in filtered)]
+                sys.stdout.write("\n".join(lines) + "\n")
             target_urls = [i.source_url for i in filtered if i.source_url]
 
     if not target_urls:
@@ -892,6 +1014,15 @@ def cmd_current(args: argparse.Namespace) -> int:
     return 0
 
 
+def _map_slots(fn, items) -> list:
+    """Apply a blocking per-slot IPC call to every item concurrently, in order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(len(items), 16)) as executor:
+        return list(executor.map(fn, items))
+
+
 def cmd_stop(args: argparse.Namespace) -> int:
     paths = _ensure_ready()
     registry = clean_dead_slots(paths)
@@ -911,20 +1042,21 @@ def cmd_stop(args: argparse.Namespace) -> int:
     if not slots_to_stop:
         if args.slot == "all":
             results = _stop_profile_orphans(paths, set())
-            print(json.dumps({"ok": all(r["ok"] for r in results), "results": results}, ensure_ascii=False))
+            print(_dumps({"ok": all(r["ok"] for r in results), "results": results}))
             return 0 if all(r["ok"] for r in results) else 1
         return 0
 
-    results = []
-    for sid in slots_to_stop:
+    def stop_one(sid: str) -> dict:
         info = registry[sid]
-        results.append({"slot": sid, "pid": info.pid, "ok": _stop_slot_instance(paths, sid, info)})
+        return {"slot": sid, "pid": info.pid, "ok": _stop_slot_instance(paths, sid, info)}
+
+    results = _map_slots(stop_one, slots_to_stop)
 
     if args.slot == "all":
         known_pids = {info.pid for info in registry.values()}
         results.extend(_stop_profile_orphans(paths, known_pids))
 
-    print(json.dumps({"ok": all(r["ok"] for r in results), "results": results}, ensure_ascii=False))
+    print(_dumps({"ok": all(r["ok"] for r in results), "results": results}))
     return 0 if all(r["ok"] for r in results) else 1
 
 
@@ -936,38 +1068,38 @@ def cmd_pause(args: argparse.Namespace) -> int:
     else:
         slots_to_update = [args.slot]
 
-    results = []
-    for sid in slots_to_update:
-        info = registry.get(sid)
-        if not info:
-            continue
-        client = MpvIpcClient(info.pipe)
-        try:
-            paused = client.get_property("pause")
-            client.command(["set_property", "pause", not paused])
-            results.append({"slot": sid, "paused": not paused, "ok": True})
-        except MpvIpcError:
-            results.append({"slot": sid, "ok": False})
+    def toggle_one(info) -> dict:
+        with MpvIpcClient(info.pipe) as client:
+            try:
+                paused = client.get_property("pause")
+                client.command(["set_property", "pause", not paused])
+                return {"slot": info.slot_id, "paused": not paused, "ok": True}
+            except MpvIpcError:
+                return {"slot": info.slot_id, "ok": False}
+
+    results = _map_slots(toggle_one, [registry[sid] for sid in slots_to_update if registry.get(sid)])
 
-    print(json.dumps({"ok": any(r["ok"] for r in results), "results": results}))
+    print(_dumps({"ok": any(r["ok"] for r in results), "results": results}))
     return 0
 
 
 def cmd_slots(_args: argparse.Namespace) -> int:
     paths = _ensure_ready()
     registry = clean_dead_slots(paths)
-    out = []
-    for sid in sorted(registry.keys()):
+
+    def describe(sid: str) -> dict:
         info = registry[sid]
         title = None
         volume = None
         try:
-            client = MpvIpcClient(info.pipe)
-            title = client.get_property("media-title")
-            volume = client.get_property("volume")
+            with MpvIpcClient(info.pipe) as client:
+                title = client.get_property("media-title")
+                volume = client.get_property("volume")
         except MpvIpcError:
             pass
-        out.append({"slot": sid, "pid": info.pid, "pipe": info.pipe, "title": title, "volume": volume})
+        return {"slot": sid, "pid": info.pid, "pipe": info.pipe, "title": title, "volume": volume}
+
+    out = _map_slots(describe, sorted(registry.keys()))
     print(json.dumps(out, ensure_ascii=False))
     return 0
 
@@ -981,9 +1113,9 @@ def cmd_next(args: argparse.Namespace) -> int:
     except MpvIpcError:
         recovered, target_url = _recover_next_playback(paths, slot_id)
         if not recovered:
-            print(json.dumps({"ok": False, "error": "Could not recover playback"}, ensure_ascii=False))
+            print(_dumps({"ok": False, "error": "Could not recover playback"}))
             return 1
-        print(json.dumps({"ok": True, "recovered": True, "target": target_url, "slot": slot_id}, ensure_ascii=False))
+        print(_dumps({"ok": True, "recovered": True, "target": target_url, "slot": slot_id}))
         return 0
 
     _maybe_apply_playback_prefs_to_client(paths, client)
@@ -998,13 +1130,11 @@ def cmd_next(args: argparse.Namespace) -> int:
     ):
         appended = _append_recommendations_to_slot(paths, slot_id, client=client)
 
-    from datetime import UTC, datetime
-
     with db.connect(paths.db_path) as conn:
         tid, surl, skind = _upsert_from_snapshot(conn, snap)
         db.record_play_event(
             conn,
-            occurred_at=datetime.now(UTC).isoformat(),
+            occurred_at=snap["time"],
             track_id=tid,
             source_url=surl,
             source_kind=skind,
@@ -1013,9 +1143,9 @@ def cmd_next(args: argparse.Namespace) -> int:
             playback_time_sec=snap.get("time_pos") if isinstance(snap.get("time_pos"), (int, float)) else snap.get("playback_time"),
             duration_sec=snap.get("duration") if isinstance(snap.get("duration"), (int, float)) else None,
         )
-        client.command(["playlist-next", "force"])
+        _skip_to_next(client)
 
-    print(json.dumps({"ok": True, "slot": slot_id, "appended": appended}, ensure_ascii=False))
+    print(_dumps({"ok": True, "slot": slot_id, "appended": appended}))
     return 0
 
 
@@ -1024,11 +1154,10 @@ def cmd_good(args: argparse.Namespace) -> int:
     slot_id, pipe = _resolve_slot_pipe(paths, args.slot)
     snap = _snapshot_mpv_slot(paths, slot_id)
     if not snap:
-        print(json.dumps({"ok": False, "error": "Could not snapshot slot"}))
+        print(_dumps({"ok": False, "error": "Could not snapshot slot"}))
         return 1
 
-    from datetime import datetime, UTC
-    now = datetime.now(UTC).isoformat()
+    now = snap["time"]
     
     # Capture current playback position and chapter for the note
     time_pos = snap.get("time_pos")
@@ -1060,7 +1189,7 @@ def cmd_good(args: argparse.Namespace) -> int:
     msg = f"Track {tid} marked as good"
     if note:
         msg += f" ({note})"
-    print(json.dumps({"ok": True, "track_id": tid, "note": note, "msg": msg}))
+    print(_dumps({"ok": True, "track_id": tid, "note": note, "msg": msg}))
     return 0
 
 
@@ -1070,11 +1199,10 @@ def cmd_bad(args: argparse.Namespace) -> int:
     client = MpvIpcClient(pipe)
     snap = _snapshot_mpv_slot(paths, slot_id)
     if not snap:
-        print(json.dumps({"ok": False, "error": "Could not snapshot slot"}))
+        print(_dumps({"ok": False, "error": "Could not snapshot slot"}))
         return 1
 
-    from datetime import datetime, UTC
-    now = datetime.now(UTC).isoformat()
+    now = snap["time"]
 
     with db.connect(paths.db_path) as conn:
         tid, surl, skind = _upsert_from_snapshot(conn, snap)
@@ -1086,8 +1214,8 @@ def cmd_bad(args: argparse.Namespace) -> int:
             source_kind=skind, 
             kind="bad"
         )
-        client.command(["playlist-next", "force"])
-    print(json.dumps({"ok": True, "track_id": tid, "action": "next"}))
+        _skip_to_next(client)
+    print(_dumps({"ok": True, "track_id": tid, "action": "next"}))
     return 0
 
 
@@ -1106,8 +1234,8 @@ def cmd_undo(args: argparse.Namespace) -> int:
             if event["source_table"] == "play_events" and event["action"] == "next":
                 try:
                     _, pipe = _resolve_slot_pipe(paths, args.slot)
-                    client = MpvIpcClient(pipe)
-                    client.command(["playlist-prev"])
+                    with MpvIpcClient(pipe) as client:
+                        client.command(["playlist-prev"])
                 except Exception:
                     pass
 
@@ -1235,15 +1363,15 @@ def cmd_vol(args: argparse.Namespace) -> int:
             return 1
         slots_to_update = [info]
 
-    results = []
-    for info in slots_to_update:
-        client = MpvIpcClient(info.pipe)
-        try:
-            resp = client.command(["set_property", "volume", level])
-            ok = resp.get("error") == "success"
-            results.append({"slot": info.slot_id, "volume": level, "ok": ok})
-        except MpvIpcError as exc:
-            results.append({"slot": info.slot_id, "error": str(exc), "ok": False})
+    def set_one(info) -> dict:
+        with MpvIpcClient(info.pipe) as client:
+            try:
+                resp = client.command(["set_property", "volume", level])
+                return {"slot": info.slot_id, "volume": level, "ok": resp.get("error") == "success"}
+            except MpvIpcError as exc:
+                return {"slot": info.slot_id, "error": str(exc), "ok": False}
+
+    results = _map_slots(set_one, slots_to_update)
 
     print(json.dumps({"ok": any(r["ok"] for r in results), "results": results}, ensure_ascii=False))
     return 0 if any(r["ok"] for r in results) else 1
@@ -1260,23 +1388,23 @@ def cmd_af(args: argparse.Namespace) -> int:
         save_playback_prefs(paths, prefs)
 
     registry = clean_dead_slots(paths)
-    results = []
-    for info in registry.values():
-        client = MpvIpcClient(info.pipe)
-        try:
-            if action != "status":
-                _apply_playback_prefs_to_client(client, prefs)
-            current_af = client.get_property("af")
-            results.append(
-                {
+
+    def apply_one(info) -> dict:
+        with MpvIpcClient(info.pipe) as client:
+            try:
+                if action != "status":
+                    _apply_playback_prefs_to_client(client, prefs)
+                current_af = client.get_property("af")
+                return {
                     "slot": info.slot_id,
                     "pid": info.pid,
                     "loudnorm_enabled": loudnorm_enabled_from_af(current_af),
                     "ok": True,
                 }
-            )
-        except MpvIpcError as exc:
-            results.append({"slot": info.slot_id, "pid": info.pid, "ok": False, "error": str(exc)})
+            except MpvIpcError as exc:
+                return {"slot": info.slot_id, "pid": info.pid, "ok": False, "error": str(exc)}
+
+    results = _map_slots(apply_one, registry.values())
 
     ok = all(r["ok"] for r in results) if results else True
     print(
@@ -1293,6 +1421,36 @@ def cmd_af(args: argparse.Namespace) -> int:
     return 0 if ok else 1
 
 
+def _probe_mpv_exe(paths) -> str:
+    try:
+        return resolve_mpv_exe(paths)
+    except Exception as exc:
+        return f"ERROR: {exc}"
+
+
+def _probe_yt_dlp_module() -> str:
+    try:
+        from yt_dlp.version import __version__ as yt_dlp_version  # type: ignore
+
+        return yt_dlp_version
+    except Exception:
+        pass
+    try:
+        proc = subprocess.run([sys.executable, "-m", "yt_dlp", "--version"], capture_output=True, text=True, check=True)
+        return proc.stdout.strip() or "ok"
+    except Exception as exc:
+        return f"ERROR: {exc}"
+
+
+def _probe_ytmusicapi() -> Any:
+    try:
+        import ytmusicapi  # type: ignore
+
+        return getattr(ytmusicapi, "__version__", True)
+    except Exception:
+        return False
+
+
 def cmd_doctor(_args: argparse.Namespace) -> int:
     paths = _ensure_ready()
     prefs = load_playback_prefs(paths)
@@ -1306,55 +1464,72 @@ def cmd_doctor(_args: argparse.Namespace) -> int:
         "yt_dlp_module": None,
         "ytmusicapi": False,
     }
-    try:
-        checks["mpv_exe"] = resolve_mpv_exe(paths)
-    except Exception as exc:
-        checks["mpv_exe"] = f"ERROR: {exc}"
-    try:
-        proc = subprocess.run([sys.executable, "-m", "yt_dlp", "--version"], capture_output=True, text=True, check=True)
-        checks["yt_dlp_module"] = proc.stdout.strip() or "ok"
-    except Exception as exc:
-        checks["yt_dlp_module"] = f"ERROR: {exc}"
-    try:
-        import ytmusicapi  # type: ignore
-
-        checks["ytmusicapi"] = getattr(ytmusicapi, "__version__", True)
-    except Exception:
-        checks["ytmusicapi"] = False
-    st = daemon_status(paths)
+    from .daemon import status as daemon_status
+
+    # Independent probes; yt_dlp starts a whole interpreter and daemon status may
+    # shell out to PowerShell, so overlap them instead of paying the sum.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        probes = {
+            "mpv_exe": executor.submit(_probe_mpv_exe, paths),
+            "yt_dlp_module": executor.submit(_probe_yt_dlp_module),
+            "ytmusicapi": executor.submit(_probe_ytmusicapi),
+        }
+        daemon_future = executor.submit(daemon_status, paths)
+        for key, future in probes.items():
+            checks[key] = future.result()
+        st = daemon_future.result()
     checks["daemon"] = {"running": st.running, "pid": st.pid, "owned": st.owned, "pid_file": str(st.pid_file)}
     print(json.dumps(checks, ensure_ascii=False, indent=2))
     return 0
 
 
 def cmd_daemon_run(args: argparse.Namespace) -> int:
-    _ensure_ready()
-    return daemon_run_loop(get_paths(), poll_sec=args.poll_sec, once=args.once)
+    paths = _ensure_ready()
+    from .daemon import run_loop as daemon_run_loop
+
+    return daemon_run_loop(paths, poll_sec=args.poll_sec, once=args.once)
 
 
 def cmd_daemon_start(args: argparse.Namespace) -> int:
-    _ensure_ready()
-    st = daemon_start(get_paths(), poll_sec=args.poll_sec)
+    paths = _ensure_ready()
+    from .daemon import start as daemon_start
+
+    st = daemon_start(paths, poll_sec=args.poll_sec)
     print(json.dumps({"running": st.running, "pid": st.pid, "owned": st.owned, "pid_file": str(st.pid_file)}, ensure_ascii=False))
     return 0 if st.running else 1
 
 
 def cmd_daemon_stop(_args: argparse.Namespace) -> int:
+    from .daemon import stop as daemon_stop
+
     st = daemon_stop(get_paths())
     print(json.dumps({"running": st.running, "pid": st.pid, "owned": st.owned}, ensure_ascii=False))
     return 0
 
 
 def cmd_daemon_status(_args: argparse.Namespace) -> int:
+    from .daemon import status as daemon_status
+
     st = daemon_status(get_paths())
     print(json.dumps({"running": st.running, "pid": st.pid, "owned": st.owned, "log_file": str(st.log_file)}, ensure_ascii=False))
     return 0
 
 
+def _import_json_export(paths: AppPaths, source_kind: str, json_path: str) -> Any:
+    from .importers import import_json_file, import_json_files
+
+    p = Path(json_path).expanduser()
+    if p.is_dir():
+        return import_json_files(paths, source_kind=source_kind, json_files=sorted(p.glob("*.json")))
+    return import_json_file(paths, source_kind=source_kind, json_file=p)
+
+
 def cmd_sync_ytm(args: argparse.Namespace) -> int:
     paths = _ensure_ready()
+    from .importers import import_ytm_live
+
     if args.json:
-        result = import_json_file(paths, source_kind="ytmusic", json_file=args.json)
+        result = _import_json_export(paths, "ytmusic", args.json)
     else:
         result = import_ytm_live(paths, auth_json=args.auth_json, include_history=not args.no_history)
     print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2))
@@ -1376,21 +1551,23 @@ def cmd_sync_ncm(args: argparse.Namespace) -> int:
             )
         )
         return 1
-    result = import_ncm_json(paths, json_file=args.json)
+    result = _import_json_export(paths, "netease", args.json)
     print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2))
     return 0
 
 
 def cmd_sync_all(args: argparse.Namespace) -> int:
     paths = _ensure_ready()
+    from .importers import import_ytm_live
+
     out: dict[str, Any] = {"events": _safe_sync_events(paths)}
     if args.ytm_json or args.ytm_auth_json:
         if args.ytm_json:
-            out["ytm"] = import_json_file(paths, source_kind="ytmusic", json_file=args.ytm_json).as_dict()
+            out["ytm"] = _import_json_export(paths, "ytmusic", args.ytm_json).as_dict()
         else:
             out["ytm"] = import_ytm_live(paths, auth_json=args.ytm_auth_json, include_history=not args.no_history).as_dict()
     if args.ncm_json:
-        out["ncm"] = import_ncm_json(paths, json_file=args.ncm_json).as_dict()
+        out["ncm"] = _import_json_export(paths, "netease", args.ncm_json).as_dict()
     print(json.dumps(out, ensure_ascii=False, indent=2))
     return 0
 
@@ -1398,6 +1575,8 @@ def cmd_sync_all(args: argparse.Namespace) -> int:
 def cmd_train_implicit(args: argparse.Namespace) -> int:
     paths = _ensure_ready()
     _safe_sync_events(paths)
+    from .models import train_implicit_cache
+
     result = train_implicit_cache(paths, topn=args.topn, k=args.k)
     print(json.dumps(result.as_dict(), ensure_ascii=False, indent=2))
     return 0 if result.ok else 1
@@ -1562,12 +1741,12 @@ def build_parser() -> argparse.ArgumentParser:
 
     p = sync_sub.add_parser("ytm", help="Sync YouTube Music (live via ytmusicapi or JSON import)")
     p.add_argument("--auth-json", help="ytmusicapi auth JSON for live sync")
-    p.add_argument("--json", help="Normalized JSON export file to import")
+    p.add_argument("--json", help="Normalized JSON export file (or a directory of them) to import")
     p.add_argument("--no-history", action="store_true", help="Skip YTM history import in live mode")
     p.set_defaults(func=cmd_sync_ytm)
 
     p = sync_sub.add_parser("ncm", help="Sync NetEase Cloud Music from JSON export")
-    p.add_argument("--json", help="Normalized JSON export file to import")
+    p.add_argument("--json", help="Normalized JSON export file (or a directory of them) to import")
     p.set_defaults(func=cmd_sync_ncm)
 
     p = sync_sub.add_parser("all", help="Sync events and optional YTM/NCM imports")
@@ -1627,14 +1806,31 @@ def _dispatch_natural_language(argv: list[str]) -> int | None:
     return main(parsed.argv)
 
 
+# Bare verbs that skip building the full argparse tree. Defaults must mirror build_parser().
+_FAST_VERBS: dict[str, tuple[Any, dict[str, Any]]] = {
+    "pause": (cmd_pause, {"slot": SLOT_PRIMARY}),
+    "stop": (cmd_stop, {"slot": None}),
+    "current": (cmd_current, {"slot": SLOT_PRIMARY}),
+    "good": (cmd_good, {"slot": SLOT_PRIMARY}),
+    "bad": (cmd_bad, {"slot": SLOT_PRIMARY}),
+    "next": (cmd_next, {"slot": SLOT_PRIMARY}),
+    "init": (cmd_init, {}),
+    "doctor": (cmd_doctor, {}),
+}
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = list(sys.argv[1:] if argv is None else argv)
     nl_result = _dispatch_natural_language(argv)
     if nl_result is not None:
         return nl_result
 
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    if len(argv) == 1 and argv[0] in _FAST_VERBS:
+        func, defaults = _FAST_VERBS[argv[0]]
+        args = argparse.Namespace(cmd=argv[0], func=func, **defaults)
+    else:
+        parser = build_parser()
+        args = parser.parse_args(argv)
     try:
         return int(args.func(args))
     except subprocess.CalledProcessError as exc:
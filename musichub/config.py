@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -24,12 +25,17 @@ class AppPaths:
 
 
 def _default_base_dir() -> Path:
-    override = os.environ.get("MUSICHUB_HOME")
+    return _base_dir_for(os.environ.get("MUSICHUB_HOME"))
+
+
+@lru_cache(maxsize=None)
+def _base_dir_for(override: str | None) -> Path:
     if override:
         return Path(override).expanduser().resolve()
     return (project_root() / "data").resolve()
 
 
+@lru_cache(maxsize=None)
 def project_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
@@ -41,7 +47,13 @@ def _profile_pipe_name(base_dir: Path) -> str:
 
 
 def get_paths() -> AppPaths:
-    base = _default_base_dir()
+    # Keyed by MUSICHUB_HOME so switching profiles in-process still yields fresh paths.
+    return _paths_for_base(_default_base_dir())
+
+
+@lru_cache(maxsize=None)
+def _paths_for_base(base: Path) -> AppPaths:
+    root = project_root()
     runtime_dir = base / "runtime"
     logs_dir = base / "logs"
     return AppPaths(
@@ -56,13 +68,12 @@ def get_paths() -> AppPaths:
         implicit_recs_file=(base / "models" / "implicit_recs.json"),
         model_meta_file=(base / "models" / "model_meta.json"),
         mpv_pipe=_profile_pipe_name(base),
-        mpv_script=project_root() / "mpv-scripts" / "musichub.lua",
-        mpv_exe_hint=(project_root() / "mpv-portable" / "mpv.exe"),
+        mpv_script=root / "mpv-scripts" / "musichub.lua",
+        mpv_exe_hint=(root / "mpv-portable" / "mpv.exe"),
     )
 
 
 def ensure_dirs(paths: AppPaths) -> None:
-    paths.base_dir.mkdir(parents=True, exist_ok=True)
-    paths.runtime_dir.mkdir(parents=True, exist_ok=True)
-    paths.logs_dir.mkdir(parents=True, exist_ok=True)
-    paths.models_dir.mkdir(parents=True, exist_ok=True)
+    for d in (paths.base_dir, paths.runtime_dir, paths.logs_dir, paths.models_dir):
+        if not d.is_dir():
+            d.mkdir(parents=True, exist_ok=True)
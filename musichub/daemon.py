@@ -7,7 +7,6 @@ import subprocess
 import sys
 import time
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from pathlib import Path
 
 from . import db
@@ -15,10 +14,6 @@ from .config import AppPaths, ensure_dirs, get_paths
 from .events_ingest import ingest_mpv_events
 
 
-def _now_iso() -> str:
-    return datetime.now(UTC).isoformat()
-
-
 @dataclass
 class DaemonStatus:
     running: bool
@@ -28,28 +23,89 @@ class DaemonStatus:
     log_file: Path
 
 
-def _read_pid(pid_file: Path) -> int | None:
+def _read_pidfile(pid_file: Path) -> tuple[int | None, float | None]:
+    """Return (pid, poll_sec) from the pidfile; poll_sec is None for legacy files."""
     if not pid_file.exists():
-        return None
+        return None, None
     raw = pid_file.read_text(encoding="utf-8").strip()
     if not raw:
-        return None
+        return None, None
     try:
         payload = json.loads(raw)
         if isinstance(payload, dict) and payload.get("pid") is not None:
-            return int(payload["pid"])
+            poll = payload.get("poll_sec")
+            return int(payload["pid"]), float(poll) if isinstance(poll, (int, float)) else None
     except Exception:
         pass
     try:
-        return int(raw)
+        return int(raw), None
     except Exception:
+        return None, None
+
+
+def _read_pid(pid_file: Path) -> int | None:
+    return _read_pidfile(pid_file)[0]
+
+
+def _heartbeat_is_fresh(pid_file: Path, poll_sec: float) -> bool:
+    # run_loop touches the pidfile every iteration, and an iteration never
+    # waits longer than poll_sec, so a recent mtime means the loop is alive.
+    try:
+        age = time.time() - pid_file.stat().st_mtime
+    except OSError:
+        return False
+    return age < 2 * poll_sec
+
+
+def _win_pid_alive(pid: int) -> bool | None:
+    """Probe a PID via OpenProcess; None means the answer is inconclusive."""
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+    ERROR_INVALID_PARAMETER = 87
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    OpenProcess = kernel32.OpenProcess
+    OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    OpenProcess.restype = wintypes.HANDLE
+    GetExitCodeProcess = kernel32.GetExitCodeProcess
+    GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    GetExitCodeProcess.restype = wintypes.BOOL
+    CloseHandle = kernel32.CloseHandle
+    CloseHandle.argtypes = [wintypes.HANDLE]
+    CloseHandle.restype = wintypes.BOOL
+
+    handle = OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        err = ctypes.get_last_error()
+        if err == ERROR_INVALID_PARAMETER:
+            return False
+        if err == ERROR_ACCESS_DENIED:
+            # Exists but belongs to another security context.
+            return True
         return None
+    try:
+        code = wintypes.DWORD()
+        if not GetExitCodeProcess(handle, ctypes.byref(code)):
+            return None
+        return code.value == STILL_ACTIVE
+    finally:
+        CloseHandle(handle)
 
 
 def _pid_exists(pid: int) -> bool:
     if pid <= 0:
         return False
     if os.name == "nt":
+        try:
+            alive = _win_pid_alive(pid)
+        except OSError:
+            alive = None
+        if alive is not None:
+            return alive
         proc = subprocess.run(
             ["tasklist", "/FI", f"PID eq {pid}"],
             capture_output=True,
@@ -103,7 +159,17 @@ def _is_our_daemon_process(pid: int) -> bool | None:
 def status(paths: AppPaths | None = None) -> DaemonStatus:
     paths = paths or get_paths()
     ensure_dirs(paths)
-    pid = _read_pid(paths.daemon_pid_file)
+    pid, poll_sec = _read_pidfile(paths.daemon_pid_file)
+    if pid and poll_sec and _heartbeat_is_fresh(paths.daemon_pid_file, poll_sec) and _pid_exists(pid):
+        # Skips the command-line lookup, so ownership is unverified; stop()
+        # checks it itself before killing anything.
+        return DaemonStatus(
+            running=True,
+            pid=pid,
+            owned=None,
+            pid_file=paths.daemon_pid_file,
+            log_file=paths.daemon_log_file,
+        )
     owned: bool | None = None
     running = False
     if pid and _pid_exists(pid):
@@ -125,30 +191,124 @@ def status(paths: AppPaths | None = None) -> DaemonStatus:
     )
 
 
+def _open_win_change_notification(directory: Path):
+    import ctypes
+    from ctypes import wintypes
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+    kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+    kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+    kernel32.FindNextChangeNotification.restype = wintypes.BOOL
+    kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+    kernel32.FindCloseChangeNotification.restype = wintypes.BOOL
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+
+    handle = kernel32.FindFirstChangeNotificationW(
+        str(directory),
+        False,
+        FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE,
+    )
+    if not handle or handle == INVALID_HANDLE_VALUE:
+        return None, None
+    return kernel32, handle
+
+
+def _iter_log_wakeups(logs_dir: Path, timeout_sec: float):
+    """Yield whenever logs_dir changes, and at least once every timeout_sec."""
+    try:
+        from watchfiles import watch  # type: ignore
+    except Exception:
+        watch = None
+
+    if watch is not None:
+        yield from watch(
+            logs_dir,
+            debounce=200,
+            rust_timeout=int(timeout_sec * 1000),
+            yield_on_timeout=True,
+        )
+        return
+
+    if os.name == "nt":
+        kernel32, handle = _open_win_change_notification(logs_dir)
+        if handle is not None:
+            try:
+                while True:
+                    kernel32.WaitForSingleObject(handle, int(timeout_sec * 1000))
+                    kernel32.FindNextChangeNotification(handle)
+                    yield set()
+            finally:
+                kernel32.FindCloseChangeNotification(handle)
+            return
+
+    while True:
+        time.sleep(timeout_sec)
+        yield set()
+
+
+def _log_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
 def run_loop(paths: AppPaths | None = None, *, poll_sec: float = 2.0, once: bool = False) -> int:
     paths = paths or get_paths()
     ensure_dirs(paths)
     db.init_db(paths)
-    paths.daemon_pid_file.write_text(
-        json.dumps({"pid": os.getpid(), "started_at": _now_iso()}, ensure_ascii=False),
+    my_pid = os.getpid()
+    wait_sec = max(0.2, float(poll_sec))
+    pid_file = paths.daemon_pid_file
+    tmp = pid_file.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({"pid": my_pid, "started_at": db.utc_now_iso(), "poll_sec": wait_sec}, ensure_ascii=False),
         encoding="utf-8",
     )
+    os.replace(tmp, pid_file)
+    wakeups = None
+    conn = db.connect(paths.db_path)
     try:
         with paths.daemon_log_file.open("a", encoding="utf-8") as log:
-            log.write(json.dumps({"time": _now_iso(), "event": "daemon_start", "pid": os.getpid()}) + "\n")
+            log.write(json.dumps({"time": db.utc_now_iso(), "event": "daemon_start", "pid": my_pid}) + "\n")
             log.flush()
+            # poll_sec is now only the upper bound between checks; file-change
+            # notifications wake the loop as soon as mpv appends an event.
+            wakeups = _iter_log_wakeups(paths.logs_dir, wait_sec)
+            ingested_sig: tuple[int, int] | None = None
+            first = True
             while True:
-                result = ingest_mpv_events(paths)
-                if result.get("new", 0):
-                    log.write(json.dumps({"time": _now_iso(), "event": "ingest", **result}, ensure_ascii=False) + "\n")
-                    log.flush()
+                try:
+                    os.utime(pid_file)
+                except OSError:
+                    pass
+                sig = _log_signature(paths.events_jsonl)
+                if first or sig != ingested_sig:
+                    first = False
+                    ingested_sig = sig
+                    result = ingest_mpv_events(paths, conn)
+                    if result.get("new", 0):
+                        log.write(json.dumps({"time": db.utc_now_iso(), "event": "ingest", **result}, ensure_ascii=False) + "\n")
+                        log.flush()
                 if once:
                     break
-                time.sleep(max(0.2, float(poll_sec)))
+                next(wakeups)
     finally:
+        db.close(conn)
+        if wakeups is not None:
+            wakeups.close()
+        # A later `daemon run` may have replaced the pidfile; only remove our own.
         try:
-            if paths.daemon_pid_file.exists() and _read_pid(paths.daemon_pid_file) == os.getpid():
-                paths.daemon_pid_file.unlink()
+            if _read_pid(pid_file) == my_pid:
+                pid_file.unlink(missing_ok=True)
         except OSError:
             pass
     return 0
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import time
 from dataclasses import dataclass
-from hashlib import sha256
+from hashlib import blake2b
 from pathlib import Path
 from typing import Any
 
@@ -11,12 +12,39 @@ from .config import AppPaths
 
 
 def connect(db_path: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, cached_statements=128)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON")
+    # journal_mode=WAL is persisted by schema.sql; these are per-connection.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")  # KiB, i.e. 64 MiB
+    conn.execute("PRAGMA mmap_size=268435456")
+    # Bounds the work PRAGMA optimize does when it decides to re-analyze.
+    conn.execute("PRAGMA analysis_limit=400")
     return conn
 
 
+def close(conn: sqlite3.Connection) -> None:
+    """Close after letting SQLite refresh planner stats for tables that need it."""
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO-8601 with microseconds, without building a datetime."""
+    ns = time.time_ns()
+    secs, rem = divmod(ns, 1_000_000_000)
+    t = time.gmtime(secs)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T"
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{rem // 1000:06d}+00:00"
+    )
+
+
 def init_db(paths: AppPaths) -> None:
     conn = connect(paths.db_path)
     try:
@@ -24,13 +52,15 @@ def init_db(paths: AppPaths) -> None:
         conn.executescript(schema)
         conn.commit()
     finally:
-        conn.close()
+        close(conn)
 
 
 def normalize_text(value: str | None) -> str:
     if not value:
         return ""
-    return " ".join(value.casefold().strip().split())
+    # split() already drops leading/trailing whitespace; a regex sub benchmarked
+    # ~3x slower than split/join on typical titles.
+    return " ".join(value.casefold().split())
 
 
 def canonical_key(title: str | None, artist: str | None) -> str:
@@ -39,6 +69,60 @@ def canonical_key(title: str | None, artist: str | None) -> str:
     return f"{t}::{a}"
 
 
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds).
+_IN_CHUNK = 500
+
+
+# Statements on the ingest/feedback write path. sqlite3 caches compiled
+# statements per connection keyed by SQL text, so every caller shares one
+# string and each statement is prepared once per connection.
+_TRACK_UPSERT_SQL = """
+    INSERT INTO tracks(canonical_key, title, artist, duration_sec)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(canonical_key) DO UPDATE SET
+        title=excluded.title,
+        artist=COALESCE(excluded.artist, tracks.artist),
+        duration_sec=COALESCE(excluded.duration_sec, tracks.duration_sec),
+        updated_at=CURRENT_TIMESTAMP
+"""
+
+_TRACK_UPSERT_RETURNING_SQL = _TRACK_UPSERT_SQL + "RETURNING id\n"
+
+_SOURCE_UPSERT_SQL = """
+    INSERT INTO track_sources(track_id, source_kind, source_id, source_url, source_title, source_artist)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source_kind, source_url) DO UPDATE SET
+        track_id=excluded.track_id,
+        source_id=COALESCE(excluded.source_id, track_sources.source_id),
+        source_title=COALESCE(excluded.source_title, track_sources.source_title),
+        source_artist=COALESCE(excluded.source_artist, track_sources.source_artist)
+"""
+
+_TRACK_INSERT_SQL = "INSERT INTO tracks(canonical_key, title, artist, duration_sec) VALUES (?, ?, ?, ?)"
+
+_SOURCE_INSERT_SQL = """
+    INSERT INTO track_sources(track_id, source_kind, source_id, source_url, source_title, source_artist)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_RAW_EVENT_INSERT_SQL = (
+    "INSERT OR IGNORE INTO raw_mpv_events(event_hash, event_name, payload_json) VALUES (?, ?, ?)"
+)
+
+_PLAY_EVENT_SQL = """
+    INSERT INTO play_events(
+        occurred_at, track_id, source_url, source_kind, action, completed, reason,
+        playback_time_sec, duration_sec, session_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_FEEDBACK_EVENT_SQL = """
+    INSERT INTO feedback_events(
+        occurred_at, track_id, source_url, source_kind, kind, weight, session_id, note
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def upsert_track_and_source(
     conn: sqlite3.Connection,
     *,
@@ -54,50 +138,144 @@ def upsert_track_and_source(
 
     title_value = title or source_url or "unknown"
     ckey = canonical_key(title_value, artist)
-    conn.execute(
-        """
-        INSERT INTO tracks(canonical_key, title, artist, duration_sec)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(canonical_key) DO UPDATE SET
-            title=excluded.title,
-            artist=COALESCE(excluded.artist, tracks.artist),
-            duration_sec=COALESCE(excluded.duration_sec, tracks.duration_sec),
-            updated_at=CURRENT_TIMESTAMP
-        """,
-        (ckey, title_value, artist, duration_sec),
-    )
-    track_id = conn.execute("SELECT id FROM tracks WHERE canonical_key = ?", (ckey,)).fetchone()["id"]
+    # RETURNING yields the id for both the insert and the conflict-update path.
+    track_id = conn.execute(_TRACK_UPSERT_RETURNING_SQL, (ckey, title_value, artist, duration_sec)).fetchone()[0]
 
     if source_kind and source_url:
-        conn.execute(
-            """
-            INSERT INTO track_sources(track_id, source_kind, source_id, source_url, source_title, source_artist)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(source_kind, source_url) DO UPDATE SET
-                track_id=excluded.track_id,
-                source_id=COALESCE(excluded.source_id, track_sources.source_id),
-                source_title=COALESCE(excluded.source_title, track_sources.source_title),
-                source_artist=COALESCE(excluded.source_artist, track_sources.source_artist)
-            """,
-            (track_id, source_kind, source_id, source_url, title_value, artist),
-        )
+        conn.execute(_SOURCE_UPSERT_SQL, (track_id, source_kind, source_id, source_url, title_value, artist))
     return int(track_id)
 
 
+_TrackRow = tuple[str | None, str | None, float | None, str | None, str | None]
+_KeyedTrackRow = tuple[str, str, str | None, float | None, str | None, str | None]
+
+
+def _key_track_rows(rows: list[_TrackRow]) -> list[_KeyedTrackRow | None]:
+    keyed: list[_KeyedTrackRow | None] = []
+    for title, artist, duration_sec, source_kind, source_url in rows:
+        if not (title or source_url):
+            keyed.append(None)
+            continue
+        title_value = title or source_url or "unknown"
+        keyed.append((canonical_key(title_value, artist), title_value, artist, duration_sec, source_kind, source_url))
+    return keyed
+
+
+def _track_ids_by_key(conn: sqlite3.Connection, ckeys: list[str]) -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for i in range(0, len(ckeys), _IN_CHUNK):
+        chunk = ckeys[i : i + _IN_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        for r in conn.execute(f"SELECT id, canonical_key FROM tracks WHERE canonical_key IN ({marks})", chunk):
+            ids[r[1]] = int(r[0])
+    return ids
+
+
+def upsert_tracks_many(conn: sqlite3.Connection, rows: list[_TrackRow]) -> list[int | None]:
+    """Bulk upsert_track_and_source over (title, artist, duration_sec, source_kind, source_url).
+
+    Returns track ids aligned with rows (None where a row has neither title nor
+    URL). Rows are applied in order, so the result matches per-row upserts.
+    """
+    keyed = _key_track_rows(rows)
+    present = [k for k in keyed if k is not None]
+    if not present:
+        return [None] * len(rows)
+    conn.executemany(_TRACK_UPSERT_SQL, [(ckey, title, artist, dur) for ckey, title, artist, dur, _, _ in present])
+    ids = _track_ids_by_key(conn, list({k[0] for k in present}))
+
+    conn.executemany(
+        _SOURCE_UPSERT_SQL,
+        [
+            (ids[ckey], kind, None, url, title, artist)
+            for ckey, title, artist, _, kind, url in present
+            if kind and url
+        ],
+    )
+    return [ids[k[0]] if k is not None else None for k in keyed]
+
+
+def insert_tracks_bulk(conn: sqlite3.Connection, rows: list[_TrackRow]) -> list[int | None]:
+    """upsert_tracks_many for rows whose tracks and sources are not stored yet.
+
+    Duplicates within rows are merged here the way the upserts would merge
+    them, then written with plain INSERTs. Raises sqlite3.IntegrityError if a
+    row already exists in the DB; rows written before the error are ones the
+    upsert path would leave in the same state, so callers can retry the batch
+    with upsert_tracks_many.
+    """
+    keyed = _key_track_rows(rows)
+    tracks: dict[str, list[Any]] = {}
+    sources: dict[tuple[str, str], list[Any]] = {}
+    for k in keyed:
+        if k is None:
+            continue
+        ckey, title, artist, dur, kind, url = k
+        prev = tracks.get(ckey)
+        if prev is None:
+            tracks[ckey] = [ckey, title, artist, dur]
+        else:
+            prev[1] = title
+            prev[2] = artist if artist is not None else prev[2]
+            prev[3] = dur if dur is not None else prev[3]
+        if kind and url:
+            src = sources.get((kind, url))
+            if src is None:
+                sources[(kind, url)] = [ckey, title, artist]
+            else:
+                src[0] = ckey
+                src[1] = title if title is not None else src[1]
+                src[2] = artist if artist is not None else src[2]
+    if not tracks:
+        return [None] * len(rows)
+    conn.executemany(_TRACK_INSERT_SQL, tracks.values())
+    ids = _track_ids_by_key(conn, list(tracks))
+    conn.executemany(
+        _SOURCE_INSERT_SQL,
+        [(ids[ckey], kind, None, url, title, artist) for (kind, url), (ckey, title, artist) in sources.items()],
+    )
+    return [ids[k[0]] if k is not None else None for k in keyed]
+
+
+def has_tracks(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM tracks LIMIT 1").fetchone() is not None
+
+
+def raw_event_hash(raw_line: str) -> str:
+    # Dedup key only, not a security boundary: a 16-byte BLAKE2b is cheaper to
+    # compute and halves the event_hash index keys compared to SHA-256.
+    return blake2b(raw_line.rstrip("\r\n").encode("utf-8"), digest_size=16).hexdigest()
+
+
 def insert_raw_mpv_event(conn: sqlite3.Connection, payload: dict[str, Any], raw_line: str) -> bool:
-    event_hash = sha256(raw_line.rstrip("\r\n").encode("utf-8")).hexdigest()
-    try:
-        conn.execute(
-            "INSERT INTO raw_mpv_events(event_hash, event_name, payload_json) VALUES (?, ?, ?)",
-            (
-                event_hash,
-                str(payload.get("event") or "unknown"),
-                json.dumps(payload, ensure_ascii=False),
-            ),
-        )
-        return True
-    except sqlite3.IntegrityError:
-        return False
+    event_hash = raw_event_hash(raw_line)
+    # Duplicates are the common case on a replayed log; let SQLite skip them
+    # instead of raising IntegrityError per row.
+    cur = conn.execute(
+        _RAW_EVENT_INSERT_SQL,
+        (event_hash, str(payload.get("event") or "unknown"), raw_line.rstrip("\r\n")),
+    )
+    return cur.rowcount == 1
+
+
+def existing_raw_event_hashes(conn: sqlite3.Connection, hashes: list[str]) -> set[str]:
+    found: set[str] = set()
+    for i in range(0, len(hashes), _IN_CHUNK):
+        chunk = hashes[i : i + _IN_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        rows = conn.execute(f"SELECT event_hash FROM raw_mpv_events WHERE event_hash IN ({marks})", chunk)
+        found.update(r[0] for r in rows)
+    return found
+
+
+def insert_raw_mpv_events(conn: sqlite3.Connection, rows: list[tuple[str, str, str]]) -> int:
+    """Bulk insert (event_hash, event_name, payload_json) rows; returns how many were new."""
+    before = conn.total_changes
+    conn.executemany(
+        _RAW_EVENT_INSERT_SQL,
+        rows,
+    )
+    return conn.total_changes - before
 
 
 def record_play_event(
@@ -115,12 +293,7 @@ def record_play_event(
     session_id: str | None = None,
 ) -> None:
     conn.execute(
-        """
-        INSERT INTO play_events(
-            occurred_at, track_id, source_url, source_kind, action, completed, reason,
-            playback_time_sec, duration_sec, session_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        _PLAY_EVENT_SQL,
         (
             occurred_at,
             track_id,
@@ -149,15 +322,21 @@ def record_feedback_event(
     note: str | None = None,
 ) -> None:
     conn.execute(
-        """
-        INSERT INTO feedback_events(
-            occurred_at, track_id, source_url, source_kind, kind, weight, session_id, note
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        _FEEDBACK_EVENT_SQL,
         (occurred_at, track_id, source_url, source_kind, kind, weight, session_id, note),
     )
 
 
+def record_play_events(conn: sqlite3.Connection, rows: list[tuple]) -> None:
+    """Bulk form of record_play_event; rows follow the play_events column order."""
+    conn.executemany(_PLAY_EVENT_SQL, rows)
+
+
+def record_feedback_events(conn: sqlite3.Connection, rows: list[tuple]) -> None:
+    """Bulk form of record_feedback_event; rows follow the feedback_events column order."""
+    conn.executemany(_FEEDBACK_EVENT_SQL, rows)
+
+
 def get_ingest_offset(conn: sqlite3.Connection, source_name: str) -> int:
     row = conn.execute(
         "SELECT offset_bytes FROM ingest_state WHERE source_name = ?",
@@ -179,7 +358,7 @@ def set_ingest_offset(conn: sqlite3.Connection, source_name: str, offset_bytes:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     track_id: int
     title: str
@@ -244,78 +423,99 @@ def pop_last_manual_event(conn: sqlite3.Connection) -> dict[str, Any] | None:
     return undo_last_user_action(conn)
 
 
-def fetch_recommendations(conn: sqlite3.Connection, limit: int = 10) -> list[Recommendation]:
-    rows = conn.execute(
-        """
-        WITH f_agg AS (
-            SELECT
-                track_id,
-                SUM(CASE
-                    WHEN kind = 'good' THEN 6.0 * weight
-                    WHEN kind = 'bad' THEN -8.0 * weight
-                    ELSE 0 END) AS fb_score,
-                MAX(occurred_at) AS last_feedback_at
-            FROM feedback_events
-            GROUP BY track_id
-        ),
-        p_agg AS (
-            SELECT
-                track_id,
-                SUM(CASE
-                    WHEN action = 'play_end' AND completed = 1 THEN 1.5
-                    WHEN action = 'next' THEN -2.0
-                    ELSE 0 END) AS play_score,
-                MAX(occurred_at) AS last_play_at
+# Rule-engine weights applied to the running sums in track_scores.
+REC_GOOD_WEIGHT = 6.0
+REC_BAD_WEIGHT = -8.0
+REC_COMPLETE_WEIGHT = 1.5
+REC_NEXT_WEIGHT = -2.0
+# Subtracted from tracks among the `recent_limit` most recently touched.
+REC_RECENT_PENALTY = 1.5
+
+# Most recently touched track ids; params: (limit, limit, limit).
+_RECENT_TRACKS_SQL = """
+    SELECT track_id
+    FROM (
+        -- Any track in the overall top-K is in the top-K of whichever table
+        -- holds its latest event, so merge two small top-K lists.
+        SELECT * FROM (
+            SELECT track_id, MAX(occurred_at) AS last_at
             FROM play_events
+            WHERE track_id IS NOT NULL
             GROUP BY track_id
-        ),
+            ORDER BY last_at DESC
+            LIMIT ?
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT track_id, MAX(occurred_at) AS last_at
+            FROM feedback_events
+            WHERE track_id IS NOT NULL
+            GROUP BY track_id
+            ORDER BY last_at DESC
+            LIMIT ?
+        )
+    )
+    GROUP BY track_id
+    ORDER BY MAX(last_at) DESC
+    LIMIT ?
+"""
+
+
+def fetch_recommendations(conn: sqlite3.Connection, limit: int = 10, *, recent_limit: int = 20) -> list[Recommendation]:
+    rows = conn.execute(
+        f"""
+        WITH recent AS ({_RECENT_TRACKS_SQL}),
         agg AS (
             SELECT
                 t.id AS track_id,
                 t.title,
                 t.artist,
-                COALESCE(f.fb_score, 0) AS fb_score,
-                COALESCE(p.play_score, 0) AS play_score,
-                COALESCE(f.last_feedback_at, p.last_play_at, t.updated_at) AS last_seen
+                COALESCE(? * s.good_weight + ? * s.bad_weight, 0) AS fb_score,
+                COALESCE(? * s.completes + ? * s.nexts, 0) AS play_score,
+                COALESCE(s.last_feedback_at, s.last_play_at, t.updated_at) AS last_seen,
+                r.track_id IS NOT NULL AS is_recent
             FROM tracks t
-            LEFT JOIN f_agg f ON f.track_id = t.id
-            LEFT JOIN p_agg p ON p.track_id = t.id
-        ),
-        preferred_source AS (
-            SELECT ts.track_id, ts.source_url, ts.source_kind
-            FROM track_sources ts
-            INNER JOIN (
-                SELECT track_id, MIN(id) AS min_id
-                FROM track_sources
-                WHERE source_url IS NOT NULL
-                GROUP BY track_id
-            ) x ON x.track_id = ts.track_id AND x.min_id = ts.id
+            LEFT JOIN track_scores s ON s.track_id = t.id
+            LEFT JOIN recent r ON r.track_id = t.id
         )
         SELECT
             a.track_id, a.title, a.artist,
-            (a.fb_score + a.play_score) AS score,
-            a.fb_score, a.play_score,
-            ps.source_url, ps.source_kind
+            (a.fb_score + a.play_score - ? * a.is_recent) AS score,
+            a.fb_score, a.play_score
         FROM agg a
-        LEFT JOIN preferred_source ps ON ps.track_id = a.track_id
         ORDER BY score DESC, a.last_seen DESC, a.track_id DESC
         LIMIT ?
         """,
-        (int(limit),),
+        (
+            int(recent_limit),
+            int(recent_limit),
+            int(recent_limit),
+            REC_GOOD_WEIGHT,
+            REC_BAD_WEIGHT,
+            REC_COMPLETE_WEIGHT,
+            REC_NEXT_WEIGHT,
+            REC_RECENT_PENALTY,
+            int(limit),
+        ),
     ).fetchall()
-    return [
-        Recommendation(
-            track_id=int(r["track_id"]),
-            title=str(r["title"]),
-            artist=r["artist"],
-            score=float(r["score"]),
-            source_url=r["source_url"],
-            source_kind=r["source_kind"],
-            fb_score=float(r["fb_score"]),
-            play_score=float(r["play_score"]),
+    # Resolve sources only for the rows that survived the LIMIT.
+    sources = fetch_track_source_map(conn, [int(r["track_id"]) for r in rows])
+    out: list[Recommendation] = []
+    for r in rows:
+        src = sources.get(int(r["track_id"]), {})
+        out.append(
+            Recommendation(
+                track_id=int(r["track_id"]),
+                title=str(r["title"]),
+                artist=r["artist"],
+                score=float(r["score"]),
+                source_url=src.get("source_url"),
+                source_kind=src.get("source_kind"),
+                fb_score=float(r["fb_score"]),
+                play_score=float(r["play_score"]),
+            )
         )
-        for r in rows
-    ]
+    return out
 
 
 def stats_summary(conn: sqlite3.Connection) -> dict[str, Any]:
@@ -324,12 +524,14 @@ def stats_summary(conn: sqlite3.Connection) -> dict[str, Any]:
         SELECT
             (SELECT COUNT(*) FROM tracks) AS tracks,
             (SELECT COUNT(*) FROM track_sources) AS sources,
-            (SELECT COUNT(*) FROM play_events) AS play_events,
-            (SELECT COUNT(*) FROM feedback_events) AS feedback_events,
-            (SELECT COUNT(*) FROM feedback_events WHERE kind='good') AS good_events,
-            (SELECT COUNT(*) FROM feedback_events WHERE kind='bad') AS bad_events
+            (SELECT COUNT(*) FROM play_events) AS play_events
         """
     ).fetchone()
+    # One pass over feedback_events yields the total and every per-kind count.
+    by_kind = {
+        r["kind"]: int(r["c"])
+        for r in conn.execute("SELECT kind, COUNT(*) AS c FROM feedback_events GROUP BY kind")
+    }
     top_artists = conn.execute(
         """
         WITH fg AS (
@@ -358,9 +560,9 @@ def stats_summary(conn: sqlite3.Connection) -> dict[str, Any]:
         "tracks": int(counts["tracks"]),
         "sources": int(counts["sources"]),
         "play_events": int(counts["play_events"]),
-        "feedback_events": int(counts["feedback_events"]),
-        "good_events": int(counts["good_events"]),
-        "bad_events": int(counts["bad_events"]),
+        "feedback_events": sum(by_kind.values()),
+        "good_events": by_kind.get("good", 0),
+        "bad_events": by_kind.get("bad", 0),
         "top_artists": [dict(r) for r in top_artists],
     }
 
@@ -388,24 +590,7 @@ def fetch_top_good_artists(conn: sqlite3.Connection, limit: int = 8) -> list[dic
 
 
 def fetch_recent_track_ids(conn: sqlite3.Connection, limit: int = 30) -> list[int]:
-    rows = conn.execute(
-        """
-        SELECT track_id
-        FROM (
-            SELECT track_id, occurred_at
-            FROM play_events
-            WHERE track_id IS NOT NULL
-            UNION ALL
-            SELECT track_id, occurred_at
-            FROM feedback_events
-            WHERE track_id IS NOT NULL
-        )
-        GROUP BY track_id
-        ORDER BY MAX(occurred_at) DESC
-        LIMIT ?
-        """,
-        (int(limit),),
-    ).fetchall()
+    rows = conn.execute(_RECENT_TRACKS_SQL, (int(limit), int(limit), int(limit))).fetchall()
     return [int(r["track_id"]) for r in rows if r["track_id"] is not None]
 
 
@@ -415,19 +600,9 @@ def fetch_track_source_map(conn: sqlite3.Connection, track_ids: list[int]) -> di
     placeholders = ",".join("?" for _ in track_ids)
     rows = conn.execute(
         f"""
-        WITH preferred_source AS (
-            SELECT ts.track_id, ts.source_url, ts.source_kind
-            FROM track_sources ts
-            INNER JOIN (
-                SELECT track_id, MIN(id) AS min_id
-                FROM track_sources
-                WHERE source_url IS NOT NULL
-                GROUP BY track_id
-            ) x ON x.track_id = ts.track_id AND x.min_id = ts.id
-        )
         SELECT t.id AS track_id, t.title, t.artist, t.duration_sec, ps.source_url, ps.source_kind
         FROM tracks t
-        LEFT JOIN preferred_source ps ON ps.track_id = t.id
+        LEFT JOIN v_preferred_source ps ON ps.track_id = t.id
         WHERE t.id IN ({placeholders})
         """,
         tuple(track_ids),
@@ -435,45 +610,22 @@ def fetch_track_source_map(conn: sqlite3.Connection, track_ids: list[int]) -> di
     return {int(r["track_id"]): dict(r) for r in rows}
 
 
-def fetch_user_profile_weights(conn: sqlite3.Connection) -> list[dict[str, Any]]:
-    rows = conn.execute(
-        """
-        WITH pos_fb AS (
-            SELECT track_id, SUM(CASE WHEN kind='good' THEN 4.0 WHEN kind='bad' THEN -5.0 ELSE 0 END) AS s
-            FROM feedback_events
-            WHERE track_id IS NOT NULL
-            GROUP BY track_id
-        ),
-        pos_play AS (
-            SELECT track_id, SUM(CASE WHEN action='play_end' AND completed=1 THEN 1.0 WHEN action='next' THEN -1.5 ELSE 0 END) AS s
-            FROM play_events
-            WHERE track_id IS NOT NULL
-            GROUP BY track_id
-        )
-        SELECT
-            t.id AS track_id,
-            COALESCE(f.s,0)+COALESCE(p.s,0) AS weight
-        FROM tracks t
-        LEFT JOIN pos_fb f ON f.track_id=t.id
-        LEFT JOIN pos_play p ON p.track_id=t.id
-        WHERE (COALESCE(f.s,0)+COALESCE(p.s,0)) != 0
-        ORDER BY weight DESC, t.id DESC
-        """
-    ).fetchall()
-    return [dict(r) for r in rows]
-
+def fetch_interaction_counts(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    """Per (context_key, track_id) counts of good/bad feedback, completed plays and skips.
 
-def fetch_context_interactions(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    One scan of each event table; the profile and context weights are both
+    derived from these rows in Python.
+    """
     rows = conn.execute(
         """
         WITH e AS (
             SELECT
                 COALESCE(NULLIF(session_id, ''), 'd:' || substr(occurred_at,1,10)) AS context_key,
                 track_id,
-                SUM(CASE
-                    WHEN kind='good' THEN 3.0
-                    WHEN kind='bad' THEN -4.0
-                    ELSE 0 END) AS w
+                SUM(kind='good') AS goods,
+                SUM(kind='bad') AS bads,
+                0 AS completes,
+                0 AS nexts
             FROM feedback_events
             WHERE track_id IS NOT NULL
             GROUP BY 1,2
@@ -481,24 +633,52 @@ def fetch_context_interactions(conn: sqlite3.Connection) -> list[dict[str, Any]]
             SELECT
                 COALESCE(NULLIF(session_id, ''), 'd:' || substr(occurred_at,1,10)) AS context_key,
                 track_id,
-                SUM(CASE
-                    WHEN action='play_end' AND completed=1 THEN 1.0
-                    WHEN action='next' THEN -1.0
-                    ELSE 0 END) AS w
+                0, 0,
+                SUM(action='play_end' AND completed=1),
+                SUM(action='next')
             FROM play_events
             WHERE track_id IS NOT NULL
             GROUP BY 1,2
         )
-        SELECT context_key, track_id, SUM(w) AS weight
+        SELECT
+            context_key, track_id,
+            SUM(goods) AS goods, SUM(bads) AS bads, SUM(completes) AS completes, SUM(nexts) AS nexts
         FROM e
         GROUP BY context_key, track_id
-        HAVING SUM(w) != 0
         ORDER BY context_key, track_id
         """
     ).fetchall()
     return [dict(r) for r in rows]
 
 
+def profile_weights_from_counts(counts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    totals: dict[int, float] = {}
+    for r in counts:
+        tid = int(r["track_id"])
+        w = 4.0 * r["goods"] - 5.0 * r["bads"] + 1.0 * r["completes"] - 1.5 * r["nexts"]
+        totals[tid] = totals.get(tid, 0.0) + w
+    out = [{"track_id": tid, "weight": w} for tid, w in totals.items() if w != 0]
+    out.sort(key=lambda r: (-r["weight"], -r["track_id"]))
+    return out
+
+
+def context_interactions_from_counts(counts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for r in counts:
+        w = 3.0 * r["goods"] - 4.0 * r["bads"] + 1.0 * r["completes"] - 1.0 * r["nexts"]
+        if w != 0:
+            out.append({"context_key": r["context_key"], "track_id": r["track_id"], "weight": w})
+    return out
+
+
+def fetch_user_profile_weights(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    return profile_weights_from_counts(fetch_interaction_counts(conn))
+
+
+def fetch_context_interactions(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    return context_interactions_from_counts(fetch_interaction_counts(conn))
+
+
 def save_session(conn: sqlite3.Connection, name: str, payload: dict[str, Any]) -> None:
     session_name = (name or "default").strip() or "default"
     conn.execute(
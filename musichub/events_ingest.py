@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import json
-from datetime import UTC, datetime
+import mmap
+import re
+import sqlite3
 from typing import Any
 
 from . import db
@@ -17,13 +19,16 @@ def _safe_float(value: Any) -> float | None:
         return None
 
 
+# Leftmost match wins, so "music.youtube.com" is seen before its "youtube.com" suffix.
+_SOURCE_HOST_RE = re.compile(r"(music\.youtube\.com)|youtube\.com|youtu\.be")
+
+
 def _guess_source_kind(path: str | None) -> str | None:
     if not path:
         return None
-    if "music.youtube.com" in path:
-        return "ytmusic"
-    if "youtube.com" in path or "youtu.be" in path:
-        return "youtube"
+    m = _SOURCE_HOST_RE.search(path)
+    if m:
+        return "ytmusic" if m.group(1) else "youtube"
     if "://" in path:
         return "url"
     return "local"
@@ -57,131 +62,183 @@ def _event_time_iso(payload: dict[str, Any]) -> str:
     raw = payload.get("time")
     if isinstance(raw, str) and raw:
         return raw
-    return datetime.now(UTC).isoformat()
+    return db.utc_now_iso()
 
 
-def _upsert_track_from_event(conn, payload: dict[str, Any]) -> tuple[int | None, str | None, str | None]:
+def _track_fields(payload: dict[str, Any]) -> tuple[str | None, str | None, float | None, str | None, str | None]:
+    """(title, artist, duration, source_kind, source_url) as passed to upsert_track_and_source."""
     source_url = payload.get("path") if isinstance(payload.get("path"), str) else None
-    source_kind = _guess_source_kind(source_url)
-    title = _pick_title(payload)
     metadata = payload.get("metadata") if isinstance(payload.get("metadata"), dict) else None
-    artist = _pick_artist(metadata)
-    duration = _safe_float(payload.get("duration"))
+    return (
+        _pick_title(payload),
+        _pick_artist(metadata),
+        _safe_float(payload.get("duration")),
+        _guess_source_kind(source_url),
+        source_url,
+    )
+
+
+def ingest_mpv_events(paths: AppPaths, conn: sqlite3.Connection | None = None) -> dict[str, int]:
+    """Ingest new JSONL lines; pass a long-lived conn (daemon) to skip reconnecting per call."""
+    if not paths.events_jsonl.exists():
+        return {"read": 0, "new": 0, "skipped": 0}
+
+    own_conn = conn is None
+    if conn is None:
+        conn = db.connect(paths.db_path)
+    try:
+        with conn:
+            return _ingest_pending_lines(paths, conn)
+    finally:
+        if own_conn:
+            db.close(conn)
+
+
+def _cached_track_id(conn: sqlite3.Connection, track_ids: dict[tuple, int | None], fields: tuple) -> int | None:
+    """Upsert each track once per pass; ``track_ids`` lives for one transaction only."""
+    if fields in track_ids:
+        return track_ids[fields]
+    title, artist, duration_sec, source_kind, source_url = fields
     track_id = db.upsert_track_and_source(
         conn,
         title=title,
         artist=artist,
-        duration_sec=duration,
+        duration_sec=duration_sec,
         source_kind=source_kind,
         source_url=source_url,
     )
-    return track_id, source_url, source_kind
+    track_ids[fields] = track_id
+    return track_id
 
 
-def ingest_mpv_events(paths: AppPaths) -> dict[str, int]:
-    if not paths.events_jsonl.exists():
+# Lines buffered before their rows are written with executemany and the
+# ingest offset is advanced.
+_INGEST_BATCH_LINES = 1000
+
+
+def _ingest_pending_lines(paths: AppPaths, conn: sqlite3.Connection) -> dict[str, int]:
+    offset = db.get_ingest_offset(conn, "mpv_jsonl")
+    file_size = paths.events_jsonl.stat().st_size
+    if offset < 0 or offset > file_size:
+        # JSONL may be rotated/truncated; reset to start to avoid getting stuck past EOF.
+        offset = 0
+        db.set_ingest_offset(conn, "mpv_jsonl", 0)
+    read_count = 0
+    new_count = 0
+    skipped = 0
+
+    if offset == file_size:
         return {"read": 0, "new": 0, "skipped": 0}
 
-    conn = db.connect(paths.db_path)
-    try:
-        offset = db.get_ingest_offset(conn, "mpv_jsonl")
-        file_size = paths.events_jsonl.stat().st_size
-        if offset < 0 or offset > file_size:
-            # JSONL may be rotated/truncated; reset to start to avoid getting stuck past EOF.
-            offset = 0
-            db.set_ingest_offset(conn, "mpv_jsonl", 0)
-        read_count = 0
-        new_count = 0
-        skipped = 0
-
-        with paths.events_jsonl.open("r", encoding="utf-8") as f:
-            f.seek(offset)
-            while True:
-                line = f.readline()
-                if not line:
-                    break
-                read_count += 1
-                line_end_offset = f.tell()
-                line_stripped = line.strip()
-                if not line_stripped:
-                    db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
-                    continue
-                try:
-                    payload = json.loads(line_stripped)
-                except json.JSONDecodeError:
-                    skipped += 1
-                    db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
-                    continue
-
-                if not db.insert_raw_mpv_event(conn, payload, line_stripped):
-                    db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
-                    continue
-                new_count += 1
-
-                event_name = str(payload.get("event") or "unknown")
-                ts = _event_time_iso(payload)
-                session_id = payload.get("session_id") if isinstance(payload.get("session_id"), str) else None
-                track_id, source_url, source_kind = _upsert_track_from_event(conn, payload)
-                playback_time = _safe_float(payload.get("playback_time"))
-                duration = _safe_float(payload.get("duration"))
-
-                if event_name == "play_start":
-                    db.record_play_event(
-                        conn,
-                        occurred_at=ts,
-                        track_id=track_id,
-                        source_url=source_url,
-                        source_kind=source_kind,
-                        action="play_start",
-                        playback_time_sec=playback_time,
-                        duration_sec=duration,
-                        session_id=session_id,
-                    )
-                elif event_name == "play_end":
-                    reason = str(payload.get("reason") or "")
-                    completed = bool(reason == "eof")
-                    if duration and playback_time is not None and duration > 0:
-                        completed = completed or ((playback_time / duration) >= 0.8)
-                    db.record_play_event(
-                        conn,
-                        occurred_at=ts,
-                        track_id=track_id,
-                        source_url=source_url,
-                        source_kind=source_kind,
-                        action="play_end",
-                        completed=completed,
-                        reason=reason or None,
-                        playback_time_sec=playback_time,
-                        duration_sec=duration,
-                        session_id=session_id,
-                    )
-                elif event_name in {"good", "bad"}:
-                    db.record_feedback_event(
-                        conn,
-                        occurred_at=ts,
-                        track_id=track_id,
-                        source_url=source_url,
-                        source_kind=source_kind,
-                        kind=event_name,
-                        session_id=session_id,
-                    )
-                elif event_name == "next":
-                    db.record_play_event(
-                        conn,
-                        occurred_at=ts,
-                        track_id=track_id,
-                        source_url=source_url,
-                        source_kind=source_kind,
-                        action="next",
-                        reason=str(payload.get("reason") or "manual_next"),
-                        playback_time_sec=playback_time,
-                        duration_sec=duration,
-                        session_id=session_id,
-                    )
-
-                db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
-
-        conn.commit()
-        return {"read": read_count, "new": new_count, "skipped": skipped}
-    finally:
-        conn.close()
+    with paths.events_jsonl.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Only consume complete lines; a trailing fragment is mpv mid-write and
+        # is picked up on the next pass once its newline lands. Finding the
+        # last newline in the mapping means only complete lines get copied.
+        end = mm.rfind(b"\n", offset) + 1
+        complete = mm[offset:end] if end else b""
+    if not complete:
+        return {"read": 0, "new": 0, "skipped": 0}
+
+    line_end_offset = offset
+    pending: dict[str, tuple[dict[str, Any], str]] = {}
+    track_ids: dict[tuple, int | None] = {}
+    for raw in complete[:-1].split(b"\n"):
+        read_count += 1
+        line_end_offset += len(raw) + 1
+        line_stripped = raw.decode("utf-8", errors="replace").strip()
+        if not line_stripped:
+            continue
+        try:
+            payload = json.loads(line_stripped)
+        except json.JSONDecodeError:
+            skipped += 1
+            continue
+        if not isinstance(payload, dict):
+            skipped += 1
+            continue
+
+        # Keyed by hash, so a line repeated within one batch is only written once.
+        pending.setdefault(db.raw_event_hash(line_stripped), (payload, line_stripped))
+        if len(pending) >= _INGEST_BATCH_LINES:
+            new_count += _flush_pending_events(conn, track_ids, pending)
+            db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
+            pending.clear()
+
+    new_count += _flush_pending_events(conn, track_ids, pending)
+    db.set_ingest_offset(conn, "mpv_jsonl", line_end_offset)
+    return {"read": read_count, "new": new_count, "skipped": skipped}
+
+
+def _flush_pending_events(
+    conn: sqlite3.Connection, track_ids: dict[tuple, int | None], pending: dict[str, tuple[dict[str, Any], str]]
+) -> int:
+    if not pending:
+        return 0
+    existing = db.existing_raw_event_hashes(conn, list(pending))
+    fresh = [(h, payload, line) for h, (payload, line) in pending.items() if h not in existing]
+    if not fresh:
+        return 0
+
+    # The stripped line already is the payload's JSON; store it as-is rather
+    # than serializing the parsed dict a second time.
+    db.insert_raw_mpv_events(
+        conn,
+        [(h, str(payload.get("event") or "unknown"), line) for h, payload, line in fresh],
+    )
+
+    play_rows: list[tuple] = []
+    feedback_rows: list[tuple] = []
+    for _, payload, _ in fresh:
+        event_name = str(payload.get("event") or "unknown")
+        ts = _event_time_iso(payload)
+        session_id = payload.get("session_id") if isinstance(payload.get("session_id"), str) else None
+        fields = _track_fields(payload)
+        track_id = _cached_track_id(conn, track_ids, fields)
+        source_kind, source_url = fields[3], fields[4]
+        playback_time = _safe_float(payload.get("playback_time"))
+        duration = fields[2]
+
+        if event_name == "play_start":
+            play_rows.append(
+                (ts, track_id, source_url, source_kind, "play_start", 0, None, playback_time, duration, session_id)
+            )
+        elif event_name == "play_end":
+            reason = str(payload.get("reason") or "")
+            completed = bool(reason == "eof")
+            if duration and playback_time is not None and duration > 0:
+                completed = completed or ((playback_time / duration) >= 0.8)
+            play_rows.append(
+                (
+                    ts,
+                    track_id,
+                    source_url,
+                    source_kind,
+                    "play_end",
+                    1 if completed else 0,
+                    reason or None,
+                    playback_time,
+                    duration,
+                    session_id,
+                )
+            )
+        elif event_name in {"good", "bad"}:
+            feedback_rows.append((ts, track_id, source_url, source_kind, event_name, 1.0, session_id, None))
+        elif event_name == "next":
+            play_rows.append(
+                (
+                    ts,
+                    track_id,
+                    source_url,
+                    source_kind,
+                    "next",
+                    0,
+                    str(payload.get("reason") or "manual_next"),
+                    playback_time,
+                    duration,
+                    session_id,
+                )
+            )
+
+    db.record_play_events(conn, play_rows)
+    db.record_feedback_events(conn, feedback_rows)
+    return len(fresh)
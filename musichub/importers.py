@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, compress, repeat
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
 
 from . import db
 from .config import AppPaths
@@ -34,180 +38,320 @@ class ImportResult:
         }
 
 
+_JSON_ITEM_KEYS = ("items", "tracks", "songs", "data")
+
+
 def _coerce_items_from_json(data: Any) -> list[dict[str, Any]]:
     if isinstance(data, list):
         return [x for x in data if isinstance(x, dict)]
     if isinstance(data, dict):
-        for key in ("items", "tracks", "songs", "data"):
+        for key in _JSON_ITEM_KEYS:
             value = data.get(key)
             if isinstance(value, list):
                 return [x for x in value if isinstance(x, dict)]
     return []
 
 
-def _extract_title(item: dict[str, Any]) -> str | None:
-    for key in ("title", "name", "song", "track", "videoTitle"):
-        v = item.get(key)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _open_json(p: Path) -> BinaryIO:
+    """Open ``p`` for binary reading, positioned after a UTF-8 BOM if present.
+
+    Windows PowerShell 5.1 writes one; json.load skips it but ijson does not.
+    """
+    f = p.open("rb")
+    if f.read(len(_UTF8_BOM)) != _UTF8_BOM:
+        f.seek(0)
+    return f
+
+
+def _first_json_byte(p: Path) -> bytes:
+    with _open_json(p) as f:
+        while chunk := f.read(4096):
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped[:1]
+    return b""
+
+
+def _stream_json_items(p: Path, ijson: Any) -> Iterator[dict[str, Any]]:
+    """Yield item dicts one at a time; same selection rules as _coerce_items_from_json."""
+    first = _first_json_byte(p)
+    if first == b"[":
+        prefix: str | None = "item"
+    elif first == b"{":
+        # Key priority matters but object order doesn't, so find which candidate
+        # keys hold arrays with an event-only pass before streaming the winner.
+        found: set[str] = set()
+        with _open_json(p) as f:
+            for event_prefix, event, _ in ijson.parse(f):
+                if event == "start_array" and event_prefix in _JSON_ITEM_KEYS:
+                    found.add(event_prefix)
+                    if event_prefix == _JSON_ITEM_KEYS[0]:
+                        break
+        key = next((k for k in _JSON_ITEM_KEYS if k in found), None)
+        prefix = f"{key}.item" if key else None
+    else:
+        prefix = None
+    if prefix is None:
+        return
+    with _open_json(p) as f:
+        for obj in ijson.items(f, prefix, use_float=True):
+            if isinstance(obj, dict):
+                yield obj
+
+
+# Below this size a whole-file parse is cheaper than ijson's extra passes.
+_STREAM_JSON_MIN_BYTES = 1 << 20
+
+
+def _load_json_items(p: Path) -> list[dict[str, Any]]:
+    # json.load on a binary stream decodes inside the parser; no file-sized str copy.
+    with p.open("rb", buffering=1 << 20) as f:
+        return _coerce_items_from_json(json.load(f))
+
+
+def _iter_json_file_items(p: Path) -> Iterable[dict[str, Any]]:
+    if p.stat().st_size < _STREAM_JSON_MIN_BYTES:
+        return _load_json_items(p)
+    try:
+        import ijson  # type: ignore
+    except Exception:
+        return _load_json_items(p)
+    return _stream_json_items(p, ijson)
 
 
-def _extract_artist(item: dict[str, Any]) -> str | None:
-    for key in ("artist", "artists", "author", "uploader"):
-        v = item.get(key)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-        if isinstance(v, list):
-            parts: list[str] = []
-            for x in v:
-                if isinstance(x, str) and x.strip():
-                    parts.append(x.strip())
-                elif isinstance(x, dict):
-                    for name_key in ("name", "artist", "title"):
-                        name = x.get(name_key)
-                        if isinstance(name, str) and name.strip():
-                            parts.append(name.strip())
-                            break
-            if parts:
-                return ", ".join(parts)
+def _clean_str(v: Any) -> str | None:
+    if isinstance(v, str):
+        v = v.strip()
+        if v:
+            return v
     return None
 
 
-def _extract_url(item: dict[str, Any]) -> str | None:
-    for key in ("url", "source_url", "videoUrl", "webpage_url", "link"):
-        v = item.get(key)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    video_id = item.get("videoId") or item.get("video_id")
-    if isinstance(video_id, str) and video_id.strip():
-        return f"https://music.youtube.com/watch?v={video_id.strip()}"
-    return None
+def _artist_value(v: Any) -> str | None:
+    if isinstance(v, list):
+        parts: list[str] = []
+        for x in v:
+            if isinstance(x, str) and x.strip():
+                parts.append(x.strip())
+            elif isinstance(x, dict):
+                for name_key in ("name", "artist", "title"):
+                    name = x.get(name_key)
+                    if isinstance(name, str) and name.strip():
+                        parts.append(name.strip())
+                        break
+        return ", ".join(parts) if parts else None
+    return _clean_str(v)
 
 
-def _extract_duration_sec(item: dict[str, Any]) -> float | None:
-    for key in ("duration_sec", "duration", "lengthSeconds"):
-        v = item.get(key)
-        try:
-            if v is not None:
-                return float(v)
-        except (TypeError, ValueError):
-            pass
-    return None
+def _video_id_url(v: Any) -> str | None:
+    video_id = _clean_str(v)
+    return f"https://music.youtube.com/watch?v={video_id}" if video_id else None
+
+
+def _duration_value(v: Any) -> float | None:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# Export key -> (normalized field, priority, coercer); earlier keys win for a
+# field. Items are scanned once and only keys they actually carry are probed.
+_FIELD_KEYS: tuple[tuple[str, tuple[str, ...], Callable[[Any], Any]], ...] = (
+    ("title", ("title", "name", "song", "track", "videoTitle"), _clean_str),
+    ("artist", ("artist", "artists", "author", "uploader"), _artist_value),
+    ("source_url", ("url", "source_url", "videoUrl", "webpage_url", "link"), _clean_str),
+    ("source_url", ("videoId", "video_id"), _video_id_url),
+    ("duration_sec", ("duration_sec", "duration", "lengthSeconds"), _duration_value),
+    ("time", ("time", "occurred_at", "played_at", "timestamp", "addedAt"), _clean_str),
+)
+_FIELD_PROBES: dict[str, tuple[str, int, Callable[[Any], Any]]] = {
+    key: (name, rank, coerce)
+    for rank, (key, name, coerce) in enumerate(
+        (key, name, coerce) for name, keys, coerce in _FIELD_KEYS for key in keys
+    )
+}
+
+
+def _extract_fields(item: dict[str, Any]) -> dict[str, Any]:
+    found: dict[str, Any] = {}
+    ranks: dict[str, int] = {}
+    for key, v in item.items():
+        probe = _FIELD_PROBES.get(key)
+        if probe is None:
+            continue
+        name, rank, coerce = probe
+        if name in ranks and ranks[name] < rank:
+            continue
+        value = coerce(v)
+        if value is not None:
+            found[name] = value
+            ranks[name] = rank
+    return found
+
+
+# Records per NormalizedBatch; each batch is written with one executemany
+# per table.
+_IMPORT_BATCH_ITEMS = 2000
 
 
-def _extract_time(item: dict[str, Any]) -> str:
-    for key in ("time", "occurred_at", "played_at", "timestamp", "addedAt"):
-        v = item.get(key)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return _now_iso()
+@dataclass
+class NormalizedBatch:
+    """Normalized import records stored column-wise, one list per field.
+
+    Records with neither title nor URL are not stored, only counted in
+    ``skipped``.
+    """
+
+    source_kind: str
+    titles: list[str | None] = field(default_factory=list)
+    artists: list[str | None] = field(default_factory=list)
+    urls: list[str | None] = field(default_factory=list)
+    durations: list[float | None] = field(default_factory=list)
+    liked: list[bool] = field(default_factory=list)
+    disliked: list[bool] = field(default_factory=list)
+    play_counts: list[int] = field(default_factory=list)
+    times: list[str] = field(default_factory=list)
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        return len(self.titles)
 
 
-def _iter_normalized_items(raw_items: Iterable[dict[str, Any]], source_kind: str) -> Iterable[dict[str, Any]]:
+def _iter_normalized_batches(
+    raw_items: Iterable[dict[str, Any]], source_kind: str, batch_size: int | None = None
+) -> Iterator[NormalizedBatch]:
+    size = batch_size or _IMPORT_BATCH_ITEMS
+    # One fallback timestamp per run; items without one share the import time.
+    default_ts = _now_iso()
+    batch = NormalizedBatch(source_kind)
     for item in raw_items:
-        title = _extract_title(item)
-        artist = _extract_artist(item)
-        url = _extract_url(item)
-        duration = _extract_duration_sec(item)
+        fields = _extract_fields(item)
+        title = fields.get("title")
+        url = fields.get("source_url")
+        if not (title or url):
+            batch.skipped += 1
+            continue
 
-        liked = bool(item.get("liked") or item.get("isLiked") or item.get("favorite"))
-        disliked = bool(item.get("disliked") or item.get("isDisliked") or item.get("banned"))
         play_count = 0
         try:
             play_count = int(item.get("play_count") or item.get("playCount") or 0)
         except (TypeError, ValueError):
             play_count = 0
 
-        yield {
-            "title": title,
-            "artist": artist,
-            "source_url": url,
-            "duration_sec": duration,
-            "source_kind": source_kind,
-            "liked": liked,
-            "disliked": disliked,
-            "play_count": max(play_count, 0),
-            "time": _extract_time(item),
-            "raw": item,
-        }
-
-
-def import_normalized_items(conn, *, source_label: str, items: Iterable[dict[str, Any]]) -> ImportResult:
+        batch.titles.append(title)
+        batch.artists.append(fields.get("artist"))
+        batch.urls.append(url)
+        batch.durations.append(fields.get("duration_sec"))
+        batch.liked.append(bool(item.get("liked") or item.get("isLiked") or item.get("favorite")))
+        batch.disliked.append(bool(item.get("disliked") or item.get("isDisliked") or item.get("banned")))
+        batch.play_counts.append(max(play_count, 0))
+        batch.times.append(fields.get("time") or default_ts)
+        if len(batch) >= size:
+            yield batch
+            batch = NormalizedBatch(source_kind)
+    if len(batch) or batch.skipped:
+        yield batch
+
+
+def import_normalized_items(conn, *, source_label: str, batches: Iterable[NormalizedBatch]) -> ImportResult:
     result = ImportResult(source=source_label, notes=[])
-    for item in items:
-        if not (item.get("title") or item.get("source_url")):
-            result.skipped += 1
-            continue
-        track_id = db.upsert_track_and_source(
-            conn,
-            title=item.get("title"),
-            artist=item.get("artist"),
-            duration_sec=item.get("duration_sec"),
-            source_kind=item.get("source_kind"),
-            source_url=item.get("source_url"),
-        )
-        result.tracks_upserted += 1
-        ts = str(item.get("time") or _now_iso())
-        source_kind = item.get("source_kind")
-        source_url = item.get("source_url")
+    # Into an empty library nothing can conflict, so tracks and sources go in
+    # with plain INSERTs until the first collision with an earlier batch.
+    fresh = not db.has_tracks(conn)
+    for batch in batches:
+        result.skipped += batch.skipped
+        if len(batch):
+            fresh = _write_import_batch(conn, source_label, batch, result, fresh=fresh)
+    return result
 
-        if item.get("liked"):
-            db.record_feedback_event(
-                conn,
-                occurred_at=ts,
-                track_id=track_id,
-                source_url=source_url,
-                source_kind=source_kind,
-                kind="good",
-                note=f"import:{source_label}",
-            )
-            result.feedback_events += 1
-        if item.get("disliked"):
-            db.record_feedback_event(
-                conn,
-                occurred_at=ts,
-                track_id=track_id,
-                source_url=source_url,
-                source_kind=source_kind,
-                kind="bad",
-                note=f"import:{source_label}",
-            )
-            result.feedback_events += 1
 
-        play_count = int(item.get("play_count") or 0)
-        for _ in range(min(play_count, 5)):
-            db.record_play_event(
-                conn,
-                occurred_at=ts,
-                track_id=track_id,
-                source_url=source_url,
-                source_kind=source_kind,
-                action="play_end",
-                completed=True,
-                reason=f"import:{source_label}",
-                duration_sec=item.get("duration_sec"),
-            )
-            result.play_events += 1
-    return result
+def _write_import_batch(conn, source_label: str, batch: NormalizedBatch, result: ImportResult, *, fresh: bool) -> bool:
+    kind = batch.source_kind
+    track_rows = list(zip(batch.titles, batch.artists, batch.durations, repeat(kind), batch.urls))
+    track_ids = None
+    if fresh:
+        try:
+            track_ids = db.insert_tracks_bulk(conn, track_rows)
+        except sqlite3.IntegrityError:
+            fresh = False
+    if track_ids is None:
+        track_ids = db.upsert_tracks_many(conn, track_rows)
+    result.tracks_upserted += len(batch)
+
+    note = f"import:{source_label}"
+    ts, urls = batch.times, batch.urls
+    feedback_rows = [
+        (ts[i], track_ids[i], urls[i], kind, "good", 1.0, None, note) for i in compress(range(len(batch)), batch.liked)
+    ]
+    feedback_rows += [
+        (ts[i], track_ids[i], urls[i], kind, "bad", 1.0, None, note) for i in compress(range(len(batch)), batch.disliked)
+    ]
+    play_rows: list[tuple] = []
+    for i in compress(range(len(batch)), batch.play_counts):
+        play_row = (ts[i], track_ids[i], urls[i], kind, "play_end", 1, note, None, batch.durations[i], None)
+        play_rows.extend([play_row] * min(batch.play_counts[i], 5))
+
+    db.record_feedback_events(conn, feedback_rows)
+    db.record_play_events(conn, play_rows)
+    result.feedback_events += len(feedback_rows)
+    result.play_events += len(play_rows)
+    return fresh
 
 
 def import_json_file(paths: AppPaths, *, source_kind: str, json_file: str | Path) -> ImportResult:
     p = Path(json_file).expanduser().resolve()
-    data = json.loads(p.read_text(encoding="utf-8"))
-    raw_items = _coerce_items_from_json(data)
+    # With ijson installed, exports are streamed record by record instead of
+    # being materialized whole; each record is upserted as it is parsed.
+    raw_items = _iter_json_file_items(p)
     conn = db.connect(paths.db_path)
     try:
         result = import_normalized_items(
             conn,
             source_label=f"{source_kind}-json",
-            items=_iter_normalized_items(raw_items, source_kind),
+            batches=_iter_normalized_batches(raw_items, source_kind),
         )
         result.notes = (result.notes or []) + [f"file={p}"]
         conn.commit()
         return result
     finally:
-        conn.close()
+        db.close(conn)
+
+
+def _normalize_json_file(json_file: Path, source_kind: str) -> list[NormalizedBatch]:
+    # Runs in a worker process; columnar batches pickle back far more cheaply
+    # than one dict per record.
+    return list(_iter_normalized_batches(_iter_json_file_items(json_file), source_kind))
+
+
+def import_json_files(
+    paths: AppPaths, *, source_kind: str, json_files: Iterable[str | Path], max_workers: int | None = None
+) -> ImportResult:
+    """Import several exports: parse in worker processes, write on one connection.
+
+    Files are parsed and normalized in parallel; the normalized items are
+    written in file order by this process inside a single transaction.
+    """
+    files = [Path(f).expanduser().resolve() for f in json_files]
+    if len(files) == 1:
+        return import_json_file(paths, source_kind=source_kind, json_file=files[0])
+    workers = max_workers or min(len(files), os.cpu_count() or 1, 4)
+    conn = db.connect(paths.db_path)
+    try:
+        with ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+            result = import_normalized_items(
+                conn,
+                source_label=f"{source_kind}-json",
+                batches=chain.from_iterable(executor.map(_normalize_json_file, files, repeat(source_kind))),
+            )
+        result.notes = (result.notes or []) + [f"files={len(files)}"]
+        conn.commit()
+        return result
+    finally:
+        db.close(conn)
 
 
 def import_ytm_live(paths: AppPaths, *, auth_json: str | Path | None = None, include_history: bool = True) -> ImportResult:
@@ -230,10 +374,17 @@ def import_ytm_live(paths: AppPaths, *, auth_json: str | Path | None = None, inc
     ytm = YTMusic(auth=auth)
     collected: list[dict[str, Any]] = []
     notes: list[str] = []
+    fetched_at = _now_iso()
+
+    # Liked songs and history are independent round-trips; fetch them together.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Bound inside the worker so a missing method surfaces as a note below.
+        liked_future = executor.submit(lambda: ytm.get_liked_songs(limit=5000))  # type: ignore[arg-type]
+        history_future = executor.submit(lambda: ytm.get_history()) if include_history else None  # type: ignore[misc]
 
     # Liked songs (method names vary slightly across versions; keep defensive)
     try:
-        liked = ytm.get_liked_songs(limit=5000)  # type: ignore[arg-type]
+        liked = liked_future.result()
         tracks = liked.get("tracks", []) if isinstance(liked, dict) else []
         for t in tracks:
             if not isinstance(t, dict):
@@ -246,16 +397,16 @@ def import_ytm_live(paths: AppPaths, *, auth_json: str | Path | None = None, inc
                     "duration_sec": None,
                     "liked": True,
                     "play_count": 0,
-                    "time": _now_iso(),
+                    "time": fetched_at,
                 }
             )
         notes.append(f"liked_tracks={len(tracks)}")
     except Exception as exc:
         notes.append(f"get_liked_songs failed: {exc}")
 
-    if include_history:
+    if history_future is not None:
         try:
-            history = ytm.get_history()  # type: ignore[misc]
+            history = history_future.result()
             for h in history if isinstance(history, list) else []:
                 if not isinstance(h, dict):
                     continue
@@ -265,7 +416,7 @@ def import_ytm_live(paths: AppPaths, *, auth_json: str | Path | None = None, inc
                         "artists": [a.get("name") for a in h.get("artists", []) if isinstance(a, dict)],
                         "videoId": h.get("videoId"),
                         "play_count": 1,
-                        "time": _now_iso(),
+                        "time": fetched_at,
                     }
                 )
             notes.append(f"history_items={len(history) if isinstance(history, list) else 0}")
@@ -277,13 +428,13 @@ def import_ytm_live(paths: AppPaths, *, auth_json: str | Path | None = None, inc
         result = import_normalized_items(
             conn,
             source_label="ytm-live",
-            items=_iter_normalized_items(collected, "ytmusic"),
+            batches=_iter_normalized_batches(collected, "ytmusic"),
         )
         result.notes = (result.notes or []) + notes
         conn.commit()
         return result
     finally:
-        conn.close()
+        db.close(conn)
 
 
 def import_ncm_json(paths: AppPaths, *, json_file: str | Path) -> ImportResult:
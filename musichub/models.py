@@ -65,13 +65,19 @@ def train_implicit_cache(paths: AppPaths, *, topn: int = 200, k: int = 64) -> Tr
 
     conn = db.connect(paths.db_path)
     try:
-        interactions = db.fetch_context_interactions(conn)
-        profile = db.fetch_user_profile_weights(conn)
+        counts = db.fetch_interaction_counts(conn)
+        interactions = db.context_interactions_from_counts(counts)
+        profile = db.profile_weights_from_counts(counts)
         if not interactions:
             return TrainResult(engine="implicit", ok=False, message="No interactions available for training")
 
-        context_keys = sorted({str(r["context_key"]) for r in interactions})
-        track_ids = sorted({int(r["track_id"]) for r in interactions})
+        # Sorted unique keys plus each row's index into them, computed in C;
+        # np.unique orders strings by code point, exactly like sorted().
+        n = len(interactions)
+        context_keys, rows = np.unique(np.array([str(r["context_key"]) for r in interactions]), return_inverse=True)
+        track_ids, cols = np.unique(
+            np.fromiter((int(r["track_id"]) for r in interactions), dtype=np.int64, count=n), return_inverse=True
+        )
         if len(context_keys) < 2 or len(track_ids) < 3:
             return TrainResult(
                 engine="implicit",
@@ -81,38 +87,27 @@ def train_implicit_cache(paths: AppPaths, *, topn: int = 200, k: int = 64) -> Tr
                 items=len(track_ids),
             )
 
-        ctx_idx = {k: i for i, k in enumerate(context_keys)}
-        item_idx = {tid: i for i, tid in enumerate(track_ids)}
-        rows: list[int] = []
-        cols: list[int] = []
-        vals: list[float] = []
-        for r in interactions:
-            w = float(r["weight"])
-            if w <= 0:
-                continue
-            rows.append(ctx_idx[str(r["context_key"])])
-            cols.append(item_idx[int(r["track_id"])])
-            vals.append(w)
-        if not vals:
+        vals = np.fromiter((r["weight"] for r in interactions), dtype=np.float32, count=n)
+        positive = vals > 0
+        if not positive.any():
             return TrainResult(engine="implicit", ok=False, message="No positive interactions for implicit training")
 
-        user_item = csr_matrix((np.array(vals, dtype=np.float32), (np.array(rows), np.array(cols))), shape=(len(context_keys), len(track_ids)))
+        user_item = csr_matrix(
+            (vals[positive], (rows[positive], cols[positive])),
+            shape=(len(context_keys), len(track_ids)),
+        )
         if user_item.nnz == 0:
             return TrainResult(engine="implicit", ok=False, message="Empty training matrix")
 
         model = BM25Recommender(K=int(k))
         model.fit(user_item.T.tocsr())
 
-        profile_map = {int(r["track_id"]): float(r["weight"]) for r in profile}
-        pr_rows: list[int] = []
-        pr_cols: list[int] = []
-        pr_vals: list[float] = []
-        for tid, w in profile_map.items():
-            if tid in item_idx and w > 0:
-                pr_rows.append(0)
-                pr_cols.append(item_idx[tid])
-                pr_vals.append(float(w))
-        if not pr_vals:
+        # Profile tracks mapped onto trained item columns by binary search.
+        pr_tids = np.fromiter((int(r["track_id"]) for r in profile), dtype=np.int64, count=len(profile))
+        pr_w = np.fromiter((r["weight"] for r in profile), dtype=np.float32, count=len(profile))
+        pr_cols = np.minimum(np.searchsorted(track_ids, pr_tids), len(track_ids) - 1)
+        keep = (track_ids[pr_cols] == pr_tids) & (pr_w > 0)
+        if not keep.any():
             return TrainResult(
                 engine="implicit",
                 ok=False,
@@ -122,7 +117,7 @@ def train_implicit_cache(paths: AppPaths, *, topn: int = 200, k: int = 64) -> Tr
             )
 
         profile_user_item = csr_matrix(
-            (np.array(pr_vals, dtype=np.float32), (np.array(pr_rows), np.array(pr_cols))),
+            (pr_w[keep], (np.zeros(int(keep.sum()), dtype=np.int32), pr_cols[keep])),
             shape=(1, len(track_ids)),
         )
 
@@ -136,7 +131,7 @@ def train_implicit_cache(paths: AppPaths, *, topn: int = 200, k: int = 64) -> Tr
 
         recs = []
         for idx, score in zip(ids.tolist(), scores.tolist()):
-            tid = track_ids[int(idx)]
+            tid = int(track_ids[int(idx)])
             recs.append({"track_id": tid, "score": float(score)})
 
         payload = {
@@ -168,9 +163,29 @@ def train_implicit_cache(paths: AppPaths, *, topn: int = 200, k: int = 64) -> Tr
             items=len(track_ids),
         )
     finally:
-        conn.close()
+        db.close(conn)
+
+
+# Recs file path -> ((mtime_ns, size), parsed payload); see load_implicit_cache.
+_IMPLICIT_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any] | None]] = {}
 
 
 def load_implicit_cache(paths: AppPaths) -> dict[str, Any] | None:
-    return _load_json(paths.implicit_recs_file)
+    """Return the trained implicit recs payload, or None when absent.
+
+    The parsed payload is reused while the file is unchanged, so repeated
+    calls cost one stat(). Callers must treat it as read-only.
+    """
+    path = paths.implicit_recs_file
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _IMPLICIT_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    payload = _load_json(path)
+    _IMPLICIT_CACHE[path] = (key, payload)
+    return payload
 
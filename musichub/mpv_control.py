@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
@@ -11,8 +12,9 @@ from .playback_prefs import load_playback_prefs
 from .slots import pipe_for_slot, SLOT_PRIMARY
 
 
+@functools.lru_cache(maxsize=4)
 def _resolve_ytdlp(mpv_exe: str) -> str | None:
-    """Find yt-dlp: alongside mpv, Python Scripts, or PATH."""
+    """Find yt-dlp: alongside mpv, Python Scripts, or PATH (cached per mpv_exe)."""
     candidates = [
         Path(mpv_exe).parent / "yt-dlp.exe",
         Path(sys.executable).parent / "yt-dlp.exe",
@@ -30,9 +32,16 @@ def resolve_mpv_exe(paths: AppPaths) -> str:
     env_override = os.environ.get("MUSICHUB_MPV_EXE")
     if env_override:
         return env_override
+    return _find_mpv_exe(paths.mpv_exe_hint)
+
+
+# Install locations don't change within a process; a miss raises and so is
+# not cached.
+@functools.lru_cache(maxsize=4)
+def _find_mpv_exe(mpv_exe_hint: Path) -> str:
     # Repo-local portable (gitignored; present when bundled or manually placed)
-    if paths.mpv_exe_hint.exists():
-        return str(paths.mpv_exe_hint)
+    if mpv_exe_hint.exists():
+        return str(mpv_exe_hint)
     # install.ps1 downloads mpv here for fresh installs
     installed = Path.home() / "tools" / "mpv-portable" / "mpv.exe"
     if installed.exists():
@@ -45,19 +54,23 @@ def resolve_mpv_exe(paths: AppPaths) -> str:
     )
 
 
-def launch_mpv(paths: AppPaths, targets: list[str], slot_id: str = SLOT_PRIMARY) -> subprocess.Popen[str]:
-    ensure_dirs(paths)
-    mpv_exe = resolve_mpv_exe(paths)
-    prefs = load_playback_prefs(paths)
-    args = [
-        mpv_exe,
+@functools.lru_cache(maxsize=8)
+def _base_mpv_args(paths: AppPaths) -> tuple[str, ...]:
+    """Slot-independent mpv flags; AppPaths is frozen, so they are built once per profile."""
+    return (
         "--no-video",
-        f"--input-ipc-server={pipe_for_slot(slot_id, paths)}",
         f"--script={paths.mpv_script}",
         f"--script-opts=musichub-events_file={paths.events_jsonl}",
         "--ytdl=yes",
         "--ytdl-format=bestaudio/best",
-    ]
+    )
+
+
+def launch_mpv(paths: AppPaths, targets: list[str], slot_id: str = SLOT_PRIMARY) -> subprocess.Popen[str]:
+    ensure_dirs(paths)
+    mpv_exe = resolve_mpv_exe(paths)
+    prefs = load_playback_prefs(paths)
+    args = [mpv_exe, f"--input-ipc-server={pipe_for_slot(slot_id, paths)}", *_base_mpv_args(paths)]
     if prefs.loudnorm_enabled:
         args.append("--af=loudnorm")
     args.extend(targets)
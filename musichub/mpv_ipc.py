@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import io
 import os
 import json
+import select
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -11,6 +14,31 @@ class MpvIpcError(RuntimeError):
     pass
 
 
+_READ_CHUNK = 8192
+
+# ensure_ascii (the default) keeps the output pure ASCII, so the cheap ASCII
+# codec is enough; compact separators trim every request line.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _encode_line(payload: dict[str, Any]) -> bytes:
+    return (_encode_json(payload) + "\n").encode("ascii")
+
+
+def _parse_reply(line: bytes) -> Any:
+    try:
+        # json.loads takes the UTF-8 bytes directly.
+        return json.loads(line)
+    except UnicodeDecodeError:
+        # mpv passes invalid UTF-8 from file names/tags through unchanged.
+        try:
+            return json.loads(line.decode("utf-8", errors="replace"))
+        except ValueError:
+            return None
+    except ValueError:
+        return None
+
+
 def _is_windows_pipe(endpoint: str) -> bool:
     return os.name == "nt" and endpoint.startswith("\\\\.\\pipe\\")
 
@@ -57,8 +85,37 @@ def _open_windows_named_pipe(endpoint: str):
 
 @dataclass
 class MpvIpcClient:
+    """mpv JSON IPC client holding one connection for its lifetime.
+
+    The pipe is opened on first use and reused; use close() or a ``with``
+    block to release it. Calls are serialized with a lock.
+    """
+
     endpoint: str
     connect_timeout_sec: float = 2.0
+    _pipe: Any = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _next_id: int = field(default=0, init=False, repr=False, compare=False)
+    _rbuf: bytearray = field(default_factory=bytearray, init=False, repr=False, compare=False)
+
+    def __enter__(self) -> MpvIpcClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_pipe()
+
+    def _close_pipe(self) -> None:
+        pipe, self._pipe = self._pipe, None
+        self._rbuf.clear()
+        if pipe is not None:
+            try:
+                pipe.close()
+            except OSError:
+                pass
 
     def _open(self):
         deadline = time.time() + self.connect_timeout_sec
@@ -73,26 +130,118 @@ class MpvIpcClient:
                 time.sleep(0.1)
         raise MpvIpcError(f"Unable to connect to mpv IPC at {self.endpoint}: {last_err}")
 
+    def _request_ids(self, n: int) -> int:
+        # Unique per connection, so a late reply to an earlier request can't
+        # be mistaken for the current one.
+        if not self._next_id:
+            self._next_id = int(time.time() * 1000) % 1_000_000_000
+        base = self._next_id
+        self._next_id += n
+        return base
+
+    def _write(self, data: bytes):
+        if self._pipe is None:
+            self._pipe = self._open()
+        try:
+            self._pipe.write(data)
+            self._pipe.flush()
+        except OSError:
+            self._close_pipe()
+            raise
+        return self._pipe
+
+    def _send(self, data: bytes):
+        """Write data on the held connection, reconnecting once if it went stale."""
+        try:
+            return self._write(data)
+        except OSError:
+            # The write failed (e.g. mpv restarted on the same pipe name), so
+            # the request never reached mpv and resending is safe.
+            return self._write(data)
+
+    def _readline(self, pipe, timeout_sec: float) -> bytes | None:
+        """Next reply line, b"" once mpv closed the connection, None on timeout."""
+        try:
+            fd = pipe.fileno()
+        except (OSError, ValueError, io.UnsupportedOperation):
+            fd = None
+        if fd is None or os.name == "nt":
+            # Windows pipe handles are synchronous: readline() blocks on the
+            # buffered handle until mpv writes a full line.
+            return pipe.readline()
+        # POSIX: wait on the descriptor instead of polling, buffering partial
+        # lines between calls.
+        deadline = time.time() + timeout_sec
+        while b"\n" not in self._rbuf:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return None
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                return b""
+            self._rbuf += chunk
+        end = self._rbuf.index(b"\n") + 1
+        line = bytes(self._rbuf[:end])
+        del self._rbuf[:end]
+        return line
+
+    def _drain_replies(self, pipe, pending: dict[int, Any], timeout_sec: float) -> dict[int, dict[str, Any]]:
+        replies: dict[int, dict[str, Any]] = {}
+        deadline = time.time() + timeout_sec
+        while (remaining := deadline - time.time()) > 0:
+            line = self._readline(pipe, remaining)
+            if line is None:
+                break
+            if not line:
+                self._close_pipe()
+                raise MpvIpcError(f"mpv closed the IPC connection at {self.endpoint}")
+            msg = _parse_reply(line)
+            if msg is None:
+                continue
+            request_id = msg.get("request_id")
+            if request_id in pending:
+                replies[request_id] = msg
+                if len(replies) == len(pending):
+                    return replies
+        commands = list(pending.values())
+        label = commands[0] if len(commands) == 1 else commands
+        raise MpvIpcError(f"Timed out waiting for mpv IPC reply for command: {label!r}")
+
+    def _roundtrip(self, pending: dict[int, Any], timeout_sec: float) -> dict[int, dict[str, Any]]:
+        pipe = self._send(b"".join(_encode_line({"command": cmd, "request_id": rid}) for rid, cmd in pending.items()))
+        try:
+            return self._drain_replies(pipe, pending, timeout_sec)
+        except OSError:
+            self._close_pipe()
+            raise
+
     def command(self, cmd: list[Any], timeout_sec: float = 2.0) -> dict[str, Any]:
-        request_id = int(time.time() * 1000) % 1_000_000_000
-        payload = {"command": cmd, "request_id": request_id}
-        with self._open() as pipe:
-            pipe.write((json.dumps(payload) + "\n").encode("utf-8"))
-            pipe.flush()
-
-            deadline = time.time() + timeout_sec
-            while time.time() < deadline:
-                line = pipe.readline()
-                if not line:
-                    time.sleep(0.05)
-                    continue
-                try:
-                    msg = json.loads(line.decode("utf-8", errors="replace"))
-                except json.JSONDecodeError:
-                    continue
-                if msg.get("request_id") == request_id:
-                    return msg
-            raise MpvIpcError(f"Timed out waiting for mpv IPC reply for command: {cmd!r}")
+        with self._lock:
+            request_id = self._request_ids(1)
+            return self._roundtrip({request_id: cmd}, timeout_sec)[request_id]
+
+    def command_async(self, cmd: list[Any]) -> None:
+        """Send a command without waiting for mpv's reply."""
+        payload = {"command": cmd}
+        with self._lock:
+            pipe = self._send(_encode_line(payload))
+            if _is_windows_pipe(self.endpoint):
+                # FlushFileBuffers: wait until mpv has read the bytes so an
+                # exiting process can't drop them.
+                os.fsync(pipe.fileno())
+
+    def get_properties(self, names: list[str], timeout_sec: float = 2.0) -> dict[str, Any]:
+        """Read several properties in one round-trip; failed reads are omitted."""
+        with self._lock:
+            base_id = self._request_ids(len(names))
+            pending = {base_id + i: ["get_property", name] for i, name in enumerate(names)}
+            replies = self._roundtrip(pending, timeout_sec)
+        out: dict[str, Any] = {}
+        for rid, cmd in pending.items():
+            resp = replies[rid]
+            if resp.get("error") == "success":
+                out[cmd[1]] = resp.get("data")
+        return out
 
     def get_property(self, name: str) -> Any:
         resp = self.command(["get_property", name])
@@ -101,4 +250,4 @@ class MpvIpcClient:
         return resp.get("data")
 
     def show_text(self, text: str, duration_ms: int = 1200) -> None:
-        self.command(["show-text", text, int(duration_ms)])
+        self.command_async(["show-text", text, int(duration_ms)])
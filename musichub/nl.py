@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 import shlex
 from dataclasses import dataclass
@@ -11,7 +12,7 @@ class ParsedIntent:
     reason: str
 
 
-KNOWN_COMMANDS = {
+KNOWN_COMMANDS = frozenset({
     "init",
     "sync-events",
     "rec",
@@ -40,7 +41,53 @@ KNOWN_COMMANDS = {
     "radio",
     "note",
     "journal",
-}
+})
+
+
+def _keywords(*words: str) -> re.Pattern[str]:
+    # One compiled alternation per intent: a single scan of the utterance
+    # instead of a Python-level substring test per keyword.
+    return re.compile("|".join(map(re.escape, words)))
+
+
+_HELP_RE = _keywords("命令", "帮助", "help", "how to use", "怎么用", "usage", "cheatsheet")
+_UNDO_RE = _keywords("撤销", "undo", "回退上一步", "取消上一步")
+_SESSION_SAVE_RE = _keywords("保存会话", "save session")
+_SESSION_LOAD_RE = _keywords("加载会话", "恢复会话", "load session", "session load")
+_SESSION_LIST_RE = _keywords("会话列表", "列出会话", "list sessions", "session list")
+_SESSION_DELETE_RE = _keywords("删除会话", "删会话", "delete session", "session delete")
+_BACKUP_IMPORT_RE = _keywords("导入备份", "恢复备份", "import backup", "restore backup")
+_BACKUP_EXPORT_RE = _keywords("导出数据", "导出备份", "备份", "export data", "export backup")
+_CURRENT_RE = _keywords("当前", "现在播放", "正在播放", "current", "what is playing", "status")
+_STOP_PHRASE_RE = _keywords("停止播放", "关掉音乐", "关闭音乐", "stop music", "stop playing", "quit music", "退出播放")
+_PAUSE_RE = _keywords("暂停", "继续播放", "pause", "resume", "恢复播放")
+_LAYER_RE = _keywords("叠加播放", "同时播放")
+_LOUDNORM_RE = _keywords("loudnorm", "响度标准化", "响度均衡", "响度归一")
+_OFF_RE = _keywords("关闭", "关掉", "off", "disable")
+_ON_RE = _keywords("开启", "打开", "on", "enable")
+_SLOTS_RE = _keywords("查看槽位", "所有播放器", "所有slot", "list slots", "显示所有播放器")
+_STOP_ALL_RE = _keywords("全部停止", "停止所有", "stop all", "全停")
+_GOOD_RE = _keywords("这首好", "好歌", "喜欢这首", "mark good", "like this", "thumbs up")
+_BAD_RE = _keywords("不喜欢", "坏歌", "拉黑", "mark bad", "dislike", "thumbs down")
+_NEXT_RE = _keywords("下一首", "切歌", "next song", "skip")
+_RECOMMEND_RE = _keywords("推荐", "recommend")
+_PLAY_VERB_RE = _keywords("播放", "来点", "play", "listen")
+_STATS_RE = _keywords("统计", "画像", "偏好", "stats", "profile")
+_INIT_RE = _keywords("初始化", "init")
+_DOCTOR_RE = _keywords("检查环境", "doctor", "诊断")
+_DAEMON_RE = _keywords("守护", "后台同步", "daemon", "background")
+_DAEMON_ACTION_RE = re.compile(r"(?P<start>启动|开启|start)|(?P<stop>停止|关闭|stop)|(?P<status>状态|status)")
+_SYNC_EVENTS_RE = _keywords("同步事件", "导入事件", "sync events")
+_TRAIN_RE = _keywords("训练", "重训", "train", "retrain", "更新模型")
+_SYNC_RE = _keywords("同步", "导入", "sync", "import")
+_JOURNAL_RE = _keywords("查看日记", "我的日记", "journal", "查看笔记", "历史笔记")
+
+# Used with .match(), i.e. anchored at the start of the utterance.
+_SESSION_SAVE_PREFIX_RE = _keywords("保存会话", "save session", "session save")
+_SESSION_LOAD_PREFIX_RE = _keywords("加载会话", "恢复会话", "load session", "session load")
+_SESSION_DELETE_PREFIX_RE = _keywords("删除会话", "删会话", "delete session", "session delete")
+_PLAY_PREFIX_RE = _keywords("播放推荐", "播放 ", "听 ", "来一首 ", "来点 ", "放一下 ", "play ", "listen to ")
+_RECOMMENDATION_QUERIES = frozenset({"推荐", "recommendations", "recommendation", "推荐歌", "推荐歌曲"})
 
 
 def _strip_quotes(text: str) -> str:
@@ -50,15 +97,30 @@ def _strip_quotes(text: str) -> str:
     return text
 
 
-def _extract_after_prefix(text: str, prefixes: list[str]) -> str | None:
-    for p in prefixes:
-        if text.startswith(p):
-            return text[len(p) :].strip()
-    return None
+def _extract_after_prefix(text: str, prefixes: re.Pattern[str]) -> str | None:
+    # Alternation order matches the old startswith() order, so the first
+    # listed prefix still wins ("播放推荐" before "播放 ").
+    m = prefixes.match(text)
+    return text[m.end() :].strip() if m else None
 
 
 def parse_freeform(raw: str) -> ParsedIntent | None:
-    text = _strip_quotes(raw).strip()
+    parsed = _parse_freeform_cached(raw)
+    if parsed is None:
+        return None
+    argv, reason = parsed
+    # Fresh list per call: callers may mutate argv.
+    return ParsedIntent(list(argv), reason)
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_freeform_cached(raw: str) -> tuple[tuple[str, ...], str] | None:
+    intent = _parse_freeform(raw)
+    return (tuple(intent.argv), intent.reason) if intent is not None else None
+
+
+def _parse_freeform(raw: str) -> ParsedIntent | None:
+    text = _strip_quotes(raw)
     if not text:
         return None
 
@@ -70,48 +132,48 @@ def parse_freeform(raw: str) -> ParsedIntent | None:
         if parts:
             return ParsedIntent(parts, "explicit command prefix")
 
-    if any(k in lower for k in ["命令", "帮助", "help", "how to use", "怎么用", "usage", "cheatsheet"]):
+    if _HELP_RE.search(lower):
         return ParsedIntent(["commands"], "command cheatsheet request")
 
-    if any(k in lower for k in ["撤销", "undo", "回退上一步", "取消上一步"]):
+    if _UNDO_RE.search(lower):
         return ParsedIntent(["undo"], "undo last action")
 
-    if any(k in lower for k in ["保存会话", "save session"]):
-        name = _extract_after_prefix(text, ["保存会话", "save session", "session save"])
+    if _SESSION_SAVE_RE.search(lower):
+        name = _extract_after_prefix(text, _SESSION_SAVE_PREFIX_RE)
         return ParsedIntent(["session", "save", name] if name else ["session", "save"], "save playback session")
-    if any(k in lower for k in ["加载会话", "恢复会话", "load session", "session load"]):
-        name = _extract_after_prefix(text, ["加载会话", "恢复会话", "load session", "session load"])
+    if _SESSION_LOAD_RE.search(lower):
+        name = _extract_after_prefix(text, _SESSION_LOAD_PREFIX_RE)
         return ParsedIntent(["session", "load", name] if name else ["session", "load"], "load playback session")
-    if any(k in lower for k in ["会话列表", "列出会话", "list sessions", "session list"]):
+    if _SESSION_LIST_RE.search(lower):
         return ParsedIntent(["session", "list"], "list sessions")
-    if any(k in lower for k in ["删除会话", "删会话", "delete session", "session delete"]):
-        name = _extract_after_prefix(text, ["删除会话", "删会话", "delete session", "session delete"])
+    if _SESSION_DELETE_RE.search(lower):
+        name = _extract_after_prefix(text, _SESSION_DELETE_PREFIX_RE)
         return ParsedIntent(["session", "delete", name] if name else ["session", "delete"], "delete session")
 
-    if any(k in lower for k in ["导入备份", "恢复备份", "import backup", "restore backup"]):
+    if _BACKUP_IMPORT_RE.search(lower):
         m = re.search(r"(\S+\.zip)\b", text)
         if m:
             return ParsedIntent(["import", "--in", m.group(1)], "import backup")
         return ParsedIntent(["commands"], "import backup (missing zip path)")
-    if any(k in lower for k in ["导出数据", "导出备份", "备份", "export data", "export backup"]):
+    if _BACKUP_EXPORT_RE.search(lower):
         return ParsedIntent(["export", "--out", "musichub-backup.zip"], "export backup")
 
     # Chinese/English current/status
-    if any(k in lower for k in ["当前", "现在播放", "正在播放", "current", "what is playing", "status"]):
+    if _CURRENT_RE.search(lower):
         if "守护" in text or "daemon" in lower:
             return ParsedIntent(["daemon", "status"], "daemon status request")
         return ParsedIntent(["current"], "current track request")
 
     # Stop / pause
-    if any(k in lower for k in ["停止播放", "关掉音乐", "关闭音乐", "stop music", "stop playing", "quit music", "退出播放"]):
+    if _STOP_PHRASE_RE.search(lower):
         return ParsedIntent(["stop"], "stop playback")
     if lower in {"stop", "停止", "关掉", "关闭"}:
         return ParsedIntent(["stop"], "stop playback")
-    if any(k in lower for k in ["暂停", "继续播放", "pause", "resume", "恢复播放"]):
+    if _PAUSE_RE.search(lower):
         return ParsedIntent(["pause"], "toggle pause")
 
     # Layer / overlay
-    if any(k in lower for k in ["叠加播放", "同时播放"]):
+    if _LAYER_RE.search(lower):
         rest = text
         for prefix in ["叠加播放", "同时播放"]:
             idx = text.find(prefix)
@@ -130,46 +192,43 @@ def parse_freeform(raw: str) -> ParsedIntent | None:
     if vol_match_zh:
         return ParsedIntent(["vol", vol_match_zh.group(1), vol_match_zh.group(2)], "volume control")
 
-    if any(k in lower for k in ["loudnorm", "响度标准化", "响度均衡", "响度归一"]):
-        if any(k in lower for k in ["关闭", "关掉", "off", "disable"]):
+    if _LOUDNORM_RE.search(lower):
+        if _OFF_RE.search(lower):
             return ParsedIntent(["af", "off"], "disable loudness normalization")
-        if any(k in lower for k in ["开启", "打开", "on", "enable"]):
+        if _ON_RE.search(lower):
             return ParsedIntent(["af", "on"], "enable loudness normalization")
         return ParsedIntent(["af", "status"], "audio filter status")
 
     # Slots list
-    if any(k in lower for k in ["查看槽位", "所有播放器", "所有slot", "list slots", "显示所有播放器"]):
+    if _SLOTS_RE.search(lower):
         return ParsedIntent(["slots"], "list active slots")
 
     # Stop all
-    if any(k in lower for k in ["全部停止", "停止所有", "stop all", "全停"]):
+    if _STOP_ALL_RE.search(lower):
         return ParsedIntent(["stop", "all"], "stop all slots")
 
     # Like/dislike/next
-    if any(k in lower for k in ["这首好", "好歌", "喜欢这首", "mark good", "like this", "thumbs up"]):
+    if _GOOD_RE.search(lower):
         return ParsedIntent(["good"], "positive feedback")
-    if any(k in lower for k in ["不喜欢", "坏歌", "拉黑", "mark bad", "dislike", "thumbs down"]):
+    if _BAD_RE.search(lower):
         return ParsedIntent(["bad"], "negative feedback")
-    if any(k in lower for k in ["下一首", "切歌", "next song", "skip"]):
+    if _NEXT_RE.search(lower):
         return ParsedIntent(["next"], "skip/next")
 
     # Explicit "play ..." phrases should prefer search playback (YouTube via yt-dlp in cmd_play)
     # unless the user explicitly asks for recommendation queue playback.
-    play_q = _extract_after_prefix(
-        text,
-        ["播放推荐", "播放 ", "听 ", "来一首 ", "来点 ", "放一下 ", "play ", "listen to "],
-    )
+    play_q = _extract_after_prefix(text, _PLAY_PREFIX_RE)
     if play_q is not None:
         if not play_q:
             return ParsedIntent(["play"], "play default recommendations")
-        if play_q.casefold() in {"推荐", "recommendations", "recommendation", "推荐歌", "推荐歌曲"}:
+        if play_q.casefold() in _RECOMMENDATION_QUERIES:
             return ParsedIntent(["play"], "play recommendations")
         return ParsedIntent(["play", play_q], "play/search request (youtube-first)")
 
     # Recommendations
-    if any(k in lower for k in ["推荐", "recommend"]):
+    if _RECOMMEND_RE.search(lower):
         avoid_match = re.search(r"(?:不要|别推|exclude)\s*([^\s,，。]+)", text, flags=re.IGNORECASE)
-        if any(k in lower for k in ["播放", "来点", "play", "listen"]):
+        if _PLAY_VERB_RE.search(lower):
             if avoid_match:
                 return ParsedIntent(["play", "--exclude-artist", avoid_match.group(1)], "play recommendations with artist exclusion")
             return ParsedIntent(["play"], "play recommendations")
@@ -181,37 +240,33 @@ def parse_freeform(raw: str) -> ParsedIntent | None:
         return ParsedIntent(["rec"], "recommendations request")
 
     # Stats/profile
-    if any(k in lower for k in ["统计", "画像", "偏好", "stats", "profile"]):
+    if _STATS_RE.search(lower):
         return ParsedIntent(["stats"], "stats/profile request")
 
     # Init / doctor
-    if any(k in lower for k in ["初始化", "init"]):
+    if _INIT_RE.search(lower):
         return ParsedIntent(["init"], "initialize")
-    if any(k in lower for k in ["检查环境", "doctor", "诊断"]):
+    if _DOCTOR_RE.search(lower):
         return ParsedIntent(["doctor"], "environment check")
 
     # Daemon controls
-    if ("守护" in text or "后台同步" in text or "daemon" in lower or "background" in lower) and (
-        "启动" in text or "开启" in text or "start" in lower
-    ):
-        return ParsedIntent(["daemon", "start"], "start daemon")
-    if ("守护" in text or "后台同步" in text or "daemon" in lower or "background" in lower) and (
-        "停止" in text or "关闭" in text or "stop" in lower
-    ):
-        return ParsedIntent(["daemon", "stop"], "stop daemon")
-    if ("守护" in text or "后台同步" in text or "daemon" in lower or "background" in lower) and (
-        "状态" in text or "status" in lower
-    ):
-        return ParsedIntent(["daemon", "status"], "daemon status")
+    if _DAEMON_RE.search(lower):
+        actions = {m.lastgroup for m in _DAEMON_ACTION_RE.finditer(lower)}
+        if "start" in actions:
+            return ParsedIntent(["daemon", "start"], "start daemon")
+        if "stop" in actions:
+            return ParsedIntent(["daemon", "stop"], "stop daemon")
+        if "status" in actions:
+            return ParsedIntent(["daemon", "status"], "daemon status")
 
     # Sync/import
-    if any(k in lower for k in ["同步事件", "导入事件", "sync events"]):
+    if _SYNC_EVENTS_RE.search(lower):
         return ParsedIntent(["sync-events"], "sync mpv events")
-    if any(k in lower for k in ["训练", "重训", "train", "retrain", "更新模型"]):
+    if _TRAIN_RE.search(lower):
         if "implicit" in lower:
             return ParsedIntent(["train", "implicit"], "train implicit model")
         return ParsedIntent(["train", "all"], "train models")
-    if any(k in lower for k in ["同步", "导入", "sync", "import"]):
+    if _SYNC_RE.search(lower):
         if "ytm" in lower or "youtube music" in lower or "youtube音乐" in text:
             return ParsedIntent(["sync", "ytm"], "sync ytm")
         if "网易" in text or "netease" in lower or "ncm" in lower:
@@ -222,7 +277,7 @@ def parse_freeform(raw: str) -> ParsedIntent | None:
         space_idx = text.find(" ")
         content = text[space_idx + 1 :].strip()
         return ParsedIntent(["note", content], "note taking request")
-    if any(k in lower for k in ["查看日记", "我的日记", "journal", "查看笔记", "历史笔记"]):
+    if _JOURNAL_RE.search(lower):
         return ParsedIntent(["journal"], "journal review request")
 
     # URL fallback
@@ -236,5 +291,8 @@ def parse_freeform(raw: str) -> ParsedIntent | None:
 def maybe_extract_direct_command(argv: list[str]) -> list[str] | None:
     if not argv:
         return None
-    first = argv[0].casefold()
+    first = argv[0]
+    # Typed commands are almost always lower-case ASCII already.
+    if not (first.isascii() and first.islower()):
+        first = first.casefold()
     return argv if first in KNOWN_COMMANDS else None
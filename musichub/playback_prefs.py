@@ -21,9 +21,6 @@ def _prefs_path(paths: AppPaths):
 def load_playback_prefs(paths: AppPaths) -> PlaybackPrefs:
     ensure_dirs(paths)
     prefs_path = _prefs_path(paths)
-    if not prefs_path.exists():
-        return PlaybackPrefs()
-
     try:
         raw = json.loads(prefs_path.read_text(encoding="utf-8"))
     except (OSError, json.JSONDecodeError, TypeError):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import heapq
+from dataclasses import dataclass, field
 from typing import Any
 
 from . import db
@@ -8,7 +9,7 @@ from .config import AppPaths
 from .models import load_implicit_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class RecItem:
     track_id: int
     title: str
@@ -18,36 +19,65 @@ class RecItem:
     source_kind: str | None
     reason: str | None = None
     engine: str = "rule"
+    # Casefolded artist used to group repeats when diversifying.
+    artist_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.artist_key = (self.artist or "<unknown>").casefold()
 
     def as_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "track_id": self.track_id,
+            "title": self.title,
+            "artist": self.artist,
+            "score": self.score,
+            "source_url": self.source_url,
+            "source_kind": self.source_kind,
+            "reason": self.reason,
+            "engine": self.engine,
+        }
 
 
 def _diversify_by_artist(candidates: list[RecItem], limit: int) -> list[RecItem]:
+    # The repeat-artist penalty is the same for every track of an artist, so
+    # each artist's best remaining track is its highest-scored one and a pick
+    # only compares artist heads. Ties go to the earliest candidate.
+    groups: dict[str, list[tuple[float, int, RecItem]]] = {}
+    for i, item in enumerate(candidates):
+        groups.setdefault(item.artist_key, []).append((item.score, -i, item))
+    if len(groups) == len(candidates):
+        # No repeated artist, so no penalty ever applies: plain score order
+        # (sorted() is stable, keeping ties in candidate order).
+        return sorted(candidates, key=lambda x: -x.score)[:limit]
+    for group in groups.values():
+        group.sort(key=lambda e: (e[0], e[1]))  # best last, so pop() takes it
+
+    # Only the picked artist's head and count change per step, so keep the
+    # heads in a heap keyed by (-penalized score, candidate index).
+    heap = [(-group[-1][0], -group[-1][1], key) for key, group in groups.items()]
+    heapq.heapify(heap)
     result: list[RecItem] = []
     artist_counts: dict[str, int] = {}
-    remaining = list(candidates)
-    while remaining and len(result) < limit:
-        best_idx = 0
-        best_val = None
-        for i, item in enumerate(remaining):
-            artist_key = (item.artist or "<unknown>").casefold()
-            penalty = artist_counts.get(artist_key, 0) * 2.5
-            value = item.score - penalty
-            if best_val is None or value > best_val:
-                best_val = value
-                best_idx = i
-        picked = remaining.pop(best_idx)
-        result.append(picked)
-        artist_key = (picked.artist or "<unknown>").casefold()
-        artist_counts[artist_key] = artist_counts.get(artist_key, 0) + 1
+    while heap and len(result) < limit:
+        _, _, artist_key = heapq.heappop(heap)
+        group = groups[artist_key]
+        result.append(group.pop()[2])
+        count = artist_counts[artist_key] = artist_counts.get(artist_key, 0) + 1
+        if group:
+            score, neg_idx, _ = group[-1]
+            heapq.heappush(heap, (-(score - count * 2.5), -neg_idx, artist_key))
     return result
 
 
-def _rule_reason(rec: db.Recommendation, top_artists: dict[str, int]) -> str:
-    artist = rec.artist or "<unknown>"
-    if artist in top_artists and top_artists[artist] > 0:
-        return f"你常给 {artist} 红心（{top_artists[artist]} 次）"
+def _artist_reasons(top_artists: dict[str, int]) -> dict[str, str]:
+    """Prebuilt "liked artist" reasons, shared by every candidate of a call."""
+    return {a: f"你常给 {a} 红心（{n} 次）" for a, n in top_artists.items() if n > 0}
+
+
+def _rule_reason(rec: db.Recommendation, artist_reasons: dict[str, str]) -> str:
+    reason = artist_reasons.get(rec.artist or "<unknown>")
+    if reason is not None:
+        return reason
     if rec.fb_score > 0 and rec.play_score > 0:
         return "你给过正反馈且常听完整"
     if rec.fb_score > 0:
@@ -61,22 +91,20 @@ def _rule_reason(rec: db.Recommendation, top_artists: dict[str, int]) -> str:
 
 def rule_recommend(conn, *, limit: int = 10, explain: bool = True) -> list[RecItem]:
     raw = db.fetch_recommendations(conn, limit=max(limit * 3, limit))
-    recent_ids = set(db.fetch_recent_track_ids(conn, limit=20))
-    top_good_artists_rows = db.fetch_top_good_artists(conn, limit=12)
-    top_good_artists = {str(r["artist"]): int(r["goods"]) for r in top_good_artists_rows}
+    artist_reasons: dict[str, str] = {}
+    if explain:
+        top_good_artists_rows = db.fetch_top_good_artists(conn, limit=12)
+        artist_reasons = _artist_reasons({str(r["artist"]): int(r["goods"]) for r in top_good_artists_rows})
 
     candidates: list[RecItem] = []
     for r in raw:
-        score = float(r.score)
-        if r.track_id in recent_ids:
-            score -= 1.5
-        reason = _rule_reason(r, top_good_artists) if explain else None
+        reason = _rule_reason(r, artist_reasons) if explain else None
         candidates.append(
             RecItem(
                 track_id=r.track_id,
                 title=r.title,
                 artist=r.artist,
-                score=score,
+                score=r.score,
                 source_url=r.source_url,
                 source_kind=r.source_kind,
                 reason=reason,
@@ -87,36 +115,42 @@ def rule_recommend(conn, *, limit: int = 10, explain: bool = True) -> list[RecIt
 
 
 def implicit_recommend(paths: AppPaths, conn, *, limit: int = 10, explain: bool = True) -> list[RecItem]:
+    if not paths.implicit_recs_file.exists():
+        return []  # never trained; skip the JSON load and the DB lookup
+    return _implicit_recommend(paths, conn, limit=limit, explain=explain)
+
+
+def _implicit_recommend(paths: AppPaths, conn, *, limit: int, explain: bool) -> list[RecItem]:
     payload = load_implicit_cache(paths)
     if not payload or not isinstance(payload.get("recommendations"), list):
         return []
-    raw_recs = payload["recommendations"]
-    ids = [int(r["track_id"]) for r in raw_recs if isinstance(r, dict) and "track_id" in r][: max(limit * 4, limit)]
-    track_map = db.fetch_track_source_map(conn, ids)
-
-    items: list[RecItem] = []
-    for r in raw_recs:
-        if not isinstance(r, dict):
+    max_ids = max(limit * 4, limit)
+    max_items = max(limit * 3, limit)
+    picked: list[tuple[int, Any]] = []
+    for r in payload["recommendations"]:
+        tid = r.get("track_id") if isinstance(r, dict) else None
+        if tid is None:
             continue
-        tid = int(r.get("track_id"))
-        if tid not in track_map:
-            continue
-        t = track_map[tid]
-        reason = "基于跨会话共现（implicit）" if explain else None
-        items.append(
-            RecItem(
-                track_id=tid,
-                title=str(t.get("title") or tid),
-                artist=t.get("artist"),
-                score=float(r.get("score") or 0.0),
-                source_url=t.get("source_url"),
-                source_kind=t.get("source_kind"),
-                reason=reason,
-                engine="implicit",
-            )
-        )
-        if len(items) >= max(limit * 3, limit):
+        picked.append((int(tid), r.get("score")))
+        if len(picked) >= max_ids:
             break
+    track_map = db.fetch_track_source_map(conn, [tid for tid, _ in picked])
+
+    reason = "基于跨会话共现（implicit）" if explain else None
+    found = [(tid, score, track_map[tid]) for tid, score in picked if tid in track_map][:max_items]
+    items = [
+        RecItem(
+            track_id=tid,
+            title=str(t.get("title") or tid),
+            artist=t.get("artist"),
+            score=float(score or 0.0),
+            source_url=t.get("source_url"),
+            source_kind=t.get("source_kind"),
+            reason=reason,
+            engine="implicit",
+        )
+        for tid, score, t in found
+    ]
     return _diversify_by_artist(items, limit=limit)
 
 
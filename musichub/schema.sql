@@ -57,6 +57,31 @@ CREATE TABLE IF NOT EXISTS feedback_events (
     note TEXT
 );
 
+-- Running per-track aggregates of the event tables, kept in sync by the
+-- triggers below so recommendations read one row per track instead of
+-- re-aggregating every event. Raw sums only; scoring weights live in db.py.
+CREATE TABLE IF NOT EXISTS track_scores (
+    track_id INTEGER PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+    good_weight REAL NOT NULL DEFAULT 0,
+    bad_weight REAL NOT NULL DEFAULT 0,
+    completes INTEGER NOT NULL DEFAULT 0,
+    nexts INTEGER NOT NULL DEFAULT 0,
+    last_feedback_at TEXT,
+    last_play_at TEXT
+);
+
+-- Oldest source with a URL for each track; shared by the recommendation and
+-- source-lookup queries in db.py.
+CREATE VIEW IF NOT EXISTS v_preferred_source AS
+SELECT ts.track_id, ts.source_url, ts.source_kind
+FROM track_sources ts
+INNER JOIN (
+    SELECT track_id, MIN(id) AS min_id
+    FROM track_sources
+    WHERE source_url IS NOT NULL
+    GROUP BY track_id
+) x ON x.track_id = ts.track_id AND x.min_id = ts.id;
+
 CREATE TABLE IF NOT EXISTS ingest_state (
     source_name TEXT PRIMARY KEY,
     offset_bytes INTEGER NOT NULL DEFAULT 0,
@@ -70,9 +95,104 @@ CREATE TABLE IF NOT EXISTS saved_sessions (
 );
 
 CREATE INDEX IF NOT EXISTS idx_track_sources_track_id ON track_sources(track_id);
-CREATE INDEX IF NOT EXISTS idx_play_events_track_id ON play_events(track_id);
 CREATE INDEX IF NOT EXISTS idx_play_events_occurred_at ON play_events(occurred_at);
-CREATE INDEX IF NOT EXISTS idx_feedback_events_track_id ON feedback_events(track_id);
 CREATE INDEX IF NOT EXISTS idx_feedback_events_kind ON feedback_events(kind);
 CREATE INDEX IF NOT EXISTS idx_feedback_events_occurred_at ON feedback_events(occurred_at);
+-- Covering indexes: the per-track GROUP BY aggregates in db.py read only these
+-- columns, so SQLite can answer them from the index without touching rows.
+-- Their track_id prefix also replaces the old single-column track_id indexes.
+DROP INDEX IF EXISTS idx_play_events_track_id;
+DROP INDEX IF EXISTS idx_feedback_events_track_id;
+CREATE INDEX IF NOT EXISTS idx_feedback_events_track_kind_weight ON feedback_events(track_id, kind, weight, occurred_at);
+CREATE INDEX IF NOT EXISTS idx_play_events_track_action_completed ON play_events(track_id, action, completed, occurred_at);
+-- Partial index over "good" feedback only (top artists, radio seeds). kind is
+-- listed as a column too, or the planner won't treat it as covering.
+CREATE INDEX IF NOT EXISTS idx_feedback_events_good_track ON feedback_events(kind, track_id) WHERE kind = 'good';
 CREATE INDEX IF NOT EXISTS idx_saved_sessions_updated_at ON saved_sessions(updated_at);
+
+CREATE TRIGGER IF NOT EXISTS trg_feedback_events_scores_ai AFTER INSERT ON feedback_events
+WHEN new.track_id IS NOT NULL
+BEGIN
+    INSERT INTO track_scores(track_id, good_weight, bad_weight, last_feedback_at)
+    VALUES (
+        new.track_id,
+        CASE WHEN new.kind = 'good' THEN new.weight ELSE 0 END,
+        CASE WHEN new.kind = 'bad' THEN new.weight ELSE 0 END,
+        new.occurred_at
+    )
+    ON CONFLICT(track_id) DO UPDATE SET
+        good_weight = good_weight + excluded.good_weight,
+        bad_weight = bad_weight + excluded.bad_weight,
+        last_feedback_at = CASE
+            WHEN last_feedback_at IS NULL OR excluded.last_feedback_at > last_feedback_at
+            THEN excluded.last_feedback_at ELSE last_feedback_at END;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feedback_events_scores_ad AFTER DELETE ON feedback_events
+WHEN old.track_id IS NOT NULL
+BEGIN
+    UPDATE track_scores SET
+        good_weight = good_weight - CASE WHEN old.kind = 'good' THEN old.weight ELSE 0 END,
+        bad_weight = bad_weight - CASE WHEN old.kind = 'bad' THEN old.weight ELSE 0 END,
+        last_feedback_at = (SELECT MAX(occurred_at) FROM feedback_events WHERE track_id = old.track_id)
+    WHERE track_id = old.track_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_play_events_scores_ai AFTER INSERT ON play_events
+WHEN new.track_id IS NOT NULL
+BEGIN
+    INSERT INTO track_scores(track_id, completes, nexts, last_play_at)
+    VALUES (
+        new.track_id,
+        CASE WHEN new.action = 'play_end' AND new.completed = 1 THEN 1 ELSE 0 END,
+        CASE WHEN new.action = 'next' THEN 1 ELSE 0 END,
+        new.occurred_at
+    )
+    ON CONFLICT(track_id) DO UPDATE SET
+        completes = completes + excluded.completes,
+        nexts = nexts + excluded.nexts,
+        last_play_at = CASE
+            WHEN last_play_at IS NULL OR excluded.last_play_at > last_play_at
+            THEN excluded.last_play_at ELSE last_play_at END;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_play_events_scores_ad AFTER DELETE ON play_events
+WHEN old.track_id IS NOT NULL
+BEGIN
+    UPDATE track_scores SET
+        completes = completes - CASE WHEN old.action = 'play_end' AND old.completed = 1 THEN 1 ELSE 0 END,
+        nexts = nexts - CASE WHEN old.action = 'next' THEN 1 ELSE 0 END,
+        last_play_at = (SELECT MAX(occurred_at) FROM play_events WHERE track_id = old.track_id)
+    WHERE track_id = old.track_id;
+END;
+
+-- One-time backfill for databases created before track_scores existed.
+INSERT INTO track_scores(track_id, good_weight, bad_weight, completes, nexts, last_feedback_at, last_play_at)
+SELECT
+    t.id,
+    COALESCE(f.good_weight, 0), COALESCE(f.bad_weight, 0),
+    COALESCE(p.completes, 0), COALESCE(p.nexts, 0),
+    f.last_at, p.last_at
+FROM tracks t
+LEFT JOIN (
+    SELECT
+        track_id,
+        SUM(CASE WHEN kind = 'good' THEN weight ELSE 0 END) AS good_weight,
+        SUM(CASE WHEN kind = 'bad' THEN weight ELSE 0 END) AS bad_weight,
+        MAX(occurred_at) AS last_at
+    FROM feedback_events
+    WHERE track_id IS NOT NULL
+    GROUP BY track_id
+) f ON f.track_id = t.id
+LEFT JOIN (
+    SELECT
+        track_id,
+        SUM(CASE WHEN action = 'play_end' AND completed = 1 THEN 1 ELSE 0 END) AS completes,
+        SUM(CASE WHEN action = 'next' THEN 1 ELSE 0 END) AS nexts,
+        MAX(occurred_at) AS last_at
+    FROM play_events
+    WHERE track_id IS NOT NULL
+    GROUP BY track_id
+) p ON p.track_id = t.id
+WHERE (f.track_id IS NOT NULL OR p.track_id IS NOT NULL)
+  AND NOT EXISTS (SELECT 1 FROM track_scores);
@@ -1,24 +1,32 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
-from dataclasses import dataclass, asdict
+import select
+import sys
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .config import AppPaths
 
 SLOT_PRIMARY = "0"
 MAX_SLOTS = 100
+_SLOT_IDS = tuple(str(i) for i in range(MAX_SLOTS))
 
 
-@dataclass
+@dataclass(slots=True)
 class SlotInfo:
     slot_id: str
     pipe: str
     pid: int
 
+    def as_dict(self) -> dict[str, Any]:
+        return {"slot_id": self.slot_id, "pipe": self.pipe, "pid": self.pid}
+
 
 def _pipe_base(paths: AppPaths | None = None) -> str:
     if paths is not None:
@@ -30,7 +38,13 @@ def _pipe_base(paths: AppPaths | None = None) -> str:
 
 def pipe_for_slot(slot_id: str, paths: AppPaths | None = None) -> str:
     """Return named pipe path for a given slot ID."""
-    base = _pipe_base(paths)
+    return _slot_pipe(_pipe_base(paths), slot_id)
+
+
+# Keyed on the base pipe string rather than AppPaths, whose hash would cover
+# every path field.
+@functools.lru_cache(maxsize=MAX_SLOTS + 1)
+def _slot_pipe(base: str, slot_id: str) -> str:
     if slot_id == SLOT_PRIMARY:
         return base
     return f"{base}-{slot_id}"
@@ -40,27 +54,55 @@ def _registry_path(paths: AppPaths) -> Path:
     return Path(paths.runtime_dir) / "mpv_slots.json"
 
 
+# Compact, ASCII-only encoder built once; its output is written as bytes.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+# Registry path -> (file stat key, parsed registry). A CLI call that loads,
+# registers and cleans slots parses the file once while nobody else writes it.
+_REG_CACHE: dict[Path, tuple[tuple[int, int, int], dict[str, SlotInfo]]] = {}
+
+
+def _stat_key(p: Path) -> tuple[int, int, int]:
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _slotinfo_from(v: dict[str, Any]) -> SlotInfo:
+    # Fill the slots directly; skips kwargs unpacking and __init__ dispatch.
+    info = SlotInfo.__new__(SlotInfo)
+    info.slot_id = v["slot_id"]
+    info.pipe = v["pipe"]
+    info.pid = v["pid"]
+    return info
+
+
 def load_registry(paths: AppPaths) -> dict[str, SlotInfo]:
     p = _registry_path(paths)
-    if not p.exists():
-        return {}
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        return {k: SlotInfo(**v) for k, v in data.items()}
+        key = _stat_key(p)
+        cached = _REG_CACHE.get(p)
+        if cached is not None and cached[0] == key:
+            return dict(cached[1])
+        data = json.loads(p.read_bytes())
+        registry = {k: _slotinfo_from(v) for k, v in data.items()}
+    except FileNotFoundError:
+        return {}
     except json.JSONDecodeError:
         return {}
     except (KeyError, TypeError):
         return {}
+    _REG_CACHE[p] = (key, registry)
+    return dict(registry)
 
 
 def save_registry(paths: AppPaths, registry: dict[str, SlotInfo]) -> None:
     p = _registry_path(paths)
-    tmp = p.with_suffix(".tmp")
-    tmp.write_text(
-        json.dumps({k: asdict(v) for k, v in registry.items()}, indent=2),
-        encoding="utf-8",
-    )
-    tmp.replace(p)
+    # Other CLI processes read the registry concurrently; a per-process tmp
+    # file plus atomic rename means they never see a partial write.
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(_encode_json({k: v.as_dict() for k, v in registry.items()}).encode("ascii"))
+    os.replace(tmp, p)
+    _REG_CACHE[p] = (_stat_key(p), dict(registry))
 
 
 def _is_alive(pid: int) -> bool:
@@ -68,9 +110,9 @@ def _is_alive(pid: int) -> bool:
     if os.name == "nt":
         import ctypes
         SYNCHRONIZE = 0x00100000
-        PROCESS_QUERY = 0x00000400
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x00001000  # enough for GetExitCodeProcess
         STILL_ACTIVE = 259
-        h = ctypes.windll.kernel32.OpenProcess(SYNCHRONIZE | PROCESS_QUERY, False, pid)
+        h = ctypes.windll.kernel32.OpenProcess(SYNCHRONIZE | PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
         if not h:
             return False
         try:
@@ -79,6 +121,9 @@ def _is_alive(pid: int) -> bool:
             return bool(ok) and code.value == STILL_ACTIVE
         finally:
             ctypes.windll.kernel32.CloseHandle(h)
+    alive = _pidfd_alive([pid])
+    if alive is not None:
+        return pid in alive
     try:
         os.kill(pid, 0)
         return True
@@ -86,6 +131,77 @@ def _is_alive(pid: int) -> bool:
         return False
 
 
+def _pidfd_alive(pids: list[int]) -> set[int] | None:
+    """Probe ``pids`` with Linux pidfds and one zero-timeout poll.
+
+    A pidfd becomes readable once its process exits. Returns None when
+    pidfds are unavailable (non-Linux, old kernel) so callers fall back
+    to os.kill(pid, 0).
+    """
+    if sys.platform != "linux" or not hasattr(os, "pidfd_open"):
+        return None
+    fds: dict[int, int] = {}
+    try:
+        for pid in pids:
+            try:
+                fds[os.pidfd_open(pid)] = pid
+            except ProcessLookupError:
+                continue
+        poller = select.poll()
+        for fd in fds:
+            poller.register(fd, select.POLLIN)
+        exited = {fd for fd, _ in poller.poll(0)}
+        return {pid for fd, pid in fds.items() if fd not in exited}
+    except OSError:
+        return None
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _alive_pids(pids: list[int]) -> set[int]:
+    """Return the subset of ``pids`` that are alive, probing each pid once."""
+    unique = list(dict.fromkeys(pids))
+    if not unique:
+        return set()
+    if os.name != "nt":
+        alive = _pidfd_alive(unique)
+        if alive is not None:
+            return alive
+        return {pid for pid in unique if _is_alive(pid)}
+    import ctypes
+    from ctypes import wintypes
+    SYNCHRONIZE = 0x00100000  # the only right waiting on a process handle needs
+    MAXIMUM_WAIT_OBJECTS = 64
+    WAIT_OBJECT_0 = 0
+    kernel32 = ctypes.windll.kernel32
+    kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+    opened: list[tuple[int, int]] = []
+    try:
+        for pid in unique:
+            h = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+            if h:
+                opened.append((pid, h))
+        alive = {pid for pid, _ in opened}
+        # A process handle is signaled once the process exits. With
+        # bWaitAll=FALSE and a zero timeout each call reports the lowest
+        # signaled handle, so a chunk takes one call plus one per dead pid.
+        for start in range(0, len(opened), MAXIMUM_WAIT_OBJECTS):
+            chunk = opened[start:start + MAXIMUM_WAIT_OBJECTS]
+            while chunk:
+                arr = (wintypes.HANDLE * len(chunk))(*(h for _, h in chunk))
+                rc = kernel32.WaitForMultipleObjects(len(chunk), arr, False, 0)
+                idx = rc - WAIT_OBJECT_0
+                if not 0 <= idx < len(chunk):
+                    break  # WAIT_TIMEOUT (nothing signaled) or WAIT_FAILED
+                alive.discard(chunk[idx][0])
+                del chunk[idx]
+        return alive
+    finally:
+        for _, h in opened:
+            kernel32.CloseHandle(h)
+
+
 def pid_is_alive(pid: int) -> bool:
     """Public wrapper used by CLI recovery/cleanup flows."""
     return _is_alive(pid)
@@ -94,7 +210,8 @@ def pid_is_alive(pid: int) -> bool:
 def clean_dead_slots(paths: AppPaths) -> dict[str, SlotInfo]:
     """Remove slots whose PIDs are no longer alive. Returns cleaned registry."""
     registry = load_registry(paths)
-    alive = {k: v for k, v in registry.items() if _is_alive(v.pid)}
+    alive_pids = _alive_pids([v.pid for v in registry.values()])
+    alive = {k: v for k, v in registry.items() if v.pid in alive_pids}
     if len(alive) != len(registry):
         save_registry(paths, alive)
     return alive
@@ -102,22 +219,29 @@ def clean_dead_slots(paths: AppPaths) -> dict[str, SlotInfo]:
 
 def next_slot_id(registry: dict[str, SlotInfo]) -> str:
     """Find the lowest unused slot ID (as string integer)."""
-    for i in range(MAX_SLOTS):
-        if str(i) not in registry:
-            return str(i)
+    for slot_id in _SLOT_IDS:
+        if slot_id not in registry:
+            return slot_id
     raise RuntimeError(f"Too many active mpv slots (max {MAX_SLOTS})")
 
 
+# Serializes read-modify-write of the registry across threads, e.g. when the
+# CLI stops several slots concurrently.
+_REGISTRY_LOCK = threading.Lock()
+
+
 def register_slot(paths: AppPaths, slot_id: str, pipe: str, pid: int) -> None:
-    registry = load_registry(paths)
-    registry[slot_id] = SlotInfo(slot_id=slot_id, pipe=pipe, pid=pid)
-    save_registry(paths, registry)
+    with _REGISTRY_LOCK:
+        registry = load_registry(paths)
+        registry[slot_id] = SlotInfo(slot_id=slot_id, pipe=pipe, pid=pid)
+        save_registry(paths, registry)
 
 
 def unregister_slot(paths: AppPaths, slot_id: str) -> None:
-    registry = load_registry(paths)
-    if registry.pop(slot_id, None) is not None:
-        save_registry(paths, registry)
+    with _REGISTRY_LOCK:
+        registry = load_registry(paths)
+        if registry.pop(slot_id, None) is not None:
+            save_registry(paths, registry)
 
 
 def active_slot_info(paths: AppPaths, slot_id: str) -> SlotInfo | None:
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub.cli import _FAST_VERBS, _dispatch_natural_language, build_parser, main
+from musichub.nl import KNOWN_COMMANDS
+
+
+def test_fast_verbs_match_argparse_defaults():
+    parser = build_parser()
+    for verb, (func, defaults) in _FAST_VERBS.items():
+        parsed = vars(parser.parse_args([verb]))
+        assert parsed.pop("func") is func
+        assert parsed == {"cmd": verb, **defaults}
+
+
+def test_bare_verb_skips_parser_construction():
+    with patch("musichub.cli.build_parser", side_effect=AssertionError("parser should not be built")), \
+         patch("musichub.cli._ensure_ready"), \
+         patch("musichub.cli.clean_dead_slots", return_value={}), \
+         patch("builtins.print"):
+        result = main(["pause"])
+
+    assert result == 0
+
+
+def test_every_subcommand_bypasses_natural_language_parsing():
+    parser = build_parser()
+    subcommands = next(a for a in parser._actions if a.dest == "cmd").choices
+    assert set(subcommands) <= KNOWN_COMMANDS
+
+    with patch("musichub.cli.parse_freeform", side_effect=AssertionError("NL parser should not run")):
+        for verb in subcommands:
+            assert _dispatch_natural_language([verb, "--limit", "20"]) is None
@@ -0,0 +1,37 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import cli
+from musichub.cli import _run_single_provider_search
+
+
+def test_in_process_search_returns_flat_entry_urls():
+    ydl = MagicMock()
+    ydl.extract_info.return_value = {
+        "entries": [{"url": "https://youtu.be/a"}, {"webpage_url": "https://youtu.be/b"}, {"url": "ytsearch:x"}, None]
+    }
+    with patch("musichub.cli._in_process_ydl", return_value=ydl):
+        assert _run_single_provider_search("q", "ytsearch", " audio", 2) == ["https://youtu.be/a", "https://youtu.be/b"]
+    ydl.extract_info.assert_called_once_with("ytsearch2:q audio", download=False)
+
+
+def test_stalled_in_process_search_is_abandoned_after_the_timeout():
+    release = threading.Event()
+    ydl = MagicMock()
+    ydl.extract_info.side_effect = lambda *a, **k: release.wait(5) and {}
+    cli._YDL_LOCAL.ydl = ydl
+    try:
+        with patch("musichub.cli._in_process_ydl", return_value=ydl), \
+             patch("musichub.cli._SEARCH_TIMEOUT_SEC", 0.05):
+            started = time.monotonic()
+            assert _run_single_provider_search("q", "ytsearch", "", 1) == []
+            assert time.monotonic() - started < 2
+        assert cli._YDL_LOCAL.ydl is None  # the busy instance is not reused
+    finally:
+        release.set()
+        cli._YDL_LOCAL.ydl = None
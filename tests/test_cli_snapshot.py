@@ -4,8 +4,7 @@ from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from musichub.cli import _snapshot_mpv_slot
-from musichub.mpv_ipc import MpvIpcError
+from musichub.cli import _guess_source_kind, _snapshot_mpv_slot
 from musichub.slots import SlotInfo
 
 
@@ -19,22 +18,17 @@ def test_snapshot_returns_empty_without_active_slot():
 
 def test_snapshot_tolerates_unavailable_optional_properties():
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
 
-    def get_property(name: str):
-        values = {
-            "path": "https://www.youtube.com/watch?v=VM8DHYeCvSE",
-            "media-title": "Focus Mix",
-            "duration": 120.0,
-            "time-pos": 12.5,
-            "playlist-pos": 0,
-            "playlist-count": 1,
-            "metadata": {"artist": "Tester"},
-        }
-        if name in {"chapter", "chapter-metadata"}:
-            raise MpvIpcError(f"{name} unavailable")
-        return values[name]
-
-    mock_client.get_property.side_effect = get_property
+    mock_client.get_properties.return_value = {
+        "path": "https://www.youtube.com/watch?v=VM8DHYeCvSE",
+        "media-title": "Focus Mix",
+        "duration": 120.0,
+        "time-pos": 12.5,
+        "playlist-pos": 0,
+        "playlist-count": 1,
+        "metadata": {"artist": "Tester"},
+    }
 
     with patch("musichub.cli.active_slot_info", return_value=SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)), \
          patch("musichub.cli.MpvIpcClient", return_value=mock_client):
@@ -44,3 +38,44 @@ def test_snapshot_tolerates_unavailable_optional_properties():
     assert snap["chapter"] is None
     assert snap["chapter_metadata"] is None
     assert snap["playlist_count"] == 1
+    assert snap["time"].endswith("+00:00")
+    mock_client.get_properties.assert_called_once()
+    mock_client.get_property.assert_not_called()
+
+
+def test_snapshot_backs_off_while_path_is_missing():
+    mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
+    mock_client.get_properties.side_effect = [{}, {"media-title": "between tracks"}, {"path": "a.mp3"}]
+
+    with patch("musichub.cli.active_slot_info", return_value=SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)), \
+         patch("musichub.cli.MpvIpcClient", return_value=mock_client), \
+         patch("musichub.cli.time.sleep") as mock_sleep:
+        snap = _snapshot_mpv_slot(object(), "0")
+
+    assert snap["path"] == "a.mp3"
+    assert mock_sleep.call_count == 2
+
+
+def test_snapshot_gives_up_after_three_attempts_without_trailing_sleep():
+    mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
+    mock_client.get_properties.return_value = {}
+
+    with patch("musichub.cli.active_slot_info", return_value=SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)), \
+         patch("musichub.cli.MpvIpcClient", return_value=mock_client) as mock_cls, \
+         patch("musichub.cli.time.sleep") as mock_sleep:
+        assert _snapshot_mpv_slot(object(), "0") == {}
+
+    assert mock_client.get_properties.call_count == 3
+    assert mock_sleep.call_count == 2
+    mock_cls.assert_called_once()  # one connection serves every attempt
+    mock_client.__exit__.assert_called_once()
+
+
+def test_guess_source_kind_single_scan_keeps_host_priority():
+    assert _guess_source_kind("https://music.youtube.com/watch?v=a") == "ytmusic"
+    assert _guess_source_kind("https://youtu.be/a") == "youtube"
+    assert _guess_source_kind("https://b23.tv/a") == "bilibili"
+    assert _guess_source_kind("https://example.com/a.mp3") == "url"
+    assert _guess_source_kind(None) == "local"
@@ -21,6 +21,7 @@ def test_af_off_persists_and_applies_to_active_slots():
     mock_paths = MagicMock()
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.command.return_value = {"error": "success"}
     mock_client.get_property.return_value = []
 
@@ -45,6 +46,7 @@ def test_af_status_reports_stored_and_live_state():
     mock_paths = MagicMock()
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.get_property.return_value = [{"name": "loudnorm", "enabled": True, "params": {}}]
 
     with patch("musichub.cli._ensure_ready", return_value=mock_paths), \
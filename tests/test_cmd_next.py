@@ -4,6 +4,8 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import argparse
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from musichub.cli import _recover_next_playback, cmd_next
@@ -18,6 +20,7 @@ def _args(slot="0"):
 
 def test_next_refills_when_queue_is_exhausted():
     mock_client = MagicMock()
+    mock_client.command.return_value = {"error": "success"}
     mock_conn = MagicMock()
     mock_paths = MagicMock()
     mock_paths.db_path = "dummy.db"
@@ -28,6 +31,7 @@ def test_next_refills_when_queue_is_exhausted():
         "playlist_pos": 0,
         "playlist_count": 1,
         "metadata": {},
+        "time": "2026-01-01T00:00:00.000000+00:00",
     }
 
     with patch("musichub.cli._ensure_ready", return_value=mock_paths), \
@@ -37,7 +41,7 @@ def test_next_refills_when_queue_is_exhausted():
          patch("musichub.cli._maybe_apply_playback_prefs_to_client") as mock_sync, \
          patch("musichub.cli.db.connect", return_value=mock_conn), \
          patch("musichub.cli._upsert_from_snapshot", return_value=(1, snap["path"], "youtube")), \
-         patch("musichub.cli.db.record_play_event"), \
+         patch("musichub.cli.db.record_play_event") as mock_record, \
          patch("musichub.cli._append_recommendations_to_slot", return_value=2) as mock_append, \
          patch("builtins.print") as mock_print:
 
@@ -47,11 +51,33 @@ def test_next_refills_when_queue_is_exhausted():
     mock_sync.assert_called_once()
     mock_append.assert_called_once()
     mock_client.command.assert_called_with(["playlist-next", "force"])
+    assert mock_record.call_args.kwargs["occurred_at"] == snap["time"]
     output = json.loads(mock_print.call_args[0][0])
     assert output["ok"] is True
     assert output["appended"] == 2
 
 
+def test_next_raises_when_mpv_rejects_the_skip():
+    mock_client = MagicMock()
+    mock_client.command.return_value = {"error": "property unavailable"}
+    snap = {"path": "https://youtu.be/current", "playlist_pos": 0, "playlist_count": 3, "time": "2026-01-01T00:00:00Z"}
+
+    with patch("musichub.cli._ensure_ready", return_value=MagicMock()), \
+         patch("musichub.cli._resolve_slot_pipe", return_value=("0", r"\\.\pipe\musichub-mpv")), \
+         patch("musichub.cli.MpvIpcClient", return_value=mock_client), \
+         patch("musichub.cli._get_mpv_snapshot", return_value=snap), \
+         patch("musichub.cli._maybe_apply_playback_prefs_to_client"), \
+         patch("musichub.cli.db.connect", return_value=MagicMock()), \
+         patch("musichub.cli._upsert_from_snapshot", return_value=(1, snap["path"], "youtube")), \
+         patch("musichub.cli.db.record_play_event"), \
+         patch("builtins.print") as mock_print:
+        with pytest.raises(MpvIpcError, match="playlist-next"):
+            cmd_next(_args())
+
+    mock_client.command_async.assert_not_called()
+    mock_print.assert_not_called()
+
+
 def test_next_recovers_when_pipe_missing():
     mock_client = MagicMock()
     mock_paths = MagicMock()
@@ -96,7 +122,7 @@ def test_recover_next_playback_restarts_slot_before_launch():
     rec_item.source_url = "https://youtu.be/recovered"
 
     with patch("musichub.cli.db.connect", return_value=mock_ctx), \
-         patch("musichub.cli.recommend", return_value=[rec_item]), \
+         patch("musichub.recommender.recommend", return_value=[rec_item]), \
          patch("musichub.cli._restart_slot_with_targets") as mock_restart:
 
         recovered, target = _recover_next_playback(mock_paths, "0")
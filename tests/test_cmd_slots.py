@@ -14,6 +14,7 @@ from musichub.mpv_ipc import MpvIpcError
 
 def test_slots_lists_active():
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.get_property.side_effect = lambda prop: {
         "media-title": "Test Song",
         "volume": 100,
@@ -49,6 +50,7 @@ def test_slots_empty():
 
 def test_slots_ipc_failure_shows_nulls():
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.get_property.side_effect = MpvIpcError("dead")
 
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
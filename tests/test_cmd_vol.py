@@ -21,6 +21,7 @@ def _args(slot="0", level=70):
 
 def test_vol_sets_volume_on_slot():
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.command.return_value = {"error": "success"}
 
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
@@ -34,6 +35,7 @@ def test_vol_sets_volume_on_slot():
 
     assert result == 0
     mock_client.command.assert_called_once_with(["set_property", "volume", 70])
+    mock_client.__exit__.assert_called_once()
     output = json.loads(mock_print.call_args[0][0])
     assert output["ok"] is True
     assert output["results"][0]["ok"] is True
@@ -41,6 +43,7 @@ def test_vol_sets_volume_on_slot():
 
 def test_vol_all_sets_all_slots():
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.command.return_value = {"error": "success"}
 
     registry = {
@@ -85,6 +88,7 @@ def test_vol_no_active_slots_returns_error():
 def test_vol_clamps_level():
     """Volume above 130 is clamped to 130, below 0 clamped to 0."""
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.command.return_value = {"error": "success"}
 
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
@@ -101,6 +105,7 @@ def test_vol_clamps_level():
 def test_vol_ipc_error_returns_ok_false():
     """IPC failure per slot is reported; overall result is 1 (no slot succeeded)."""
     mock_client = MagicMock()
+    mock_client.__enter__.return_value = mock_client
     mock_client.command.side_effect = MpvIpcError("pipe dead")
 
     registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234)}
@@ -116,3 +121,36 @@ def test_vol_ipc_error_returns_ok_false():
     output = json.loads(mock_print.call_args[0][0])
     assert output["ok"] is False
     assert output["results"][0]["ok"] is False
+
+
+def test_vol_all_talks_to_slots_concurrently():
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def make_client(pipe):
+        client = MagicMock()
+        client.__enter__.return_value = client
+
+        def command(_cmd):
+            barrier.wait()  # both slots must be in flight at once
+            return {"error": "success"}
+
+        client.command.side_effect = command
+        return client
+
+    registry = {
+        "0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1234),
+        "1": SlotInfo("1", r"\\.\pipe\musichub-mpv-1", 5678),
+    }
+
+    with patch("musichub.cli._ensure_ready"), \
+         patch("musichub.cli.clean_dead_slots", return_value=registry), \
+         patch("musichub.cli.MpvIpcClient", side_effect=make_client), \
+         patch("builtins.print") as mock_print:
+
+        result = cmd_vol(_args("all", 40))
+
+    assert result == 0
+    output = json.loads(mock_print.call_args[0][0])
+    assert [r["slot"] for r in output["results"]] == ["0", "1"]
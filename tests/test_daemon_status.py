@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import daemon
+from musichub.config import get_paths
+
+
+def _write_pidfile(paths, payload, age_sec: float = 0.0):
+    paths.daemon_pid_file.write_text(json.dumps(payload), encoding="utf-8")
+    stamp = time.time() - age_sec
+    os.utime(paths.daemon_pid_file, (stamp, stamp))
+
+
+def test_status_trusts_fresh_heartbeat_without_a_cmdline_lookup(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    daemon.ensure_dirs(paths)
+    _write_pidfile(paths, {"pid": 4242, "poll_sec": 2.0})
+
+    with patch("musichub.daemon._pid_exists", return_value=True) as mock_exists, \
+         patch("musichub.daemon._process_cmdline") as mock_cmdline:
+        st = daemon.status(paths)
+
+    assert st.running is True
+    assert st.pid == 4242
+    assert st.owned is None  # a heartbeat alone does not prove the pid is ours
+    mock_exists.assert_called_once_with(4242)
+    mock_cmdline.assert_not_called()
+
+
+def test_status_ignores_fresh_heartbeat_of_a_dead_pid(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    daemon.ensure_dirs(paths)
+    _write_pidfile(paths, {"pid": 4242, "poll_sec": 2.0})
+
+    with patch("musichub.daemon._pid_exists", return_value=False):
+        st = daemon.status(paths)
+
+    assert st.running is False
+    assert not paths.daemon_pid_file.exists()
+
+
+def test_stop_verifies_ownership_behind_a_fresh_heartbeat(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    daemon.ensure_dirs(paths)
+    _write_pidfile(paths, {"pid": 4242, "poll_sec": 2.0})
+
+    with patch("musichub.daemon._pid_exists", return_value=True), \
+         patch("musichub.daemon._process_cmdline", return_value="notepad.exe"), \
+         patch("musichub.daemon.os.kill") as mock_kill, \
+         patch("musichub.daemon.subprocess.run") as mock_run:
+        daemon.stop(paths)
+
+    mock_kill.assert_not_called()
+    mock_run.assert_not_called()
+
+
+def test_status_probes_and_clears_stale_pidfile(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    daemon.ensure_dirs(paths)
+    _write_pidfile(paths, {"pid": 4242, "poll_sec": 2.0}, age_sec=60.0)
+
+    with patch("musichub.daemon._pid_exists", return_value=False) as mock_exists:
+        st = daemon.status(paths)
+
+    assert st.running is False
+    mock_exists.assert_called_once_with(4242)
+    assert not paths.daemon_pid_file.exists()
+
+
+def test_run_loop_leaves_a_pidfile_it_no_longer_owns(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+
+    def replaced_by_another_run(paths, conn):
+        _write_pidfile(paths, {"pid": os.getpid() + 1, "poll_sec": 2.0})
+        return {"read": 0, "new": 0, "skipped": 0}
+
+    with patch("musichub.daemon.ingest_mpv_events", side_effect=replaced_by_another_run):
+        assert daemon.run_loop(paths, once=True) == 0
+    assert daemon._read_pid(paths.daemon_pid_file) == os.getpid() + 1
+
+    with patch("musichub.daemon.ingest_mpv_events", return_value={"read": 0, "new": 0, "skipped": 0}):
+        daemon.run_loop(paths, once=True)
+    assert not paths.daemon_pid_file.exists()
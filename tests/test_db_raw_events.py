@@ -0,0 +1,37 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    schema = (Path(__file__).parent.parent / "musichub" / "schema.sql").read_text(encoding="utf-8")
+    conn.executescript(schema)
+    return conn
+
+
+def test_insert_raw_mpv_event_reports_duplicates_without_raising():
+    conn = _conn()
+    try:
+        line = '{"event": "play_start", "path": "https://youtu.be/a"}'
+        payload = {"event": "play_start", "path": "https://youtu.be/a"}
+        assert db.insert_raw_mpv_event(conn, payload, line) is True
+        assert db.insert_raw_mpv_event(conn, payload, line) is False
+        rows = conn.execute("SELECT payload_json FROM raw_mpv_events").fetchall()
+        assert [r["payload_json"] for r in rows] == [line]
+    finally:
+        conn.close()
+
+
+def test_insert_raw_mpv_events_counts_only_new_rows():
+    conn = _conn()
+    try:
+        assert db.insert_raw_mpv_events(conn, [("h1", "play_start", "{}"), ("h2", "good", "{}")]) == 2
+        assert db.insert_raw_mpv_events(conn, [("h1", "play_start", "{}"), ("h3", "bad", "{}")]) == 1
+    finally:
+        conn.close()
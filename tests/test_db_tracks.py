@@ -0,0 +1,101 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    schema = (Path(__file__).parent.parent / "musichub" / "schema.sql").read_text(encoding="utf-8")
+    conn.executescript(schema)
+    return conn
+
+
+def test_upsert_track_returns_existing_id_on_conflict():
+    conn = _conn()
+    try:
+        first = db.upsert_track_and_source(
+            conn, title="Song", artist=None, duration_sec=None, source_kind="youtube", source_url="https://youtu.be/a"
+        )
+        again = db.upsert_track_and_source(
+            conn, title="Song", artist=None, duration_sec=200.0, source_kind="youtube", source_url="https://youtu.be/a"
+        )
+        other = db.upsert_track_and_source(
+            conn, title="Other", artist=None, duration_sec=None, source_kind=None, source_url=None
+        )
+        assert again == first
+        assert other != first
+        row = conn.execute("SELECT duration_sec FROM tracks WHERE id = ?", (first,)).fetchone()
+        assert row["duration_sec"] == 200.0
+    finally:
+        conn.close()
+
+
+def test_upsert_tracks_many_matches_per_row_upserts():
+    rows = [
+        ("Song", "Band", None, "youtube", "https://youtu.be/a"),
+        (None, None, None, None, None),
+        ("song", "band", 180.0, "bilibili", "https://b23.tv/x"),
+        ("Other", None, None, None, None),
+    ]
+    single, bulk = _conn(), _conn()
+    try:
+        expected = [
+            db.upsert_track_and_source(
+                single, title=t, artist=a, duration_sec=d, source_kind=k, source_url=u
+            ) if (t or u) else None
+            for t, a, d, k, u in rows
+        ]
+        assert db.upsert_tracks_many(bulk, rows) == expected
+        for table in ("tracks", "track_sources"):
+            query = f"SELECT * FROM {table} ORDER BY id"
+            strip = lambda r: {k: r[k] for k in r.keys() if k not in ("created_at", "updated_at")}
+            assert [strip(r) for r in bulk.execute(query)] == [strip(r) for r in single.execute(query)]
+    finally:
+        single.close()
+        bulk.close()
+
+
+def test_insert_tracks_bulk_merges_duplicates_like_upserts():
+    rows = [
+        ("Song", None, 180.0, "youtube", "https://youtu.be/a"),
+        ("song", "", None, "youtube", "https://youtu.be/a"),
+        (None, None, None, None, None),
+        ("Other", "Band", None, "bilibili", "https://b23.tv/x"),
+        ("Other", None, 90.0, "youtube", "https://youtu.be/b"),
+    ]
+    upserted, inserted = _conn(), _conn()
+    try:
+        # Conflicting upserts still consume AUTOINCREMENT ids, so compare by key.
+        def keys(conn, ids):
+            return [
+                conn.execute("SELECT canonical_key FROM tracks WHERE id = ?", (i,)).fetchone()[0] if i else None
+                for i in ids
+            ]
+
+        assert keys(inserted, db.insert_tracks_bulk(inserted, rows)) == keys(upserted, db.upsert_tracks_many(upserted, rows))
+        for query in (
+            "SELECT canonical_key, title, artist, duration_sec FROM tracks ORDER BY canonical_key",
+            "SELECT t.canonical_key, s.source_kind, s.source_url, s.source_title, s.source_artist"
+            " FROM track_sources s JOIN tracks t ON t.id = s.track_id ORDER BY s.source_url",
+        ):
+            assert [tuple(r) for r in inserted.execute(query)] == [tuple(r) for r in upserted.execute(query)]
+    finally:
+        upserted.close()
+        inserted.close()
+
+
+def test_insert_tracks_bulk_raises_on_existing_track():
+    conn = _conn()
+    try:
+        db.upsert_track_and_source(conn, title="Song", artist=None, duration_sec=None, source_kind=None, source_url=None)
+        with pytest.raises(sqlite3.IntegrityError):
+            db.insert_tracks_bulk(conn, [("Song", None, None, None, None)])
+    finally:
+        conn.close()
@@ -0,0 +1,70 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    schema = (Path(__file__).parent.parent / "musichub" / "schema.sql").read_text(encoding="utf-8")
+    conn.executescript(schema)
+    conn.executemany("INSERT INTO tracks(canonical_key, title) VALUES (?, ?)", [("a", "A"), ("b", "B")])
+    conn.executemany(
+        "INSERT INTO feedback_events(occurred_at, track_id, kind, session_id) VALUES (?, ?, ?, ?)",
+        [("2026-01-01T00:00:00Z", 1, "good", "s1"), ("2026-01-02T00:00:00Z", 2, "bad", None)],
+    )
+    conn.executemany(
+        "INSERT INTO play_events(occurred_at, track_id, action, completed, session_id) VALUES (?, ?, ?, ?, ?)",
+        [("2026-01-01T00:00:00Z", 1, "play_end", 1, "s1"), ("2026-01-02T00:00:00Z", 2, "next", 0, "")],
+    )
+    return conn
+
+
+def test_profile_and_context_weights_share_one_count_query():
+    conn = _conn()
+    try:
+        counts = db.fetch_interaction_counts(conn)
+        assert db.profile_weights_from_counts(counts) == [
+            {"track_id": 1, "weight": 5.0},
+            {"track_id": 2, "weight": -6.5},
+        ]
+        assert db.context_interactions_from_counts(counts) == [
+            {"context_key": "d:2026-01-02", "track_id": 2, "weight": -5.0},
+            {"context_key": "s1", "track_id": 1, "weight": 4.0},
+        ]
+        assert db.fetch_user_profile_weights(conn) == db.profile_weights_from_counts(counts)
+    finally:
+        conn.close()
+
+
+def test_track_scores_follow_inserts_and_deletes():
+    conn = _conn()
+    try:
+        recs = {r.track_id: r for r in db.fetch_recommendations(conn, limit=5)}
+        assert recs[1].fb_score == 6.0 and recs[1].play_score == 1.5
+        assert recs[2].fb_score == -8.0 and recs[2].play_score == -2.0
+
+        conn.execute("DELETE FROM play_events WHERE track_id = 2")
+        row = conn.execute("SELECT nexts, last_play_at FROM track_scores WHERE track_id = 2").fetchone()
+        assert row["nexts"] == 0
+        assert row["last_play_at"] is None
+    finally:
+        conn.close()
+
+
+def test_recent_tracks_are_penalized_in_sql():
+    conn = _conn()
+    try:
+        conn.execute("INSERT INTO tracks(canonical_key, title) VALUES ('c', 'C')")
+        scores = {r.track_id: r.score for r in db.fetch_recommendations(conn, limit=5)}
+        # Tracks 1 and 2 have events, so both are recent; 3 is untouched.
+        assert scores == {1: 7.5 - 1.5, 2: -10.0 - 1.5, 3: 0.0}
+        plain = {r.track_id: r.score for r in db.fetch_recommendations(conn, limit=5, recent_limit=1)}
+        assert plain == {1: 7.5, 2: -10.0 - 1.5, 3: 0.0}
+        assert db.fetch_recent_track_ids(conn, limit=1) == [2]
+    finally:
+        conn.close()
@@ -0,0 +1,126 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+from musichub.config import ensure_dirs, get_paths
+from musichub.events_ingest import _guess_source_kind, ingest_mpv_events
+
+
+def _paths(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    ensure_dirs(paths)
+    db.init_db(paths)
+    return paths
+
+
+def _line(event: str, n: int) -> str:
+    return json.dumps(
+        {"event": event, "path": f"https://youtu.be/{n}", "media_title": f"Track {n}", "time": f"2026-03-0{n}T00:00:00Z"}
+    ) + "\n"
+
+
+def test_ingest_reads_complete_lines_and_is_idempotent(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    paths.events_jsonl.write_text(_line("play_start", 1) + "not json\n" + _line("good", 1), encoding="utf-8")
+
+    assert ingest_mpv_events(paths) == {"read": 3, "new": 2, "skipped": 1}
+    assert ingest_mpv_events(paths) == {"read": 0, "new": 0, "skipped": 0}
+
+    conn = db.connect(paths.db_path)
+    try:
+        stats = db.stats_summary(conn)
+    finally:
+        conn.close()
+    assert stats["play_events"] == 1
+    assert stats["good_events"] == 1
+
+
+def test_ingest_leaves_partial_trailing_line_for_next_pass(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    full = _line("play_start", 2)
+    paths.events_jsonl.write_text(_line("play_start", 1) + full[:10], encoding="utf-8")
+
+    assert ingest_mpv_events(paths)["new"] == 1
+
+    with paths.events_jsonl.open("a", encoding="utf-8") as f:
+        f.write(full[10:])
+    assert ingest_mpv_events(paths) == {"read": 1, "new": 1, "skipped": 0}
+
+
+def test_ingest_batches_across_flushes_and_dedupes_within_a_batch(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    monkeypatch.setattr("musichub.events_ingest._INGEST_BATCH_LINES", 2)
+    lines = [_line("play_start", n) for n in range(1, 6)]
+    paths.events_jsonl.write_text("".join(lines) + lines[0], encoding="utf-8")
+
+    assert ingest_mpv_events(paths) == {"read": 6, "new": 5, "skipped": 0}
+
+    conn = db.connect(paths.db_path)
+    try:
+        stats = db.stats_summary(conn)
+    finally:
+        conn.close()
+    assert stats["play_events"] == 5
+
+
+def test_ingest_writes_offset_once_per_flush(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    monkeypatch.setattr("musichub.events_ingest._INGEST_BATCH_LINES", 2)
+    body = "".join(_line("play_start", n) for n in range(1, 6)) + "\n" + "not json\n"
+    paths.events_jsonl.write_text(body, encoding="utf-8")
+
+    with patch("musichub.events_ingest.db.set_ingest_offset", wraps=db.set_ingest_offset) as mock_set:
+        assert ingest_mpv_events(paths) == {"read": 7, "new": 5, "skipped": 1}
+
+    # Two full batches plus the final flush; blank and bad lines add no writes.
+    assert mock_set.call_count == 3
+    assert mock_set.call_args.args[2] == len(body.encode("utf-8"))
+
+
+def test_ingest_upserts_each_track_once_per_pass(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    paths.events_jsonl.write_text(_line("play_start", 1) + _line("play_end", 1) + _line("good", 1), encoding="utf-8")
+
+    with patch("musichub.events_ingest.db.upsert_track_and_source", wraps=db.upsert_track_and_source) as mock_upsert:
+        assert ingest_mpv_events(paths)["new"] == 3
+    assert mock_upsert.call_count == 1
+
+
+def test_ingest_repoints_a_source_moved_by_another_connection(monkeypatch, tmp_path):
+    paths = _paths(monkeypatch, tmp_path)
+    paths.events_jsonl.write_text(_line("play_start", 1), encoding="utf-8")
+    ingest_mpv_events(paths)
+
+    other = db.connect(paths.db_path)
+    try:
+        with other:
+            original = other.execute("SELECT track_id FROM track_sources WHERE source_url = 'https://youtu.be/1'").fetchone()[0]
+            moved = db.upsert_track_and_source(
+                other, title="Elsewhere", artist=None, duration_sec=None, source_kind=None, source_url=None
+            )
+            other.execute("UPDATE track_sources SET track_id = ? WHERE source_url = 'https://youtu.be/1'", (moved,))
+
+        with paths.events_jsonl.open("a", encoding="utf-8") as f:
+            f.write(_line("play_end", 1))
+        assert ingest_mpv_events(paths)["new"] == 1
+
+        row = other.execute("SELECT track_id FROM track_sources WHERE source_url = 'https://youtu.be/1'").fetchone()
+        assert row[0] == original
+        ended = other.execute("SELECT track_id FROM play_events WHERE action = 'play_end'").fetchone()
+        assert ended[0] == original
+    finally:
+        db.close(other)
+
+
+def test_guess_source_kind_prefers_ytmusic_host():
+    assert _guess_source_kind("https://music.youtube.com/watch?v=abc") == "ytmusic"
+    assert _guess_source_kind("https://www.youtube.com/watch?v=abc") == "youtube"
+    assert _guess_source_kind("https://youtu.be/abc") == "youtube"
+    assert _guess_source_kind("https://example.com/a.mp3") == "url"
+    assert _guess_source_kind(r"C:\Music\a.flac") == "local"
+    assert _guess_source_kind(None) is None
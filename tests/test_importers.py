@@ -0,0 +1,183 @@
+import json
+import sqlite3
+import sys
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+from musichub.config import ensure_dirs, get_paths
+from musichub.importers import (
+    _coerce_items_from_json,
+    _iter_json_file_items,
+    _iter_normalized_batches,
+    _stream_json_items,
+    import_json_files,
+    import_normalized_items,
+    import_ytm_live,
+)
+
+
+def _conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    schema = (Path(__file__).parent.parent / "musichub" / "schema.sql").read_text(encoding="utf-8")
+    conn.executescript(schema)
+    return conn
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [{"title": "A", "duration": 1.5}, 3, {"title": "B"}],
+        {"data": [{"title": "D"}], "items": [{"title": "I"}]},
+        {"meta": {"items": [{"title": "nested"}]}, "songs": "n/a", "tracks": [{"title": "T"}]},
+        {"nothing": []},
+        "scalar",
+    ],
+)
+def test_streamed_items_match_in_memory_selection(tmp_path, data):
+    ijson = pytest.importorskip("ijson")
+    p = tmp_path / "export.json"
+    p.write_text("  \n" + json.dumps(data), encoding="utf-8")
+
+    assert list(_stream_json_items(p, ijson)) == _coerce_items_from_json(data)
+
+
+def test_small_exports_are_parsed_in_memory(tmp_path):
+    p = tmp_path / "export.json"
+    p.write_bytes(b"\xef\xbb\xbf" + json.dumps({"items": [{"title": "A"}]}).encode("utf-8"))
+
+    with patch("musichub.importers._stream_json_items") as mock_stream:
+        assert list(_iter_json_file_items(p)) == [{"title": "A"}]
+    mock_stream.assert_not_called()
+
+
+@pytest.mark.parametrize("wrapped", [False, True])
+def test_bom_prefixed_large_exports_stream_all_items(tmp_path, wrapped):
+    pytest.importorskip("ijson")
+    items = [{"title": f"Song {i}", "artist": "Someone", "url": f"https://youtu.be/{i:011d}"} for i in range(20000)]
+    p = tmp_path / "export.json"
+    p.write_bytes(b"\xef\xbb\xbf" + json.dumps({"items": items} if wrapped else items).encode("utf-8"))
+    assert p.stat().st_size >= 1 << 20
+
+    assert list(_iter_json_file_items(p)) == items
+
+
+def test_fresh_import_falls_back_to_upserts_on_repeat_across_batches():
+    items = [
+        {"title": "A", "source_url": "https://youtu.be/a", "liked": True, "time": "t1"},
+        {"title": "B", "source_url": "https://youtu.be/b", "play_count": 2, "time": "t2"},
+        {"title": "A", "source_url": "https://youtu.be/a", "duration_sec": 60.0, "time": "t3"},
+        {"title": None, "source_url": None},
+    ]
+    conn = _conn()
+    try:
+        batches = _iter_normalized_batches(items, "youtube", batch_size=2)
+        result = import_normalized_items(conn, source_label="test", batches=batches)
+        assert (result.tracks_upserted, result.skipped, result.feedback_events, result.play_events) == (3, 1, 1, 2)
+        tracks = conn.execute("SELECT title, duration_sec FROM tracks ORDER BY title").fetchall()
+        assert [tuple(r) for r in tracks] == [("A", 60.0), ("B", None)]
+        assert conn.execute("SELECT COUNT(*) FROM track_sources").fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+def test_normalized_items_take_first_usable_key_per_field():
+    raw = {
+        "timestamp": "2024-01-02T00:00:00Z",
+        "videoId": "abc",
+        "link": " ",
+        "webpage_url": "https://example.com/w",
+        "artists": [{"name": "X"}, "Y", {"id": 1}],
+        "author": "ignored",
+        "duration": "bad",
+        "lengthSeconds": "215",
+        "name": "  Name  ",
+        "title": "",
+        "playCount": "3",
+        "favorite": 1,
+    }
+    (batch,) = _iter_normalized_batches([raw, {"title": " "}, {"video_id": "v1"}], "ytmusic")
+    assert batch.skipped == 1
+    assert batch.titles == ["Name", None]
+    assert batch.artists == ["X, Y", None]
+    assert batch.urls == ["https://example.com/w", "https://music.youtube.com/watch?v=v1"]
+    assert batch.durations == [215.0, None]
+    assert batch.times[0] == "2024-01-02T00:00:00Z" and batch.times[1]
+    assert (batch.liked, batch.disliked, batch.play_counts) == ([True, False], [False, False], [3, 0])
+
+
+def test_ytm_live_fetches_liked_and_history_independently(monkeypatch, tmp_path):
+    class FakeYTMusic:
+        def __init__(self, auth):
+            pass
+
+        def get_liked_songs(self, limit):
+            return {"tracks": [{"title": "Liked", "artists": [{"name": "X"}], "videoId": "v1"}]}
+
+        def get_history(self):
+            raise RuntimeError("boom")
+
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path))
+    paths = get_paths()
+    db.init_db(paths)
+    auth = tmp_path / "auth.json"
+    auth.write_text("{}", encoding="utf-8")
+
+    with patch.dict(sys.modules, {"ytmusicapi": types.SimpleNamespace(YTMusic=FakeYTMusic)}):
+        result = import_ytm_live(paths, auth_json=auth)
+
+    assert result.notes == ["liked_tracks=1", "get_history failed: boom"]
+    assert (result.tracks_upserted, result.feedback_events, result.play_events) == (1, 1, 0)
+
+
+def test_import_json_files_writes_all_files_in_order(monkeypatch, tmp_path):
+    monkeypatch.setenv("MUSICHUB_HOME", str(tmp_path / "home"))
+    paths = get_paths()
+    ensure_dirs(paths)
+    db.init_db(paths)
+    day1 = tmp_path / "day1.json"
+    day2 = tmp_path / "day2.json"
+    day1.write_text(json.dumps({"items": [{"title": "A", "url": "https://youtu.be/a", "liked": True}]}), encoding="utf-8")
+    day2.write_text(
+        json.dumps([{"title": "A", "url": "https://youtu.be/a", "duration": 60}, {"title": "B", "playCount": 2}]),
+        encoding="utf-8",
+    )
+
+    result = import_json_files(paths, source_kind="ytmusic", json_files=[day1, day2], max_workers=2)
+
+    assert (result.tracks_upserted, result.feedback_events, result.play_events) == (3, 1, 2)
+    assert result.notes == ["files=2"]
+    conn = db.connect(paths.db_path)
+    try:
+        tracks = conn.execute("SELECT title, duration_sec FROM tracks ORDER BY title").fetchall()
+        assert [tuple(r) for r in tracks] == [("A", 60.0), ("B", None)]
+    finally:
+        db.close(conn)
+
+
+def test_imported_play_counts_are_capped_and_written_in_bulk():
+    items = [
+        {"title": "A", "play_count": 9, "duration_sec": 30.0, "time": "t1"},
+        {"title": "B", "play_count": 2, "time": "t2"},
+    ]
+    conn = _conn()
+    try:
+        with patch("musichub.importers.db.record_play_event") as single, \
+             patch("musichub.importers.db.record_play_events", wraps=db.record_play_events) as bulk:
+            result = import_normalized_items(conn, source_label="test", batches=_iter_normalized_batches(items, "local"))
+        single.assert_not_called()
+        bulk.assert_called_once()
+        assert result.play_events == 7
+        rows = conn.execute(
+            "SELECT t.title, COUNT(*), MIN(p.reason), MIN(p.completed) FROM play_events p"
+            " JOIN tracks t ON t.id = p.track_id GROUP BY t.title ORDER BY t.title"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [("A", 5, "import:test", 1), ("B", 2, "import:test", 1)]
+    finally:
+        conn.close()
@@ -44,3 +44,21 @@ def test_launch_mpv_includes_loudnorm_when_enabled():
 
     args = mock_popen.call_args.args[0]
     assert "--af=loudnorm" in args
+
+
+def test_mpv_lookup_is_cached_but_env_override_still_wins(monkeypatch, tmp_path):
+    from musichub.mpv_control import _find_mpv_exe, resolve_mpv_exe
+
+    hint = tmp_path / "mpv.exe"
+    hint.write_bytes(b"")
+    paths = MagicMock(mpv_exe_hint=hint)
+    monkeypatch.delenv("MUSICHUB_MPV_EXE", raising=False)
+    _find_mpv_exe.cache_clear()
+    try:
+        assert resolve_mpv_exe(paths) == str(hint)
+        hint.unlink()
+        assert resolve_mpv_exe(paths) == str(hint)
+        monkeypatch.setenv("MUSICHUB_MPV_EXE", "D:/mpv/mpv.exe")
+        assert resolve_mpv_exe(paths) == "D:/mpv/mpv.exe"
+    finally:
+        _find_mpv_exe.cache_clear()
@@ -0,0 +1,168 @@
+import io
+import json
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub.mpv_ipc import MpvIpcClient, MpvIpcError
+
+
+class _FakePipe(io.BytesIO):
+    """Records writes and replays canned replies for every request it sees."""
+
+    def __init__(self, responder):
+        super().__init__()
+        self._responder = responder
+        self.written = b""
+        self._replies: list[bytes] = []
+
+    def write(self, data):
+        self.written += data
+        for line in data.splitlines():
+            req = json.loads(line)
+            self._replies.append((json.dumps(self._responder(req)) + "\n").encode("utf-8"))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def readline(self, *_args):
+        return self._replies.pop(0) if self._replies else b""
+
+
+def test_get_properties_batches_requests_on_one_connection():
+    values = {"path": "https://youtu.be/x", "duration": 12.0}
+
+    def responder(req):
+        name = req["command"][1]
+        if name in values:
+            return {"request_id": req["request_id"], "error": "success", "data": values[name]}
+        return {"request_id": req["request_id"], "error": "property unavailable"}
+
+    pipe = _FakePipe(responder)
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=pipe) as mock_open:
+        out = client.get_properties(["path", "duration", "chapter"])
+
+    mock_open.assert_called_once()
+    assert pipe.written.count(b"\n") == 3
+    assert out == {"path": "https://youtu.be/x", "duration": 12.0}
+
+
+def test_command_async_does_not_wait_for_reply():
+    pipe = _FakePipe(lambda req: {"error": "success"})
+    pipe.readline = lambda *_args: (_ for _ in ()).throw(AssertionError("reply should not be read"))
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=pipe):
+        client.show_text("hello")
+
+    assert json.loads(pipe.written) == {"command": ["show-text", "hello", 1200]}
+
+
+def _echo_success(req):
+    return {"request_id": req.get("request_id"), "error": "success", "data": req["command"][-1]}
+
+
+def test_commands_reuse_one_connection_with_distinct_request_ids():
+    pipe = _FakePipe(_echo_success)
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=pipe) as mock_open:
+        assert client.get_property("volume") == "volume"
+        assert client.get_property("pause") == "pause"
+        client.show_text("hi")
+    mock_open.assert_called_once()
+    ids = [json.loads(line).get("request_id") for line in pipe.written.splitlines()]
+    assert ids[0] != ids[1] and ids[2] is None
+
+
+def test_stale_connection_is_reopened_once_on_write_failure():
+    dead = _FakePipe(_echo_success)
+    dead.write = lambda data: (_ for _ in ()).throw(BrokenPipeError("gone"))
+    fresh = _FakePipe(_echo_success)
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", side_effect=[dead, fresh]):
+        assert client.get_property("path") == "path"
+    assert dead.closed
+    assert fresh.written.count(b"\n") == 1
+
+
+def test_close_releases_the_connection():
+    pipe = _FakePipe(_echo_success)
+    with patch.object(MpvIpcClient, "_open", return_value=pipe):
+        with MpvIpcClient("fake-endpoint") as client:
+            client.command(["get_property", "path"])
+    assert pipe.closed
+
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="select() on socket descriptors")
+
+
+@posix_only
+def test_reply_split_across_reads_is_reassembled():
+    ours, theirs = socket.socketpair()
+
+    def mpv():
+        req = json.loads(theirs.makefile("rb").readline())
+        reply = json.dumps({"event": "idle"}) + "\n" + json.dumps(_echo_success(req)) + "\n"
+        for part in (reply[:7], reply[7:30], reply[30:]):
+            theirs.sendall(part.encode("utf-8"))
+
+    server = threading.Thread(target=mpv)
+    server.start()
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=ours.makefile("rwb", buffering=0)):
+        assert client.get_property("volume") == "volume"
+    server.join()
+    client.close()
+    ours.close()
+    theirs.close()
+
+
+@posix_only
+def test_closed_connection_fails_fast_instead_of_waiting_for_timeout():
+    ours, theirs = socket.socketpair()
+
+    def mpv_exits():
+        theirs.makefile("rb").readline()
+        theirs.close()
+
+    server = threading.Thread(target=mpv_exits)
+    server.start()
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=ours.makefile("rwb", buffering=0)):
+        with pytest.raises(MpvIpcError, match="closed"):
+            client.command(["get_property", "path"], timeout_sec=30)
+    server.join()
+    ours.close()
+
+
+@posix_only
+def test_silent_mpv_times_out():
+    ours, theirs = socket.socketpair()
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=ours.makefile("rwb", buffering=0)):
+        with pytest.raises(MpvIpcError, match="Timed out"):
+            client.command(["get_property", "path"], timeout_sec=0.05)
+    client.close()
+    ours.close()
+    theirs.close()
+
+
+def test_reply_with_invalid_utf8_is_still_matched():
+    def responder(req):
+        return {"request_id": req["request_id"], "error": "success", "data": "PLACEHOLDER"}
+
+    pipe = _FakePipe(responder)
+    readline = pipe.readline
+    pipe.readline = lambda *_args: readline().replace(b"PLACEHOLDER", b"caf\xe9.mp3")
+    client = MpvIpcClient("fake-endpoint")
+    with patch.object(MpvIpcClient, "_open", return_value=pipe):
+        assert client.get_property("path") == "caf�.mp3"
+    assert pipe.written.startswith(b'{"command":["get_property","path"],"request_id":')
@@ -4,7 +4,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from musichub.nl import parse_freeform
+from musichub.nl import maybe_extract_direct_command, parse_freeform
 
 
 def test_layer_english():
@@ -63,3 +63,58 @@ def test_commands_help_natural_language():
 def test_restore_backup_without_zip_goes_to_commands():
     r = parse_freeform("恢复备份")
     assert r and r.argv == ["commands"]
+
+
+@pytest.mark.parametrize(
+    "text, argv",
+    [
+        ("启动守护进程", ["daemon", "start"]),
+        ("stop the background sync", ["daemon", "stop"]),
+        ("后台同步状态", ["daemon", "status"]),
+        ("Daemon START", ["daemon", "start"]),
+    ],
+)
+def test_daemon_controls(text, argv):
+    r = parse_freeform(text)
+    assert r and r.argv == argv
+
+
+def test_keywords_are_matched_literally():
+    r = parse_freeform("play a.b")
+    assert r and r.argv == ["play", "a.b"]
+    r = parse_freeform("THUMBS UP")
+    assert r and r.argv == ["good"]
+
+
+def test_direct_command_detection_is_case_insensitive():
+    assert maybe_extract_direct_command(["play", "x"]) == ["play", "x"]
+    assert maybe_extract_direct_command(["PLAY", "x"]) == ["PLAY", "x"]
+    assert maybe_extract_direct_command(["Sync-Events"]) == ["Sync-Events"]
+    assert maybe_extract_direct_command(["播放"]) is None
+    assert maybe_extract_direct_command([]) is None
+
+
+def test_repeated_parses_return_independent_argv():
+    first = parse_freeform("play lofi beats")
+    first.argv.append("--mutated")
+    again = parse_freeform("play lofi beats")
+    assert again.argv == ["play", "lofi beats"]
+
+
+@pytest.mark.parametrize(
+    "text, argv",
+    [
+        ("播放推荐", ["play"]),
+        ("播放 晴天", ["play", "晴天"]),
+        ("listen to   lofi ", ["play", "lofi"]),
+        ("保存会话 夜跑", ["session", "save", "夜跑"]),
+        ("session delete old", ["session", "delete", "old"]),
+        ("play Jay Chou", ["play", "Jay Chou"]),
+        # Prefixes match case-sensitively, as they always have.
+        ("Play Jay Chou", ["play", "Play Jay Chou"]),
+        ("'Save session Night Run'", ["session", "save"]),
+    ],
+)
+def test_prefix_arguments_are_extracted(text, argv):
+    r = parse_freeform(text)
+    assert r and r.argv == argv
@@ -69,7 +69,7 @@ def test_radio_uses_search_seed_when_good_history_url_is_invalid():
          patch("musichub.cli._safe_sync_events"), \
          patch("musichub.cli._snapshot_mpv_slot", return_value={}), \
          patch("musichub.cli.db.connect", return_value=mock_ctx), \
-         patch("musichub.cli.recommend", return_value=[]), \
+         patch("musichub.recommender.recommend", return_value=[]), \
          patch("musichub.cli._radio_search_fallback", return_value=["https://youtu.be/abcdefghijk"]) as mock_fallback, \
          patch("musichub.cli.active_slot_info", return_value=None), \
          patch("musichub.cli.MpvIpcClient"), \
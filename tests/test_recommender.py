@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from musichub import db
+from musichub.recommender import RecItem, _diversify_by_artist, _implicit_recommend
+
+
+def _item(track_id, artist, score):
+    return RecItem(track_id=track_id, title=f"t{track_id}", artist=artist, score=score, source_url=None, source_kind=None)
+
+
+def test_diversify_penalizes_repeat_artists_and_keeps_candidate_order_on_ties():
+    candidates = [
+        _item(1, "A", 10.0),
+        _item(2, "a", 9.0),
+        _item(3, "B", 7.0),
+        _item(4, None, 7.0),
+        _item(5, "A", 8.0),
+        _item(6, "C", 6.5),
+    ]
+    picked = [r.track_id for r in _diversify_by_artist(candidates, limit=5)]
+    # A: 10 first; then A's head is 9 - 2.5 = 6.5 vs B/unknown at 7 (B first
+    # as the earlier candidate), then unknown, then A's 6.5 ties C's 6.5 and
+    # wins as the earlier candidate.
+    assert picked == [1, 3, 4, 2, 6]
+
+
+def test_diversify_stops_at_limit_or_when_candidates_run_out():
+    candidates = [_item(1, "A", 1.0), _item(2, "B", 2.0)]
+    assert [r.track_id for r in _diversify_by_artist(candidates, limit=1)] == [2]
+    assert [r.track_id for r in _diversify_by_artist(candidates, limit=10)] == [2, 1]
+    assert _diversify_by_artist([], limit=3) == []
+
+
+def test_rec_item_precomputes_artist_key_but_keeps_it_out_of_as_dict():
+    item = _item(1, "ÀB", 1.0)
+    assert item.artist_key == "àb"
+    assert _item(2, None, 1.0).artist_key == "<unknown>"
+    assert "artist_key" not in item.as_dict()
+    assert not hasattr(item, "__dict__")
+
+
+def test_diversify_without_repeated_artists_is_plain_score_order():
+    candidates = [_item(1, "A", 1.0), _item(2, "B", 3.0), _item(3, "C", 1.0), _item(4, None, 2.0)]
+    assert [r.track_id for r in _diversify_by_artist(candidates, limit=10)] == [2, 4, 1, 3]
+    assert [r.track_id for r in _diversify_by_artist(candidates, limit=2)] == [2, 4]
+    # A repeat still reorders even when every candidate fits in the limit.
+    repeated = [_item(1, "A", 5.0), _item(2, "A", 4.0), _item(3, "B", 2.0)]
+    assert [r.track_id for r in _diversify_by_artist(repeated, limit=3)] == [1, 3, 2]
+
+
+def test_implicit_recommend_reads_only_the_bounded_candidate_prefix():
+    recs = [{"track_id": 1, "score": 0.9}, "junk", {"score": 0.5}, {"track_id": 2, "score": 0.8}, {"track_id": 3}, {"track_id": 4}, {"track_id": 5}]
+    sources = {i: {"title": f"T{i}", "artist": f"A{i}"} for i in range(1, 6)}
+    with patch("musichub.recommender.load_implicit_cache", return_value={"recommendations": recs}), \
+         patch("musichub.recommender.db.fetch_track_source_map", side_effect=lambda conn, ids: {i: sources[i] for i in ids}) as fetch:
+        items = _implicit_recommend(None, None, limit=1, explain=False)
+    fetch.assert_called_once_with(None, [1, 2, 3, 4])
+    assert [(i.track_id, i.score, i.engine) for i in items] == [(1, 0.9, "implicit")]
+
+
+def test_implicit_cache_is_parsed_once_per_file_version(tmp_path):
+    from types import SimpleNamespace
+
+    from musichub import models
+
+    paths = SimpleNamespace(implicit_recs_file=tmp_path / "implicit_recs.json")
+    assert models.load_implicit_cache(paths) is None
+    paths.implicit_recs_file.write_text('{"recommendations": []}', encoding="utf-8")
+    with patch("musichub.models._load_json", wraps=models._load_json) as load:
+        first = models.load_implicit_cache(paths)
+        assert models.load_implicit_cache(paths) is first
+        assert load.call_count == 1
+        paths.implicit_recs_file.write_text('{"recommendations": [{"track_id": 1}]}', encoding="utf-8")
+        assert models.load_implicit_cache(paths) == {"recommendations": [{"track_id": 1}]}
+        assert load.call_count == 2
+
+
+def test_recommend_auto_skips_implicit_work_without_a_trained_cache(tmp_path):
+    from types import SimpleNamespace
+
+    from musichub.recommender import recommend
+
+    paths = SimpleNamespace(implicit_recs_file=tmp_path / "missing.json")
+    with patch("musichub.recommender.load_implicit_cache") as load, \
+         patch("musichub.recommender.rule_recommend", return_value=["rule"]) as rule:
+        assert recommend(paths, None, limit=3) == ["rule"]
+    load.assert_not_called()
+    rule.assert_called_once_with(None, limit=3, explain=True)
+
+
+def test_rec_item_as_dict_matches_public_fields():
+    from dataclasses import fields
+
+    item = _item(1, "A", 2.0)
+    public = [f.name for f in fields(RecItem) if f.init]
+    assert list(item.as_dict()) == public
+    assert item.as_dict()["score"] == 2.0
+
+
+def test_rule_reason_uses_prebuilt_artist_reasons():
+    from musichub.recommender import _artist_reasons, _rule_reason
+
+    reasons = _artist_reasons({"A": 3, "B": 0})
+    assert reasons == {"A": "你常给 A 红心（3 次）"}
+    rec = db.Recommendation(track_id=1, title="t", artist="A", score=1.0, source_url=None, source_kind=None, fb_score=0.0, play_score=0.0)
+    assert _rule_reason(rec, reasons) == "你常给 A 红心（3 次）"
+    rec.artist = "B"
+    rec.fb_score = 6.0
+    assert _rule_reason(rec, reasons) == "你给过正反馈"
+
+
+def test_implicit_recommend_keeps_only_known_tracks_up_to_three_times_limit():
+    recs = [{"track_id": i, "score": 1.0 / i} for i in range(1, 9)]
+    known = {i: {"title": f"T{i}", "artist": f"A{i}"} for i in (2, 3, 5, 6, 7, 8)}
+    with patch("musichub.recommender.load_implicit_cache", return_value={"recommendations": recs}), \
+         patch("musichub.recommender.db.fetch_track_source_map", side_effect=lambda conn, ids: {i: known[i] for i in ids if i in known}):
+        items = _implicit_recommend(None, None, limit=2, explain=True)
+    # Ids 1..8 are fetched; unknown 1 and 4 drop out; the first 6 survivors are
+    # capped to 3 * limit and then diversified down to the limit.
+    assert [i.track_id for i in items] == [2, 3]
+    assert all(i.reason for i in items)
+
+
+def test_diversify_handles_many_candidates_per_artist():
+    candidates = [_item(i, "ABC"[i % 3], 100.0 - i) for i in range(60)]
+    picked = _diversify_by_artist(candidates, limit=9)
+    # Equal penalties per round keep a strict A, B, C rotation by score.
+    assert [r.track_id for r in picked] == list(range(9))
+    assert len(_diversify_by_artist(candidates, limit=100)) == 60
@@ -108,3 +108,146 @@ def test_clean_dead_slots_keeps_current_process(tmp_path):
 
     alive = clean_dead_slots(paths)
     assert "0" in alive
+
+
+def test_load_registry_reparses_only_when_the_file_changes(tmp_path, monkeypatch):
+    paths = make_paths(tmp_path)
+    register_slot(paths, "0", r"\\.\pipe\musichub-mpv", 1234)
+    calls = []
+    real_loads = json.loads
+    monkeypatch.setattr("musichub.slots.json.loads", lambda data: calls.append(data) or real_loads(data))
+
+    first = load_registry(paths)
+    first["9"] = SlotInfo("9", "x", 1)
+    assert "9" not in load_registry(paths)
+    assert calls == []
+
+    # Another process rewrites the file.
+    reg_file = Path(paths.runtime_dir) / "mpv_slots.json"
+    reg_file.write_text(json.dumps({"1": {"slot_id": "1", "pipe": "p", "pid": 7}}), encoding="utf-8")
+    assert set(load_registry(paths)) == {"1"}
+    assert len(calls) == 1
+
+
+def test_save_registry_replaces_the_file_atomically(tmp_path, monkeypatch):
+    paths = make_paths(tmp_path)
+    registry = {"0": SlotInfo("0", r"\\.\pipe\musichub-mpv", 1)}
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr("musichub.slots.os.replace", lambda src, dst: replaced.append((src, dst)) or real_replace(src, dst))
+
+    save_registry(paths, registry)
+    reg_file = Path(paths.runtime_dir) / "mpv_slots.json"
+    assert len(replaced) == 1 and Path(replaced[0][1]) == reg_file
+    assert sorted(p.name for p in Path(paths.runtime_dir).iterdir()) == ["mpv_slots.json"]
+    assert load_registry(paths)["0"].pid == 1
+
+
+def test_clean_dead_slots_probes_each_pid_once(tmp_path, monkeypatch):
+    paths = make_paths(tmp_path)
+    register_slot(paths, "0", r"\\.\pipe\musichub-mpv", 10)
+    register_slot(paths, "1", r"\\.\pipe\musichub-mpv-1", 10)
+    register_slot(paths, "2", r"\\.\pipe\musichub-mpv-2", 20)
+    probed = []
+    monkeypatch.setattr("musichub.slots._pidfd_alive", lambda pids: None)
+    monkeypatch.setattr("musichub.slots._is_alive", lambda pid: probed.append(pid) or pid == 10)
+
+    alive = clean_dead_slots(paths)
+    assert sorted(probed) == [10, 20]
+    assert set(alive) == {"0", "1"}
+    assert set(load_registry(paths)) == {"0", "1"}
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="needs Linux pidfds")
+def test_pidfd_probe_sees_exited_and_missing_processes():
+    import subprocess
+    from musichub.slots import _pidfd_alive
+
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    dead_pid = child.pid
+    assert _pidfd_alive([os.getpid(), dead_pid, 99999999]) == {os.getpid()}
+
+
+def test_slot_info_as_dict_round_trips():
+    from dataclasses import asdict
+
+    info = SlotInfo("3", r"\\.\pipe\musichub-mpv-3", 42)
+    assert info.as_dict() == asdict(info)
+    assert SlotInfo(**info.as_dict()) == info
+
+
+def test_slot_info_has_no_instance_dict():
+    assert not hasattr(SlotInfo("0", "p", 1), "__dict__")
+
+
+def test_next_slot_id_fills_gaps_and_raises_when_full():
+    registry = {str(i): SlotInfo(str(i), "p", i) for i in (0, 1, 3)}
+    assert next_slot_id(registry) == "2"
+    full = {str(i): SlotInfo(str(i), "p", i) for i in range(100)}
+    with pytest.raises(RuntimeError):
+        next_slot_id(full)
+
+
+def test_pipe_for_slot_reuses_formatted_names():
+    a = pipe_for_slot("7")
+    assert a == r"\\.\pipe\musichub-mpv-7"
+    assert pipe_for_slot("7") is a
+
+
+def test_registry_keys_stay_strings_matching_cli_slot_ids(tmp_path):
+    paths = make_paths(tmp_path)
+    register_slot(paths, next_slot_id({}), pipe_for_slot("0"), 1)
+    register_slot(paths, next_slot_id(load_registry(paths)), pipe_for_slot("1"), 2)
+
+    on_disk = json.loads((Path(paths.runtime_dir) / "mpv_slots.json").read_text(encoding="utf-8"))
+    assert list(on_disk) == ["0", "1"]
+    assert {k: v.slot_id for k, v in load_registry(paths).items()} == {"0": "0", "1": "1"}
+
+
+def test_load_registry_treats_malformed_entries_as_empty(tmp_path):
+    paths = make_paths(tmp_path)
+    reg_file = Path(paths.runtime_dir) / "mpv_slots.json"
+    reg_file.write_text(json.dumps({"0": {"slot_id": "0", "pipe": "p"}}), encoding="utf-8")
+    assert load_registry(paths) == {}
+    reg_file.write_text(json.dumps({"0": ["not", "a", "dict"]}), encoding="utf-8")
+    assert load_registry(paths) == {}
+    reg_file.write_text(json.dumps({"0": {"slot_id": "0", "pipe": "p", "pid": 5}}), encoding="utf-8")
+    assert load_registry(paths) == {"0": SlotInfo("0", "p", 5)}
+
+
+def test_windows_batch_probe_opens_handles_with_synchronize_only(monkeypatch):
+    import ctypes
+
+    from musichub.slots import _alive_pids
+
+    handles = {10: 110, 20: 120, 30: 130}  # pid 40 cannot be opened
+    exited = {120}
+    opened_with = []
+    closed = []
+
+    def wait_for_multiple_objects(count, arr, wait_all, timeout):
+        assert (wait_all, timeout) == (False, 0)
+        for i in range(count):
+            if arr[i] in exited:
+                return i
+        return 0x102  # WAIT_TIMEOUT
+
+    class Kernel32:
+        WaitForMultipleObjects = staticmethod(wait_for_multiple_objects)
+
+        @staticmethod
+        def OpenProcess(access, inherit, pid):
+            opened_with.append(access)
+            return handles.get(pid, 0)
+
+        @staticmethod
+        def CloseHandle(h):
+            closed.append(h)
+
+    monkeypatch.setattr("musichub.slots.os.name", "nt")
+    monkeypatch.setattr(ctypes, "windll", type("WinDLL", (), {"kernel32": Kernel32})(), raising=False)
+
+    assert _alive_pids([10, 20, 30, 40, 10]) == {10, 30}
+    assert opened_with == [0x00100000] * 4
+    assert sorted(closed) == [110, 120, 130]